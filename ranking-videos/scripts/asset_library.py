@@ -0,0 +1,240 @@
+"""미디어 에셋 라이브러리 (에셋 폴더 1회 색인 + mtime 무효화, 디코딩된 PCM을 메모리 매핑 .npy로 캐시)"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from pcm_audio import PCM_SAMPLE_RATE, decode_audio
+
+
+# 디코딩 결과가 바뀌는 코드 변경 시 올려서 기존 PCM 캐시를 무효화
+ASSET_CACHE_VERSION = 1
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".aac")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+DEFAULT_CACHE_DIR = os.path.join("Temp", "asset_cache")
+# 무음 판정 (RMS/피크 dB 계산 시 하한)
+SILENCE_DB = -120.0
+
+
+def _to_db(value):
+    return float(max(SILENCE_DB, 20.0 * np.log10(max(float(value), 1e-12))))
+
+
+class AudioAsset:
+    """
+    디코딩된 오디오 에셋 하나.
+
+    - samples: float32 (samples, channels), 디스크 캐시에서 읽으면 읽기 전용 memmap (복사 없음)
+    - rms_db / peak_db: 전체 구간 RMS / 절대 피크 (dBFS)
+    """
+
+    def __init__(self, path, samples, sample_rate, rms_db, peak_db):
+        self.path = path
+        self.samples = samples
+        self.sample_rate = int(sample_rate)
+        self.rms_db = float(rms_db)
+        self.peak_db = float(peak_db)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+
+class AssetLibrary:
+    """
+    효과음/배경음/시작 사운드/하이라이트 음악·이모지 폴더용 에셋 저장소.
+
+    - 폴더 목록: 디렉터리 mtime이 바뀔 때만 다시 listdir
+    - 오디오: 출력 포맷(sample_rate, channels)의 float32 PCM으로 한 번 디코딩해
+      <cache_dir>/<경로 해시>.npy 에 저장하고 이후에는 np.load(mmap_mode="r")로 읽음
+    - 원본 파일 크기/수정 시각이 메타(.json)와 다르면 다시 디코딩해서 같은 자리에 덮어씀
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, sample_rate=PCM_SAMPLE_RATE, channels=2):
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.decoded = 0
+        self.mapped = 0
+        self._folders = {}  # abspath → (mtime_ns, [파일 경로])
+        self._assets = {}  # (abspath, size, mtime_ns) → AudioAsset
+        self._lock = threading.Lock()
+
+    # ---- 폴더 색인 ----
+
+    def files(self, directory, extensions=AUDIO_EXTENSIONS):
+        """directory 안의 extensions 파일 경로 목록 (폴더가 없으면 None)."""
+        key = os.path.abspath(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._folders.get(key)
+            if cached is None or cached[0] != mtime_ns:
+                names = sorted(os.listdir(key))
+                cached = (mtime_ns, names)
+                self._folders[key] = cached
+        extensions = tuple(ext.lower() for ext in extensions)
+        return [os.path.join(directory, name) for name in cached[1] if name.lower().endswith(extensions)]
+
+    def filter_by_loudness(self, paths, min_rms_db=None, max_rms_db=None):
+        """
+        RMS 라우드니스가 [min_rms_db, max_rms_db] 안인 오디오 에셋만 (범위에 드는 파일이 없으면 paths 그대로).
+
+        처음 보는 파일은 이때 디코딩되어 캐시되므로 이후 로드는 바로 매핑된다.
+        """
+        if min_rms_db is None and max_rms_db is None:
+            return list(paths)
+        low = SILENCE_DB if min_rms_db is None else float(min_rms_db)
+        high = 0.0 if max_rms_db is None else float(max_rms_db)
+        in_range = []
+        for path in paths:
+            try:
+                asset = self.load_audio(path)
+            except Exception as exc:
+                print(f"   [ASSET] 라우드니스 확인 실패: {path} ({exc})")
+                continue
+            if low <= asset.rms_db <= high:
+                in_range.append(path)
+        return in_range or list(paths)
+
+    # ---- 디코딩된 오디오 ----
+
+    def _cache_paths(self, source_key):
+        digest = hashlib.sha1(
+            json.dumps([ASSET_CACHE_VERSION, source_key, self.sample_rate, self.channels]).encode("utf-8")
+        ).hexdigest()
+        base = os.path.join(self.cache_dir, digest[:2], digest)
+        return f"{base}.npy", f"{base}.json"
+
+    def _load_cached(self, path, stat, npy_path, meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if meta.get("size") != stat.st_size or meta.get("mtime_ns") != stat.st_mtime_ns:
+            return None
+        try:
+            samples = np.load(npy_path, mmap_mode="r")
+        except (OSError, ValueError) as exc:
+            print(f"   [ASSET] 손상된 PCM 캐시 무시: {npy_path} ({exc})")
+            return None
+        if samples.dtype != np.float32 or samples.ndim != 2 or samples.shape[1] != self.channels:
+            return None
+        return AudioAsset(path, samples, self.sample_rate, meta["rms_db"], meta["peak_db"])
+
+    def _store(self, stat, samples, rms_db, peak_db, npy_path, meta_path):
+        os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(npy_path + suffix, "wb") as handle:
+                np.save(handle, samples)
+            os.replace(npy_path + suffix, npy_path)
+            with open(meta_path + suffix, "w", encoding="utf-8") as handle:
+                json.dump({
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "duration": len(samples) / self.sample_rate,
+                    "rms_db": rms_db,
+                    "peak_db": peak_db,
+                }, handle)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError as exc:
+            # 다른 프로세스가 같은 파일을 매핑 중이면 (Windows) 교체가 실패할 수 있음 → 메모리 결과만 사용
+            print(f"   [ASSET] PCM 캐시 저장 실패: {exc}")
+            for tmp_path in (npy_path + suffix, meta_path + suffix):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def load_audio(self, path):
+        """
+        오디오 에셋 (프로세스 메모리 → 디스크 memmap → 새로 디코딩 순).
+
+        키에 파일 크기/수정 시각이 들어가므로 파일이 바뀌면 다시 디코딩한다.
+        """
+        source = os.path.abspath(path)
+        stat = os.stat(source)
+        key = (source, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            asset = self._assets.get(key)
+        if asset is not None:
+            return asset
+
+        npy_path = meta_path = None
+        if self.cache_dir:
+            npy_path, meta_path = self._cache_paths(source)
+            asset = self._load_cached(path, stat, npy_path, meta_path)
+            if asset is not None:
+                self.mapped += 1
+
+        if asset is None:
+            started = time.time()
+            samples = decode_audio(source, self.sample_rate, self.channels)
+            rms_db = _to_db(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))) if samples.size else SILENCE_DB
+            peak_db = _to_db(np.abs(samples).max()) if samples.size else SILENCE_DB
+            asset = AudioAsset(path, samples, self.sample_rate, rms_db, peak_db)
+            self.decoded += 1
+            print(
+                f"   [ASSET] {os.path.basename(path)} 디코딩: {asset.duration:.2f}초, "
+                f"RMS {rms_db:.1f}dB / 피크 {peak_db:.1f}dB ({time.time() - started:.2f}초)"
+            )
+            if npy_path:
+                self._store(stat, samples, rms_db, peak_db, npy_path, meta_path)
+
+        with self._lock:
+            # 같은 파일의 이전 버전은 메모리에서 내림
+            for stale in [k for k in self._assets if k[0] == source and k != key]:
+                del self._assets[stale]
+            self._assets[key] = asset
+        return asset
+
+
+_SHARED_LIBRARY = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_asset_library(cache_dir=None, sample_rate=PCM_SAMPLE_RATE, channels=2):
+    """
+    프로세스 공용 에셋 라이브러리.
+
+    cache_dir를 생략하면 지금 쓰는 라이브러리(없으면 DEFAULT_CACHE_DIR)를 그대로 쓰고,
+    cache_dir/포맷이 바뀌면 새로 만든다.
+    """
+    global _SHARED_LIBRARY
+    with _SHARED_LOCK:
+        library = _SHARED_LIBRARY
+        if cache_dir is None:
+            cache_dir = library.cache_dir if library is not None else DEFAULT_CACHE_DIR
+        cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+        if (library is None or library.cache_dir != cache_dir
+                or library.sample_rate != int(sample_rate) or library.channels != int(channels)):
+            library = AssetLibrary(cache_dir, sample_rate, channels)
+            _SHARED_LIBRARY = library
+        return library
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python scripts/asset_library.py <에셋 폴더> [...]")
+        sys.exit(1)
+    library = get_asset_library()
+    for folder in sys.argv[1:]:
+        paths = library.files(folder)
+        if paths is None:
+            print(f"{folder}: 폴더 없음")
+            continue
+        print(f"{folder}: {len(paths)}개")
+        for audio_path in paths:
+            item = library.load_audio(audio_path)
+            print(f"   {os.path.basename(audio_path)}: {item.duration:.2f}초, RMS {item.rms_db:.1f}dB, 피크 {item.peak_db:.1f}dB")
+    print(f"[ASSET] 새로 디코딩 {library.decoded}, 캐시 매핑 {library.mapped}")
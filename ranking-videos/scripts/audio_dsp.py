@@ -0,0 +1,221 @@
+"""음성 DSP (버퍼 단위 WSOLA 타임 스트레치, 길이를 유지하는 피치 시프트, 컴프레서)"""
+
+import sys
+import time
+
+import numpy as np
+
+
+# WSOLA 그레인 길이 / 유사도 탐색 범위 (ms)
+DEFAULT_FRAME_MS = 30.0
+DEFAULT_TOLERANCE_MS = 10.0
+# 유사도 탐색 해상도 (44.1kHz → 약 11kHz에서 상관 계산)
+SEARCH_DECIMATION = 4
+
+
+def _as_2d(samples):
+    samples = np.asarray(samples, dtype=np.float32)
+    return samples.reshape(-1, 1) if samples.ndim == 1 else samples
+
+
+def resample_to_length(samples, length):
+    """선형 보간으로 length 샘플로 리샘플링 (채널별)."""
+    x = _as_2d(samples)
+    length = int(length)
+    if length == len(x) or len(x) < 2:
+        return x.copy() if length == len(x) else np.zeros((max(0, length), x.shape[1]), dtype=np.float32)
+    positions = np.linspace(0.0, len(x) - 1, length)
+    base = np.arange(len(x), dtype=np.float64)
+    return np.stack([np.interp(positions, base, x[:, c]) for c in range(x.shape[1])], axis=1).astype(np.float32)
+
+
+def time_stretch(samples, rate, sample_rate=44100, frame_ms=DEFAULT_FRAME_MS, tolerance_ms=DEFAULT_TOLERANCE_MS):
+    """
+    WSOLA 타임 스트레치: 피치는 그대로 두고 길이만 1/rate 배로 (rate > 1 이면 빨라짐).
+
+    - 그레인 W, 합성 홉 W/2 (periodic Hann, 50% 겹침 합이 1)
+    - 각 그레인은 이상적인 분석 위치 ±tolerance 안에서 직전 그레인의 자연스러운 연속과
+      상관이 가장 큰 위치를 고른다 (1/SEARCH_DECIMATION 로 줄인 신호에서 np.correlate로 찾은 뒤
+      원래 해상도에서 ±SEARCH_DECIMATION 샘플만 다시 비교)
+    - 고른 그레인들은 짝/홀 두 묶음으로 나눠 reshape 한 번씩으로 겹쳐 더한다
+    """
+    x = _as_2d(samples)
+    rate = float(rate)
+    if rate <= 0:
+        raise ValueError(f"rate는 0보다 커야 합니다: {rate}")
+    n = len(x)
+    out_len = int(round(n / rate))
+    if rate == 1.0 or n == 0:
+        return x.copy()
+
+    hop = max(8, int(round(sample_rate * frame_ms / 2000.0)))
+    window_len = 2 * hop
+    tolerance = max(1, int(round(sample_rate * tolerance_ms / 1000.0)))
+    if n < window_len:
+        return resample_to_length(x, out_len)
+
+    analysis_hop = hop * rate
+    frames = out_len // hop + 2
+    # 탐색은 1/decim 로 줄인 모노 신호에서, 마지막 ±decim 샘플만 원래 해상도로 보정
+    decim = SEARCH_DECIMATION if sample_rate >= 16000 else 1
+    # 그레인 k는 출력 [k*hop - hop, k*hop + hop) 에 놓이고 입력 k*hop*rate 를 중심으로 함
+    pad = window_len + tolerance + 2 * decim
+    ideal = pad - hop + np.round(np.arange(frames) * analysis_hop).astype(np.int64)
+    tail = int(ideal[-1]) + tolerance + window_len + hop + 2 * decim - (pad + n) + 1
+    padded = np.pad(x, ((pad, max(0, tail)), (0, 0)))
+    mono = padded.mean(axis=1)
+    coarse_mono = mono[:len(mono) // decim * decim].reshape(-1, decim).mean(axis=1)
+
+    coarse_len = window_len // decim
+    coarse_tol = tolerance // decim + 1
+
+    starts = np.empty(frames, dtype=np.int64)
+    starts[0] = ideal[0]
+    for k in range(1, frames):
+        natural = starts[k - 1] + hop
+        coarse_natural = natural // decim
+        lo = (ideal[k] - tolerance) // decim
+        corr = np.correlate(
+            coarse_mono[lo:lo + coarse_len + 2 * coarse_tol],
+            coarse_mono[coarse_natural:coarse_natural + coarse_len],
+            "valid",
+        )
+        start = (lo + int(np.argmax(corr))) * decim
+        if decim > 1:
+            corr = np.correlate(
+                mono[start - decim:start + decim + window_len],
+                mono[natural:natural + window_len],
+                "valid",
+            )
+            start += int(np.argmax(corr)) - decim
+        starts[k] = start
+
+    window = (0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(window_len) / window_len)).astype(np.float32)
+    grains = padded[starts[:, None] + np.arange(window_len)] * window[None, :, None]
+    channels = x.shape[1]
+    out = np.zeros(((frames + 1) * hop, channels), dtype=np.float32)
+    even = grains[0::2].reshape(-1, channels)
+    odd = grains[1::2].reshape(-1, channels)
+    out[:len(even)] += even
+    out[hop:hop + len(odd)] += odd
+    return out[hop:hop + out_len]
+
+
+def pitch_shift(samples, semitones, sample_rate=44100, frame_ms=DEFAULT_FRAME_MS,
+                tolerance_ms=DEFAULT_TOLERANCE_MS):
+    """길이를 유지하는 피치 시프트 (factor배로 늘린 뒤 원래 길이로 리샘플링)."""
+    x = _as_2d(samples)
+    if not semitones or len(x) == 0:
+        return x.copy()
+    factor = 2.0 ** (float(semitones) / 12.0)
+    stretched = time_stretch(x, 1.0 / factor, sample_rate, frame_ms, tolerance_ms)
+    return resample_to_length(stretched, len(x))
+
+
+def compress_dynamic_range(samples, sample_rate=44100, threshold=-20.0, ratio=4.0, attack=5.0, release=50.0,
+                           makeup_gain=0.0, block=16):
+    """
+    pydub.effects.compress_dynamic_range 와 같은 규칙의 컴프레서 + 메이크업 게인 (dB).
+
+    - 레벨: 직전 attack ms 구간 RMS (제곱 누적합으로 전 샘플 한 번에 계산)
+    - 목표 감쇠: (1 - 1/ratio) * (RMS가 threshold를 넘은 dB)
+    - 감쇠량은 목표까지 attack 동안 선형으로 오르고, 목표보다 크면 release 기울기로 내려간다
+      (pydub과 같이 threshold 아래에서는 감쇠량을 그대로 유지)
+    - 감쇠량 갱신만 block 샘플 단위로 진행하고 샘플별 값은 선형 보간, 게인은 한 번에 곱한다
+    """
+    x = _as_2d(samples)
+    n = len(x)
+    if n == 0:
+        return x.copy()
+    thresh = 10.0 ** (float(threshold) / 20.0)
+    ratio = float(ratio)
+    look = max(1, int(sample_rate * float(attack) / 1000.0))
+    attack_frames = max(1e-9, sample_rate * float(attack) / 1000.0)
+    release_frames = max(1e-9, sample_rate * float(release) / 1000.0)
+
+    energy = np.concatenate([[0.0], np.cumsum(np.mean(x.astype(np.float64) ** 2, axis=1))])
+    index = np.arange(n)
+    lo = np.maximum(index - look, 0)
+    counts = np.maximum(index - lo, 1)
+    rms = np.sqrt(np.maximum(energy[index] - energy[lo], 0.0) / counts)
+    with np.errstate(divide="ignore"):
+        over_db = np.where(rms > 0, 20.0 * np.log10(np.maximum(rms, 1e-12) / thresh), 0.0)
+    target = (1.0 - 1.0 / ratio) * np.maximum(over_db, 0.0)
+
+    block = max(1, int(block))
+    points = np.arange(0, n, block)
+    block_target = target[points].tolist()
+    block_over = (rms[points] > thresh).tolist()
+    levels = np.empty(len(points) + 1)
+    attenuation = 0.0
+    levels[0] = 0.0
+    for k, (limit, over) in enumerate(zip(block_target, block_over)):
+        if over and attenuation <= limit:
+            attenuation = min(attenuation + block * limit / attack_frames, limit)
+        else:
+            attenuation = max(attenuation - block * limit / release_frames, 0.0)
+        levels[k + 1] = attenuation
+
+    # 블록 끝 값들을 샘플 단위로 보간 (pydub의 샘플당 선형 증감과 같은 기울기)
+    per_sample = np.interp(index, np.append(points, n) - 1, levels)
+    gain = 10.0 ** ((float(makeup_gain) - per_sample) / 20.0)
+    return (x * gain[:, None]).astype(np.float32)
+
+
+def _benchmark(path, rate=1.2, semitones=2.0, repeats=5):
+    """실제 TTS 파일로 pydub speedup / 프레임 레이트 피치 변경 / compress_dynamic_range 와 비교."""
+    from pcm_audio import PCM_SAMPLE_RATE, decode_audio, from_segment, to_segment
+
+    samples = decode_audio(path, PCM_SAMPLE_RATE, channels=2)
+    duration = len(samples) / PCM_SAMPLE_RATE
+    print(f"[DSP] {path}: {duration:.2f}초, 배속 {rate}, 피치 {semitones:+g}반음")
+
+    def timed(label, func):
+        func()
+        started = time.perf_counter()
+        for _ in range(repeats):
+            result = func()
+        elapsed = (time.perf_counter() - started) / repeats
+        print(f"   {label:<28} {1000 * elapsed:8.1f}ms  결과 길이 {len(result) / PCM_SAMPLE_RATE:.3f}초")
+        return result
+
+    timed("numpy WSOLA time_stretch", lambda: time_stretch(samples, rate, PCM_SAMPLE_RATE))
+    timed("numpy pitch_shift", lambda: pitch_shift(samples, semitones, PCM_SAMPLE_RATE))
+    compressed = timed(
+        "numpy compressor",
+        lambda: compress_dynamic_range(samples, PCM_SAMPLE_RATE, -18.0, 3.0, 5.0, 120.0),
+    )
+    try:
+        from pydub.effects import compress_dynamic_range as pydub_compress, speedup
+    except ImportError:
+        print("   pydub가 없어 비교를 건너뜁니다")
+        return
+    segment = to_segment(samples, PCM_SAMPLE_RATE)
+    timed("pydub speedup (기본)", lambda: from_segment(speedup(segment, playback_speed=rate))[0])
+    timed(
+        "pydub speedup (50/25ms)",
+        lambda: from_segment(speedup(segment, playback_speed=rate, chunk_size=50, crossfade=25))[0],
+    )
+
+    def frame_rate_pitch():
+        factor = 2 ** (semitones / 12)
+        shifted = segment._spawn(segment.raw_data, overrides={"frame_rate": int(segment.frame_rate * factor)})
+        return from_segment(shifted.set_frame_rate(segment.frame_rate))[0]
+
+    timed("frame rate 피치 (길이 변함)", frame_rate_pitch)
+    reference = timed(
+        "pydub compressor",
+        lambda: from_segment(pydub_compress(segment, -18.0, 3.0, 5.0, 120.0))[0],
+    )
+    print(f"   컴프레서 차이: 최대 {np.abs(reference - compressed).max():.5f}, 평균 {np.abs(reference - compressed).mean():.6f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python scripts/audio_dsp.py <음성 파일> [배속] [반음]")
+        sys.exit(1)
+    _benchmark(
+        sys.argv[1],
+        float(sys.argv[2]) if len(sys.argv) > 2 else 1.2,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 2.0,
+    )
@@ -0,0 +1,184 @@
+"""오디오 믹스 단계 (내레이션 구간 기반 더킹 게인 엔벨로프, 오프라인 float32 믹스다운 + 소프트 리미터, AAC 인코딩)"""
+
+import math
+import os
+import subprocess
+
+import numpy as np
+from moviepy.config import FFMPEG_BINARY
+
+from asset_library import get_asset_library
+from pcm_audio import PCM_SAMPLE_RATE
+
+
+DEFAULT_DUCK_ATTACK_MS = 60.0
+DEFAULT_DUCK_RELEASE_MS = 300.0
+# 소프트 리미터가 눌러 주기 시작하는 레벨 (dBFS), 그 위는 0dBFS로 부드럽게 수렴
+DEFAULT_LIMITER_THRESHOLD_DB = -1.0
+
+
+def ducking_envelope(intervals, num_samples, sample_rate, duck_volume,
+                     attack_ms=DEFAULT_DUCK_ATTACK_MS, release_ms=DEFAULT_DUCK_RELEASE_MS):
+    """
+    샘플별 더킹 게인 (float32, 길이 num_samples).
+
+    - 각 구간 [start, end) 에서는 duck_volume
+    - 구간 시작 attack_ms 전부터 선형으로 내려가 시작 시점에 duck_volume 도달
+    - 구간 끝에서 release_ms 동안 선형으로 1로 복귀
+    - 가까운 구간끼리는 더 많이 줄이는 쪽을 따름 (겹치는 램프가 튀지 않음)
+    """
+    num_samples = int(num_samples)
+    depth = np.zeros(num_samples, dtype=np.float32)
+    if num_samples == 0 or float(duck_volume) == 1.0:
+        return depth + 1.0
+    attack = max(0, int(round(sample_rate * float(attack_ms) / 1000.0)))
+    release = max(0, int(round(sample_rate * float(release_ms) / 1000.0)))
+    for start, end in intervals:
+        s = int(round(float(start) * sample_rate))
+        e = int(round(float(end) * sample_rate))
+        if e <= s:
+            continue
+        lo = max(0, s - attack)
+        hi = min(num_samples, e + release)
+        if hi <= lo:
+            continue
+        index = np.arange(lo, hi, dtype=np.float32)
+        ramp_in = np.clip((index - (s - attack)) / attack, 0.0, 1.0) if attack else (index >= s)
+        ramp_out = np.clip(((e + release) - index) / release, 0.0, 1.0) if release else (index < e)
+        np.maximum(depth[lo:hi], np.minimum(ramp_in, ramp_out), out=depth[lo:hi])
+    return 1.0 - depth * np.float32(1.0 - float(duck_volume))
+
+
+def apply_ducking(samples, sample_rate, intervals, duck_volume,
+                  attack_ms=DEFAULT_DUCK_ATTACK_MS, release_ms=DEFAULT_DUCK_RELEASE_MS):
+    """PCM (samples, channels) 에 더킹 엔벨로프를 한 번에 곱함."""
+    samples = np.asarray(samples, dtype=np.float32)
+    gain = ducking_envelope(intervals, len(samples), sample_rate, duck_volume, attack_ms, release_ms)
+    return samples * (gain[:, None] if samples.ndim == 2 else gain)
+
+
+def soft_limit(samples, threshold_db=DEFAULT_LIMITER_THRESHOLD_DB):
+    """
+    threshold 아래는 그대로, 넘는 부분만 tanh 무릎으로 눌러 ±1.0 안에 넣는 메모리 없는 리미터.
+
+    믹스 합이 0dBFS를 넘어도 인코더에서 하드 클리핑되지 않는다.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    threshold = np.float32(min(1.0, 10.0 ** (float(threshold_db) / 20.0)))
+    headroom = np.float32(1.0) - threshold
+    magnitude = np.abs(samples)
+    over = magnitude > threshold
+    if not over.any():
+        return samples
+    limited = samples.copy()
+    if headroom <= 0:
+        np.clip(limited, -1.0, 1.0, out=limited)
+        return limited
+    knee = threshold + headroom * np.tanh((magnitude[over] - threshold) / headroom)
+    limited[over] = np.copysign(knee, samples[over])
+    return limited
+
+
+class AudioMix:
+    """
+    타임라인 오디오 전체를 출력 샘플레이트의 float32 버퍼 하나에 미리 섞는 오프라인 믹서.
+
+    - 각 소스는 한 번만 디코딩하고 볼륨을 곱해 시작 위치에 더함 (루프는 타일링)
+    - 버퍼 길이는 비디오 길이로 고정 (넘치는 꼬리는 잘림)
+    - render()에서 소프트 리미터를 한 번 적용
+    """
+
+    def __init__(self, duration, sample_rate=PCM_SAMPLE_RATE, channels=2):
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.buffer = np.zeros((max(0, int(round(float(duration) * self.sample_rate))), self.channels),
+                               dtype=np.float32)
+        self.tracks = 0
+
+    @property
+    def duration(self):
+        return len(self.buffer) / self.sample_rate
+
+    def _match_channels(self, samples):
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples.reshape(-1, 1)
+        if samples.shape[1] == self.channels:
+            return samples
+        if samples.shape[1] == 1:
+            return np.repeat(samples, self.channels, axis=1)
+        return np.repeat(samples.mean(axis=1, keepdims=True), self.channels, axis=1)
+
+    def add(self, samples, start=0.0, volume=1.0, loop=False, duration=None):
+        """
+        PCM 배열 (samples, channels) 을 start초부터 volume배로 더함. 실제로 더해진 길이(초) 반환.
+
+        duration을 주면 그 길이까지만 (루프 포함) 재생.
+        """
+        offset = int(round(max(0.0, float(start)) * self.sample_rate))
+        room = len(self.buffer) - offset
+        if duration is not None:
+            room = min(room, int(round(float(duration) * self.sample_rate)))
+        samples = self._match_channels(samples)
+        if room <= 0 or len(samples) == 0:
+            return 0.0
+        if loop and len(samples) < room:
+            samples = np.tile(samples, (int(math.ceil(room / len(samples))), 1))
+        samples = samples[:room]
+        target = self.buffer[offset:offset + len(samples)]
+        if float(volume) == 1.0:
+            target += samples
+        else:
+            target += samples * np.float32(volume)
+        self.tracks += 1
+        return len(samples) / self.sample_rate
+
+    def add_file(self, path, start=0.0, volume=1.0, loop=False, duration=None):
+        """
+        오디오 파일을 더함. 디코딩된 원본 길이(초) 반환.
+
+        에셋 라이브러리의 PCM 캐시(memmap)를 그대로 읽으므로 같은 파일은 다시 디코딩하지 않는다.
+        """
+        asset = get_asset_library(sample_rate=self.sample_rate, channels=self.channels).load_audio(path)
+        self.add(asset.samples, start, volume, loop, duration)
+        return asset.duration
+
+    def render(self, limiter_threshold_db=DEFAULT_LIMITER_THRESHOLD_DB):
+        """소프트 리미터를 적용한 최종 믹스 (None이면 리미터 없이 그대로)."""
+        if limiter_threshold_db is None:
+            return self.buffer
+        return soft_limit(self.buffer, limiter_threshold_db)
+
+
+def encode_audio(samples, output_path, sample_rate=PCM_SAMPLE_RATE, codec="aac", bitrate=None):
+    """float32 PCM 배열을 ffmpeg stdin으로 넘겨 오디오 파일 하나로 인코딩 (비디오 mux용)."""
+    samples = np.ascontiguousarray(samples, dtype="<f4")
+    if samples.ndim == 1:
+        samples = samples.reshape(-1, 1)
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    command = [
+        FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "f32le", "-ar", str(int(sample_rate)), "-ac", str(samples.shape[1]), "-i", "pipe:0",
+        "-c:a", codec or "aac",
+    ]
+    if bitrate:
+        command += ["-b:a", str(bitrate)]
+    command.append(output_path)
+    result = subprocess.run(command, input=samples.tobytes(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"오디오 인코딩 실패: {message}")
+    return output_path
+
+
+def clip_soundtrack(audio_clip, duration, sample_rate=PCM_SAMPLE_RATE, channels=2):
+    """moviepy 오디오 클립을 한 번에 PCM으로 평가 (이미 같은 포맷의 배열 클립이면 배열을 그대로 사용)."""
+    array = getattr(audio_clip, "array", None)
+    if array is not None and getattr(audio_clip, "fps", None) == sample_rate:
+        samples = np.asarray(array, dtype=np.float32)
+    else:
+        samples = np.asarray(audio_clip.to_soundarray(fps=sample_rate), dtype=np.float32)
+    mix = AudioMix(duration, sample_rate, channels)
+    mix.add(samples)
+    return mix.buffer
@@ -4,11 +4,17 @@ import os
 import json
 import re
 import subprocess
-from moviepy import VideoFileClip, TextClip, CompositeVideoClip
-from PIL import ImageFont, ImageDraw, Image
+from moviepy import VideoFileClip, TextClip
 from tqdm import tqdm
 import numpy as np
 
+from video_filters import get_vignette, sample_grain
+from layer_compositor import LayerCompositor
+from font_registry import first_existing_font, get_font
+from text_layout import get_measurer, search_font_size, wrap_tokens
+from media_analysis import get_media_analysis
+from config_snapshot import get_config_snapshot
+
 try:
     import google.generativeai as genai
     GEMINI_AVAILABLE = True
@@ -17,26 +23,13 @@ except ImportError:
     GEMINI_AVAILABLE = False
 
 
-def load_config():
-    """설정 파일 로드"""
-    config_path = os.path.join("Config", "config.json")
-    if not os.path.exists(config_path):
-        return {}
-
-    with open(config_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+# 시작할 때 한 번 읽고 검증한 불변 설정 스냅샷 (호출마다 config.json을 다시 읽지 않음)
+CONFIG = get_config_snapshot(os.path.join("Config", "config.json"))
 
 
 def get_config_value(keys, default=None):
-    """중첩된 설정 값 가져오기"""
-    config = load_config()
-    value = config
-    for key in keys:
-        if isinstance(value, dict):
-            value = value.get(key)
-        else:
-            return default
-    return value if value is not None else default
+    """중첩된 설정 값 가져오기 (자주 읽는 값은 CONFIG의 속성을 사용)"""
+    return CONFIG.value(keys, default)
 
 
 def get_system_font():
@@ -51,9 +44,9 @@ def get_system_font():
             "/System/Library/Fonts/Supplemental/NotoSansGothic-Regular.ttf",  # Noto Sans Gothic
             "/Library/Fonts/AppleGothic.ttf",
         ]
-        for font_path in mac_fonts:
-            if os.path.exists(font_path):
-                return font_path
+        font_path = first_existing_font(mac_fonts)
+        if font_path:
+            return font_path
 
     elif system == "Windows":
         windows_fonts = [
@@ -61,9 +54,9 @@ def get_system_font():
             r"C:\Windows\Fonts\arial.ttf",       # Arial
             r"C:\Windows\Fonts\arialbd.ttf",     # Arial Bold
         ]
-        for font_path in windows_fonts:
-            if os.path.exists(font_path):
-                return font_path
+        font_path = first_existing_font(windows_fonts)
+        if font_path:
+            return font_path
 
     return None
 
@@ -86,21 +79,9 @@ def apply_cinematic_filter(get_frame, t):
     frame = get_frame(t)
     h, w = frame.shape[:2]
 
-    # 1. 강한 비네트 효과 생성
-    Y, X = np.ogrid[:h, :w]
-    center_y, center_x = h / 2, w / 2
-
-    # 거리 계산
-    dist_from_center = np.sqrt((X - center_x)**2 + (Y - center_y)**2)
-    max_dist = np.sqrt(center_x**2 + center_y**2)
-
-    # 비네트 강도 대폭 증가 (가장자리를 더 어둡게)
-    vignette = 1 - (dist_from_center / max_dist) * 0.7
-    vignette = np.clip(vignette, 0.4, 1.0)  # 최소 40% 밝기 (더 어두움)
-
-    # RGB 채널에 비네트 적용
-    vignette_3d = np.stack([vignette, vignette, vignette], axis=-1)
-    frame = (frame * vignette_3d).astype('uint8')
+    # 1. 강한 비네트 효과 (거리 × 0.7, 최소 40% 밝기) - 해상도별로 캐시된 배율 맵 사용
+    vignette = get_vignette(h, w, 1.0, 0.7, 0.4)
+    frame = (frame * vignette).astype('uint8')
 
     # 2. 전체 밝기 감소 + 시간에 따른 breathing 효과
     breathing = 0.85 + 0.08 * np.sin(2 * np.pi * t / 3.5)  # 3.5초 주기로 더 강하게 밝아졌다 어두워졌다
@@ -114,8 +95,8 @@ def apply_cinematic_filter(get_frame, t):
     # 4. Contrast 증가 (명암비 강화)
     frame = np.clip((frame - 128) * 1.15 + 128, 0, 255).astype('uint8')
 
-    # 5. 필름 그레인 효과 (미묘한 노이즈)
-    grain = np.random.randint(-3, 4, frame.shape, dtype=np.int16)
+    # 5. 필름 그레인 효과 (미묘한 노이즈) - 미리 생성한 그레인 텍스처 풀에서 샘플링
+    grain = sample_grain(frame.shape, -3, 4)
     frame = np.clip(frame.astype(np.int16) + grain, 0, 255).astype('uint8')
 
     return frame
@@ -144,7 +125,7 @@ class GeminiSubtitleGenerator:
         self.text_size = text_size
 
         # 랜덤 색상 설정 로드
-        self.random_colors_enabled = get_config_value(["subtitle_settings", "random_colors", "enabled"], False)
+        self.random_colors_enabled = CONFIG.subtitle.random_colors_enabled
         self.random_colors_list = get_config_value(["subtitle_settings", "random_colors", "colors"], ["white"])
         self.current_color_index = 0
 
@@ -166,17 +147,17 @@ class GeminiSubtitleGenerator:
         # 좌우 안전 여백 (자막 줄바꿈 폭 계산용)
         self.side_margin = int(get_config_value(["subtitle_settings", "side_margin"], 80))
         # 하단 클리핑 방지용 여유 패딩 (비디오 바닥과의 추가 간격)
-        self.bottom_safety = int(get_config_value(["subtitle_settings", "bottom_safety"], 8))
+        self.bottom_safety = CONFIG.subtitle.bottom_safety
         # 자막 겹침 방지 세부 설정
-        self.overlap_gap = max(0.0, float(get_config_value(["subtitle_settings", "safe_gap"], 0.1)))
-        self.min_visible_duration = max(0.1, float(get_config_value(["subtitle_settings", "min_visible_duration"], 0.35)))
-        self.strict_timing = bool(get_config_value(["subtitle_settings", "strict_timing"], True))
-        self.script_match_ratio = float(get_config_value(["subtitle_settings", "script_match_ratio"], 0.7))
-        self.script_min_chars = int(get_config_value(["subtitle_settings", "script_min_chars"], 6))
+        self.overlap_gap = CONFIG.subtitle.safe_gap
+        self.min_visible_duration = CONFIG.subtitle.min_visible_duration
+        self.strict_timing = CONFIG.subtitle.strict_timing
+        self.script_match_ratio = CONFIG.subtitle.script_match_ratio
+        self.script_min_chars = CONFIG.subtitle.script_min_chars
 
         # 자막 표시 시간 제어: 끝나고 조금 더 머무르게 + 너무 짧은 자막은 최소 시간 보장
-        self.extra_hold = float(get_config_value(["subtitle_settings", "extra_hold"], 0.6))
-        self.min_duration = float(get_config_value(["subtitle_settings", "min_duration"], 1.2))
+        self.extra_hold = CONFIG.subtitle.extra_hold
+        self.min_duration = CONFIG.subtitle.min_duration
 
         self.video = VideoFileClip(video_path)
         self.width = self.video.w
@@ -184,10 +165,8 @@ class GeminiSubtitleGenerator:
         self.sub_clips = []
 
         # Configure AI-script-only filtering
-        self.require_ai_script_only = bool(get_config_value(["subtitle_settings", "require_ai_script_only"], True))
-        self.script_filter_keep_ratio = max(0.0, min(1.0, float(
-            get_config_value(["subtitle_settings", "script_keep_ratio"], 0.5)
-        )))
+        self.require_ai_script_only = CONFIG.subtitle.require_ai_script_only
+        self.script_filter_keep_ratio = CONFIG.subtitle.script_keep_ratio
         self.ai_script_lines = self._load_ai_script_lines() if self.require_ai_script_only else []
         self._allowed_subtitle_texts = [self._normalize_text(line) for line in self.ai_script_lines if line]
 
@@ -273,16 +252,8 @@ class GeminiSubtitleGenerator:
         return False
 
     def _measure_text_width(self, text, font_size, stroke_width=0):
-        """PIL을 사용해 텍스트 픽셀 폭 측정"""
-        try:
-            font = ImageFont.truetype(self.text_font, font_size)
-        except Exception:
-            font = ImageFont.load_default()
-
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-        bbox = draw.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
-        return bbox[2] - bbox[0]
+        """PIL을 사용해 텍스트 픽셀 폭 측정 (폰트/측정 결과는 캐시에서 재사용)"""
+        return get_measurer(get_font(self.text_font, font_size), stroke_width).width(text)
 
     def _wrap_text_for_width(self, text, font_size, stroke_width, max_width):
         """주어진 폭에 맞춰 자동 줄바꿈 (영문은 단어 단위, CJK는 글자 단위)"""
@@ -292,30 +263,9 @@ class GeminiSubtitleGenerator:
         is_word_based = (" " in text)
         tokens = text.split(" ") if is_word_based else list(text)
 
-        lines = []
-        line = ""
-
-        def add_token(cur, tok):
-            if not cur:
-                return tok
-            return (cur + (" " if is_word_based else "") + tok)
-
-        for tok in tokens:
-            candidate = add_token(line, tok)
-            width = self._measure_text_width(candidate, font_size, stroke_width)
-            if width <= max_width:
-                line = candidate
-            else:
-                if line:
-                    # 현재 줄을 저장하고 토큰을 다음 줄로
-                    lines.append(line)
-                    line = tok
-                else:
-                    # 첫 토큰부터 넘치는 경우 - 단어를 그대로 다음 줄에 배치
-                    line = tok
-
-        if line:
-            lines.append(line)
+        # 토큰을 하나씩 더하며 누적 글리프 폭으로 측정 (첫 토큰부터 넘치면 그대로 한 줄에 배치)
+        measurer = get_measurer(get_font(self.text_font, font_size), stroke_width)
+        lines = wrap_tokens(tokens, measurer, max_width, joiner=" " if is_word_based else "")
 
         # 각 줄 트리밍 후 합치기
         return "\n".join(l.rstrip() for l in lines if l is not None)
@@ -327,6 +277,12 @@ class GeminiSubtitleGenerator:
         Returns:
             float: 침묵 끝 시간 (초)
         """
+        # 저해상도 분석 기록 (씬 전환/썸네일과 같은 1회 디코딩 결과)을 우선 사용
+        try:
+            return get_media_analysis(self.video_path).silence_offset(noise_threshold, min_silence)
+        except Exception as e:
+            print(f"   ⚠️ 분석 기록을 사용할 수 없어 ffmpeg silencedetect로 감지합니다: {e}")
+
         try:
             cmd = [
                 "ffmpeg", "-i", self.video_path,
@@ -442,25 +398,20 @@ Requirements:
         font_size = self.text_size
 
         try:
-            font = ImageFont.truetype(self.text_font, font_size)
+            get_font(self.text_font, font_size, fallback=False)
         except:
             # 폰트 로드 실패 시 기본 크기 반환
             return min(font_size, 50)
 
-        # PIL로 텍스트 너비 측정
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-        bbox = draw.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
-        text_width = bbox[2] - bbox[0]
+        # 텍스트가 최대 너비를 초과하면 폰트 크기 줄이기 (2px 간격 후보를 이진 탐색, 20px 이하에서 중단)
+        sizes = [font_size]
+        while sizes[-1] > 20:
+            sizes.append(max(sizes[-1] - 2, 12))
 
-        # 텍스트가 최대 너비를 초과하면 폰트 크기 줄이기
-        while text_width > max_width and font_size > 20:
-            font_size = max(font_size - 2, 12)
-            font = ImageFont.truetype(self.text_font, font_size)
-            bbox = draw.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
-            text_width = bbox[2] - bbox[0]
+        def fits(size):
+            return size == sizes[-1] or self._measure_text_width(text, size, stroke_width) <= max_width
 
-        return font_size
+        return sizes[search_font_size(sizes, fits)]
 
     def _build_subtitle_clips(self, segments, enforce_script_filter=True, show_progress=True):
         """Build subtitle clips and report how many were filtered out."""
@@ -615,8 +566,11 @@ Requirements:
         print("   🎨 시네마틱 필터 적용 중...")
         filtered_video = self.video.fl(apply_cinematic_filter)
 
-        # 비디오와 자막 합성
-        final_video = CompositeVideoClip([filtered_video] + self.sub_clips).with_duration(self.video.duration)
+        # 비디오와 자막 합성 (구간 인덱스로 프레임마다 활성 자막만 그리기)
+        final_video = LayerCompositor(filtered_video)
+        for sub_clip in self.sub_clips:
+            final_video.add_clip_layer(sub_clip)
+        final_video = final_video.with_audio(filtered_video.audio)
 
         # 비디오 출력
         final_video.write_videofile(
@@ -626,6 +580,7 @@ Requirements:
             fps=self.video.fps
         )
 
+        final_video.layers.report("   [LAYER]")
         print(f"✅ 자막 비디오 생성 완료: {output_path}")
 
     def generate(self, output_path):
@@ -668,7 +623,7 @@ def main():
             return
     else:
         # 인자가 없으면 Input 폴더에서 자동으로 찾기
-        input_dir = get_config_value(["paths", "input_dir"], "Input")
+        input_dir = CONFIG.paths.input_dir
         try:
             video_path = find_video_file(input_dir)
             print(f"🎥 발견된 비디오: {os.path.basename(video_path)}")
@@ -677,7 +632,7 @@ def main():
             return
 
     # 출력 경로 생성
-    output_dir = get_config_value(["paths", "output_dir"], "Output")
+    output_dir = CONFIG.paths.output_dir
     os.makedirs(output_dir, exist_ok=True)
 
     video_name = os.path.splitext(os.path.basename(video_path))[0]
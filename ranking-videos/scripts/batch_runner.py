@@ -0,0 +1,155 @@
+"""멀티 프로세스 배치 렌더러 (작업마다 격리된 자식 프로세스, 원자적 작업 선점, 처리량 집계)"""
+
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from collections import deque
+
+
+def default_ffmpeg_threads(workers, configured=None):
+    """워커 하나가 쓸 ffmpeg 스레드 수 (설정값 우선, 없으면 코어를 워커 수로 나눔)."""
+    if configured:
+        return int(configured)
+    if workers <= 1:
+        return 2
+    return max(1, (os.cpu_count() or 1) // int(workers))
+
+
+def _run_child(target, job, workdir, log_path, result_path, target_kwargs):
+    """자식 프로세스 진입점: 임시 경로를 워커 전용으로 바꾸고 target(job, workdir, ...) 실행."""
+    log_file = open(log_path, "a", encoding="utf-8", buffering=1)
+    sys.stdout = sys.stderr = log_file
+    os.environ["MOVIEPY_TEMP_DIR"] = workdir
+    for name in ("TMPDIR", "TEMP", "TMP"):
+        os.environ[name] = workdir
+    tempfile.tempdir = workdir
+
+    started = time.time()
+    result = {"status": "failed", "output": None, "duration": None}
+    try:
+        result.update(target(job, workdir, **target_kwargs) or {})
+        if result.get("output"):
+            result["status"] = "done"
+        else:
+            result.setdefault("error", "출력 파일 없음")
+    except BaseException as exc:
+        traceback.print_exc()
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["elapsed"] = time.time() - started
+
+    with open(result_path, "w", encoding="utf-8") as handle:
+        json.dump(result, handle, ensure_ascii=False)
+    log_file.flush()
+    os._exit(0 if result["status"] == "done" else 1)
+
+
+def _read_result(path):
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def run_batch(jobs, target, workers, work_root, claims, job_key=None, job_label=None, target_kwargs=None):
+    """
+    jobs를 최대 workers개의 자식 프로세스로 나눠 처리하고 요약 dict를 반환.
+
+    - 작업 하나 = 자식 프로세스 하나 (spawn): 크래시/메모리 누수가 다음 작업에 번지지 않음
+    - 배치마다 <work_root>/batch_<시각>_<pid>/ 아래 자식별 job_<번호> 임시 폴더 (끝나면 삭제),
+      로그는 같은 배치 폴더의 logs/ 에 남김
+    - claims: claim(key) / release(key) 객체 (예: 작업 저장소의 StoreClaims),
+      release는 자식이 끝날 때마다 호출
+    - target(job, workdir, **target_kwargs)는 모듈 최상위 함수여야 하며
+      {"output": 경로, "duration": 초} 를 반환 (output이 없으면 실패로 집계)
+    - 실패/크래시는 기록만 하고 나머지 작업을 계속 진행
+    """
+    job_key = job_key or (lambda job: job)
+    job_label = job_label or (lambda job: str(job))
+    target_kwargs = dict(target_kwargs or {})
+    workers = max(1, int(workers))
+    batch_dir = os.path.join(os.path.abspath(work_root), f"batch_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}")
+    log_dir = os.path.join(batch_dir, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    context = multiprocessing.get_context("spawn")
+    pending = deque(enumerate(jobs, 1))
+    total = len(pending)
+    running = {}  # sentinel → (process, index, job, workdir, log_path, result_path, started)
+    summary = {"total": total, "done": 0, "failed": 0, "skipped": 0, "video_seconds": 0.0, "results": []}
+    batch_started = time.time()
+
+    print(f"[BATCH] {total}개 작업, 워커 {workers}개 시작 (작업 폴더: {batch_dir})")
+
+    while pending or running:
+        while pending and len(running) < workers:
+            index, job = pending.popleft()
+            key = job_key(job)
+            if not claims.claim(key):
+                print(f"[BATCH] [{index}/{total}] 다른 워커가 처리 중이라 건너뜀: {job_label(job)}")
+                summary["skipped"] += 1
+                continue
+            workdir = os.path.join(batch_dir, f"job_{index:04d}")
+            os.makedirs(workdir, exist_ok=True)
+            log_path = os.path.join(log_dir, f"job_{index:04d}.log")
+            result_path = os.path.join(workdir, "result.json")
+            process = context.Process(
+                target=_run_child,
+                args=(target, job, workdir, log_path, result_path, target_kwargs),
+                name=f"batch-job-{index}",
+            )
+            try:
+                process.start()
+            except Exception as exc:
+                print(f"[BATCH] [{index}/{total}] 워커 시작 실패: {exc}")
+                claims.release(key)
+                summary["failed"] += 1
+                continue
+            running[process.sentinel] = (process, index, job, workdir, log_path, result_path, time.time())
+            print(f"[BATCH] [{index}/{total}] 시작 (pid {process.pid}): {job_label(job)}")
+
+        if not running:
+            break
+
+        for sentinel in multiprocessing.connection.wait(list(running)):
+            process, index, job, workdir, log_path, result_path, started = running.pop(sentinel)
+            process.join()
+            result = _read_result(result_path) or {
+                "status": "failed",
+                "error": f"워커 비정상 종료 (exit code {process.exitcode})",
+            }
+            result["elapsed"] = result.get("elapsed") or (time.time() - started)
+            result["job"] = job_label(job)
+            result["log"] = log_path
+            claims.release(job_key(job))
+            shutil.rmtree(workdir, ignore_errors=True)
+
+            if result.get("status") == "done":
+                summary["done"] += 1
+                summary["video_seconds"] += float(result.get("duration") or 0.0)
+                print(f"[BATCH] [{index}/{total}] 완료 ({result['elapsed']:.1f}초): {result.get('output')}")
+            else:
+                summary["failed"] += 1
+                print(f"[BATCH] [{index}/{total}] 실패 ({result['elapsed']:.1f}초): {result.get('error')}")
+                print(f"   로그: {log_path}")
+            summary["results"].append(result)
+
+    wall = time.time() - batch_started
+    summary["wall_seconds"] = wall
+    summary["videos_per_hour"] = summary["done"] * 3600.0 / wall if wall > 0 else 0.0
+    summary["realtime_factor"] = summary["video_seconds"] / wall if wall > 0 else 0.0
+    print(
+        f"[BATCH] 완료 {summary['done']} / 실패 {summary['failed']} / 건너뜀 {summary['skipped']} "
+        f"(전체 {total}), 경과 {wall:.1f}초"
+    )
+    print(
+        f"[BATCH] 처리량: 시간당 {summary['videos_per_hour']:.1f}개, "
+        f"출력 {summary['video_seconds']:.1f}초 분량 (실시간 대비 {summary['realtime_factor']:.2f}배)"
+    )
+    return summary
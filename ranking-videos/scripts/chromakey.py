@@ -0,0 +1,301 @@
+"""크로마키 엔진 (오버레이 크기에서 정수 거리 키잉 + 바이트 한도 LRU + 루프 주기 재사용 + 사전 키잉 디스크 캐시)"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+
+import numpy as np
+from PIL import Image
+from moviepy import VideoFileClip
+from moviepy.video.VideoClip import VideoClip
+
+from layer_compositor import Sprite, SpriteSequenceClip
+from video_filters import FrameAssetCache
+
+
+KEY_COLORS = {
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+}
+
+DEFAULT_THRESHOLD = 100
+DEFAULT_CACHE_MB = 64
+
+# 키잉 결과가 바뀌는 코드 변경 시 올려서 기존 사전 키잉 캐시를 무효화
+PREKEY_CACHE_VERSION = 1
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
+
+
+def _key_color(color):
+    return KEY_COLORS.get(str(color).lower(), KEY_COLORS["blue"])
+
+
+def keyed_region(frame, color="green", threshold=DEFAULT_THRESHOLD):
+    """
+    키 색상과의 유클리드 거리가 threshold 이하인 픽셀 (bool 배열).
+
+    float32 norm 대신 채널별 정수 차이의 제곱합을 threshold² 와 비교 (sqrt 없음, 같은 판정).
+    """
+    threshold = float(np.clip(threshold, 0, 255))
+    limit = int(math.floor(threshold * threshold))
+    distance_sq = None
+    for channel, key_value in enumerate(_key_color(color)):
+        diff = frame[..., channel].astype(np.int32)
+        diff -= key_value
+        diff *= diff
+        if distance_sq is None:
+            distance_sq = diff
+        else:
+            distance_sq += diff
+    return distance_sq <= limit
+
+
+def remove_chromakey(frame, color='green', threshold=DEFAULT_THRESHOLD, blend=1):
+    """
+    Remove a chroma key background from an RGB frame.
+
+    Args:
+        frame: numpy array (H, W, 3) in RGB order.
+        color: 'green' or 'blue' indicating the key color.
+        threshold: Euclidean color distance treated as keyed (0-255).
+        blend: Optional Gaussian blur strength for soft edges.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (cleaned RGB frame, alpha mask 0.0-1.0).
+    """
+    frame = np.asarray(frame)
+    if frame.dtype != np.uint8:
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+
+    alpha = (~keyed_region(frame, color, threshold)).astype(np.float32)
+
+    if blend > 0 and alpha.size:
+        try:
+            from scipy.ndimage import gaussian_filter
+            alpha = np.clip(gaussian_filter(alpha, sigma=blend), 0.0, 1.0)
+        except ImportError:
+            pass
+
+    cleaned_frame = frame.copy()
+    cleaned_frame[alpha <= 0.01] = 0
+
+    return cleaned_frame, alpha
+
+
+def loop_frame_index(t, fps, period, frame_count):
+    """출력 시간 → 원본 프레임 번호 (VideoFileClip.get_frame과 같은 반올림, 원본 길이 주기로 반복)."""
+    local_t = math.fmod(max(0.0, float(t)), period) if period > 0 else 0.0
+    return min(int(fps * local_t + 0.00001), frame_count - 1)
+
+
+def premultiply(rgb, alpha):
+    """키잉 결과 (RGB, 알파 0.0-1.0) → premultiplied uint8 RGBA (Sprite.from_rgba와 같은 반올림)."""
+    a = np.clip(np.rint(np.asarray(alpha, dtype=np.float32) * 255.0), 0, 255).astype(np.uint8)
+    rgba = np.empty(a.shape + (4,), dtype=np.uint8)
+    color = rgb[..., :3] * a[..., np.newaxis].astype(np.uint16)
+    color += 127
+    color //= 255
+    rgba[..., :3] = color
+    rgba[..., 3] = a
+    return rgba
+
+
+class ChromakeyEngine:
+    """
+    크로마키 리액션 영상 하나를 오버레이 크기로 키잉해 프레임 단위로 제공.
+
+    - 원본 프레임을 먼저 오버레이 크기로 줄인 뒤 키잉 (전체 해상도 키잉 후 resized 하지 않음)
+    - 출력 시간 t는 원본 길이로 나눈 나머지 → 원본 프레임 번호로 매핑 (루프 반복분은 재키잉 없음)
+    - 키잉 결과는 프레임 번호 키의 바이트 한도 LRU(FrameAssetCache)에 보관
+    """
+
+    def __init__(self, video_path, scale=0.2, color="green", threshold=DEFAULT_THRESHOLD,
+                 blend=0, max_cache_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.video_path = video_path
+        self.source = VideoFileClip(video_path, audio=False)
+        self.color = color
+        self.threshold = threshold
+        # blend(가우시안 sigma)는 원본 픽셀 기준 값이므로 오버레이 배율만큼 줄여 적용
+        self.blend = float(blend or 0) * float(scale)
+        self.fps = float(self.source.fps or 30.0)
+        self.period = float(self.source.duration)
+        self.frame_count = max(1, int(getattr(self.source, "n_frames", 0) or round(self.period * self.fps)))
+        width, height = self.source.size
+        self.size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        self.cache = FrameAssetCache(max_cache_bytes)
+
+    def frame_index(self, t):
+        return loop_frame_index(t, self.fps, self.period, self.frame_count)
+
+    def _key_source_frame(self, index):
+        frame = self.source.get_frame(index / self.fps)
+        if (frame.shape[1], frame.shape[0]) != self.size:
+            frame = np.array(Image.fromarray(frame).resize(self.size, Image.Resampling.LANCZOS))
+        return remove_chromakey(frame, color=self.color, threshold=self.threshold, blend=self.blend)
+
+    def get(self, t):
+        """(키잉된 RGB uint8, 알파 float32 0.0-1.0) — 오버레이 크기."""
+        index = self.frame_index(t)
+        return self.cache.get(index, lambda: self._key_source_frame(index))
+
+    def make_clip(self, duration):
+        """duration 길이의 마스크 포함 VideoClip (원본 길이보다 길면 자동 반복)."""
+        clip = VideoClip(duration=duration)
+        clip.frame_function = lambda t: self.get(t)[0]
+        clip.size = self.size
+        mask = VideoClip(is_mask=True, duration=duration)
+        mask.frame_function = lambda t: self.get(t)[1]
+        mask.size = self.size
+        clip = clip.with_mask(mask).with_fps(self.fps)
+        clip.chromakey_engine = self
+        return clip
+
+    def close(self):
+        self.cache.clear()
+        self.source.close()
+
+    def report(self, label="[CHROMAKEY]"):
+        print(
+            f"{label} 키잉 프레임 {self.cache.misses}개 (원본 {self.frame_count}프레임), "
+            f"캐시 적중 {self.cache.hits}, 메모리 {self.cache.current_bytes / (1024 * 1024):.1f}MB"
+        )
+
+
+_FILE_HASHES = {}
+_FILE_HASH_LOCK = threading.Lock()
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """파일 내용 sha1 (같은 프로세스에서는 (경로, 크기, 수정 시각)이 같으면 다시 읽지 않음)."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _FILE_HASH_LOCK:
+        cached = _FILE_HASHES.get(memo_key)
+    if cached is None:
+        digest = hashlib.sha1()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b""):
+                digest.update(chunk)
+        cached = digest.hexdigest()
+        with _FILE_HASH_LOCK:
+            _FILE_HASHES[memo_key] = cached
+    return cached
+
+
+def prekey_cache_key(video_path, color, threshold, blend, scale):
+    """파일 해시 + 키 색상/임계값/블렌드/배율로 사전 키잉 캐시 키 생성."""
+    payload = json.dumps({
+        "version": PREKEY_CACHE_VERSION,
+        "file": file_hash(video_path),
+        "color": str(color).lower(),
+        "threshold": float(threshold),
+        "blend": float(blend or 0),
+        "scale": float(scale),
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class PrekeyedReaction:
+    """
+    사전 키잉된 리액션 영상 (N, h, w, 4) premultiplied RGBA 메모리 맵.
+
+    프레임은 디스크에서 필요한 부분만 읽히며, 합성은 Sprite.blend_into 정수 경로를 그대로 사용.
+    """
+
+    def __init__(self, frames, fps, period, path=None):
+        self.frames = frames
+        self.fps = float(fps)
+        self.period = float(period)
+        self.frame_count = int(frames.shape[0])
+        self.size = (int(frames.shape[2]), int(frames.shape[1]))
+        self.path = path
+
+    def frame_index(self, t):
+        return loop_frame_index(t, self.fps, self.period, self.frame_count)
+
+    def sprite_at(self, t):
+        return Sprite(self.frames[self.frame_index(t)], (0, 0), self.size)
+
+    def make_clip(self, duration):
+        """duration 길이의 SpriteSequenceClip (원본 길이보다 길면 자동 반복)."""
+        clip = SpriteSequenceClip(self.sprite_at, self.size, duration=duration).with_fps(self.fps)
+        clip.prekeyed_reaction = self
+        return clip
+
+
+def _write_prekeyed(video_path, npy_path, meta_path, scale, color, threshold, blend):
+    engine = ChromakeyEngine(video_path, scale=scale, color=color, threshold=threshold,
+                             blend=blend, max_cache_bytes=0)
+    tmp_path = f"{npy_path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+    try:
+        width, height = engine.size
+        frames = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.uint8, shape=(engine.frame_count, height, width, 4)
+        )
+        for index in range(engine.frame_count):
+            rgb, alpha = engine._key_source_frame(index)
+            frames[index] = premultiply(rgb, alpha)
+        frames.flush()
+        del frames
+        os.replace(tmp_path, npy_path)
+        meta = {"fps": engine.fps, "period": engine.period, "source": os.path.abspath(video_path)}
+        with open(f"{meta_path}.tmp", "w", encoding="utf-8") as handle:
+            json.dump(meta, handle, ensure_ascii=False)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        return engine.frame_count
+    finally:
+        engine.close()
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def load_prekeyed_reaction(video_path, cache_dir, scale=0.2, color="green",
+                           threshold=DEFAULT_THRESHOLD, blend=0):
+    """
+    사전 키잉 캐시에서 리액션 영상을 열고, 없으면 한 번 전체 키잉해서 저장.
+
+    캐시 파일: <cache_dir>/<key>.npy (프레임 배열) + <key>.json (fps, 원본 길이).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    key = prekey_cache_key(video_path, color, threshold, blend, scale)
+    npy_path = os.path.join(cache_dir, f"{key}.npy")
+    meta_path = os.path.join(cache_dir, f"{key}.json")
+
+    if not (os.path.exists(npy_path) and os.path.exists(meta_path)):
+        print(f"   [CHROMAKEY] 사전 키잉 캐시 생성: {os.path.basename(video_path)}")
+        frame_count = _write_prekeyed(video_path, npy_path, meta_path, scale, color, threshold, blend)
+        print(f"   [CHROMAKEY] {frame_count}프레임 저장 ({os.path.getsize(npy_path) / (1024 * 1024):.1f}MB)")
+    else:
+        print(f"   [CHROMAKEY] 사전 키잉 캐시 사용: {os.path.basename(npy_path)}")
+
+    with open(meta_path, "r", encoding="utf-8") as handle:
+        meta = json.load(handle)
+    frames = np.load(npy_path, mmap_mode="r")
+    return PrekeyedReaction(frames, meta["fps"], meta["period"], npy_path)
+
+
+def prekey_directory(directory, cache_dir, scale=0.2, color="green", threshold=DEFAULT_THRESHOLD, blend=0):
+    """폴더 안의 크로마키 영상을 모두 미리 키잉 (이미 캐시된 파일은 건너뜀)."""
+    count = 0
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(VIDEO_EXTENSIONS):
+            continue
+        try:
+            load_prekeyed_reaction(os.path.join(directory, filename), cache_dir, scale, color, threshold, blend)
+            count += 1
+        except Exception as exc:
+            print(f"   [WARNING] 사전 키잉 실패: {filename} ({exc})")
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("사용법: python scripts/chromakey.py <크로마키 폴더> <캐시 폴더> [배율]")
+        sys.exit(1)
+    prekey_directory(sys.argv[1], sys.argv[2], float(sys.argv[3]) if len(sys.argv) > 3 else 0.2)
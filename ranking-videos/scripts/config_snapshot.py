@@ -0,0 +1,466 @@
+"""설정 스냅샷 (config.json을 시작할 때 한 번 읽어 검증한 불변 dataclass, 레이아웃 폴백까지 미리 해석)"""
+
+import copy
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+
+
+class ConfigError(ValueError):
+    """설정 파일/값이 잘못되어 작업을 시작할 수 없음."""
+
+
+def _lookup(data, path):
+    current = data
+    for key in path:
+        if isinstance(current, list) and str(key).isdigit():
+            index = int(key)
+            current = current[index] if index < len(current) else None
+            continue
+        if not isinstance(current, dict):
+            return None
+        current = current.get(key)
+    return current
+
+
+def _flatten(data, prefix=(), out=None):
+    """{(키, 키, ...): 값} 색인 (중간 dict도 포함)."""
+    if out is None:
+        out = {}
+    for key, value in data.items():
+        path = prefix + (key,)
+        out[path] = value
+        if isinstance(value, dict):
+            _flatten(value, path, out)
+    return out
+
+
+class _Reader:
+    """원본 dict에서 경로별 값을 읽어 형 변환/범위 검증 (잘못된 값은 경로와 함께 ConfigError)."""
+
+    def __init__(self, data, source):
+        self.data = data
+        self.source = source
+
+    def _fail(self, path, message, value):
+        raise ConfigError(f"설정 값 오류 ({self.source}): {'.'.join(path)} {message}: {value!r}")
+
+    def get(self, path, default=None):
+        value = _lookup(self.data, path)
+        return default if value is None else value
+
+    def number(self, path, default, kind=float, minimum=None, maximum=None):
+        value = self.get(path, default)
+        if value is None:
+            return None
+        if isinstance(value, bool):
+            self._fail(path, "값은 숫자여야 합니다", value)
+        try:
+            number = kind(value)
+        except (TypeError, ValueError):
+            self._fail(path, "값은 숫자여야 합니다", value)
+        if minimum is not None and number < minimum:
+            self._fail(path, f"값은 {minimum} 이상이어야 합니다", value)
+        if maximum is not None and number > maximum:
+            self._fail(path, f"값은 {maximum} 이하여야 합니다", value)
+        return number
+
+    def flag(self, path, default):
+        value = self.get(path, default)
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in ("true", "false", "1", "0", "yes", "no"):
+            return value.strip().lower() in ("true", "1", "yes")
+        self._fail(path, "값은 true/false 여야 합니다", value)
+
+    def text(self, path, default):
+        value = self.get(path, default)
+        if value is None:
+            return None
+        if isinstance(value, (dict, list)):
+            self._fail(path, "값은 문자열이어야 합니다", value)
+        return str(value)
+
+    def layout(self, category, key, fallback_path, default, **number_kwargs):
+        """layout_settings.<category>.<key> 우선, 없으면 기존 경로 (둘 다 없으면 default)."""
+        path = ("layout_settings", category, key)
+        if _lookup(self.data, path) is None:
+            path = tuple(fallback_path)
+        return self.number(path, default, **number_kwargs)
+
+
+@dataclass(frozen=True, slots=True)
+class PathSettings:
+    input_dir: str
+    output_dir: str
+    temp_dir: str
+    use_timestamp_prefix: bool
+
+
+@dataclass(frozen=True, slots=True)
+class WaveEffectSettings:
+    amplitude_x: float
+    amplitude_y: float
+    frequency: float
+    speed: float
+
+
+@dataclass(frozen=True, slots=True)
+class SceneChangeSettings:
+    enabled: bool
+    threshold: float
+    min_scene_duration: float
+    flash_duration: float
+    flash_intensity: float
+
+
+@dataclass(frozen=True, slots=True)
+class VideoSettings:
+    """effect_cache_mb None이면 video_filters 기본 한도."""
+    speed_factor: float
+    fit_mode: str
+    top_padding: int
+    bottom_padding: int
+    letterbox_color: object
+    wave: WaveEffectSettings
+    scene_change: SceneChangeSettings
+    effect_cache_mb: object
+
+
+@dataclass(frozen=True, slots=True)
+class AudioSettings:
+    codec: str
+    audio_codec: str
+    voice_volume: float
+    sound_effect_volume: float
+    background_music_volume: float
+    enable_background_music: bool
+    ducking_volume: float
+    ducking_attack_ms: float
+    ducking_release_ms: float
+    limiter_threshold_db: float
+
+
+@dataclass(frozen=True, slots=True)
+class VoiceSettings:
+    """tts_workers / tts_cache_max_mb None이면 voice_overlay / tts_cache 기본값."""
+    speed: float
+    tts_workers: object
+    tts_cache_enabled: bool
+    tts_cache_dir: object
+    tts_cache_max_mb: object
+
+
+@dataclass(frozen=True, slots=True)
+class SubtitleSettings:
+    stroke_width: int
+    stroke_color: str
+    style: str
+    italic_shear: float
+    force_pil_renderer: bool
+    random_colors_enabled: bool
+    min_duration: float
+    extra_hold: float
+    safe_gap: float
+    min_visible_duration: float
+    strict_timing: bool
+    script_match_ratio: float
+    script_min_chars: int
+    bottom_safety: int
+    require_ai_script_only: bool
+    script_keep_ratio: float
+    line_spacing: object  # None이면 폰트 크기 // 6 (최소 6)
+    exit_vertical_offset: float
+    exit_scale_reduction: float
+    sprite_cache_enabled: bool
+    sprite_cache_dir: object
+    sprite_cache_memory_mb: float
+    sprite_cache_disk_mb: float
+    sprite_workers: int
+
+
+@dataclass(frozen=True, slots=True)
+class LayoutSettings:
+    """layout_settings → 기존 경로 → 기본값 순으로 미리 해석한 배치 값 (1080x1920 기준)."""
+    video_scale: float
+    video_offset_y: int
+    subtitle_font_size: int
+    subtitle_bottom_margin: int
+    subtitle_side_margin: int
+
+
+@dataclass(frozen=True, slots=True)
+class ChromakeySettings:
+    """cache_mb None이면 chromakey 모듈 기본 한도."""
+    cache_mb: object
+    threshold: float
+    blend: float
+    prekey: bool
+    prekey_dir: object
+
+
+@dataclass(frozen=True, slots=True)
+class OverlaySettings:
+    """frame_overlay / reaction_video 배치 값."""
+    frame_enabled: bool
+    frame_image_path: object
+    frame_scale: float
+    frame_opacity: float
+    frame_position: object
+    reaction_enabled: bool
+    reaction_height_ratio: float
+
+
+@dataclass(frozen=True, slots=True)
+class BatchSettings:
+    """배치 렌더링 (workers <= 1이면 기존 순차 처리, ffmpeg_threads None이면 코어 수/워커 수, job_store_path None이면 temp_dir/jobs.sqlite, 로컬 디스크 경로만 지원)."""
+    workers: int
+    ffmpeg_threads: object
+    claim_ttl_minutes: float
+    job_store_path: object
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """
+    설정 파일 하나의 불변 스냅샷.
+
+    - 렌더링 중에 숫자로 변환하는 값은 형 변환/검증을 끝낸 속성
+      (paths / video / audio / voice / subtitle / layout / chromakey / overlay / batch)
+    - voice_profiles.* 와 video_settings.filter_chain 은 이름이 자유로운 구조라 값만 검증하고 value()로 조회
+    - 그 밖의 값은 value(path, default)로 평탄화된 색인에서 바로 조회
+      (dict/list는 복사본을 돌려주므로 호출자가 바꿔도 스냅샷은 그대로)
+    """
+    source: str
+    paths: PathSettings
+    video: VideoSettings
+    audio: AudioSettings
+    voice: VoiceSettings
+    subtitle: SubtitleSettings
+    layout: LayoutSettings
+    chromakey: ChromakeySettings
+    overlay: OverlaySettings
+    batch: BatchSettings
+    _values: dict = field(repr=False, compare=False)
+
+    def value(self, path, default=None):
+        value = self._values.get(tuple(path))
+        if value is None:
+            return default
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+
+# voice_profiles.<이름> 에서 숫자로 변환하는 키
+VOICE_PROFILE_NUMBERS = (
+    "speed", "pitch_shift", "compression_threshold", "compression_ratio",
+    "compression_attack", "compression_release", "gain",
+)
+
+
+def _validate_voice_profiles(read):
+    profiles = read.get(("voice_profiles",), {})
+    if not isinstance(profiles, dict):
+        read._fail(("voice_profiles",), "값은 객체여야 합니다", profiles)
+    for name, profile in profiles.items():
+        if not isinstance(profile, dict):
+            read._fail(("voice_profiles", name), "값은 객체여야 합니다", profile)
+        for key in VOICE_PROFILE_NUMBERS:
+            read.number(("voice_profiles", name, key), None)
+
+
+def _validate_filter_chain(read):
+    """filter_chain 항목 형식과 숫자 파라미터 (알 수 없는 필터 이름은 video_filters가 경고 후 건너뜀)."""
+    path = ("video_settings", "filter_chain")
+    chain = read.get(path)
+    if chain is None:
+        return
+    if not isinstance(chain, list):
+        read._fail(path, "값은 목록이어야 합니다", chain)
+    for index, entry in enumerate(chain):
+        entry_path = path + (str(index),)
+        if isinstance(entry, str):
+            continue
+        if not isinstance(entry, dict):
+            read._fail(entry_path, "항목은 필터 이름 또는 객체여야 합니다", entry)
+        for key, value in entry.items():
+            if key == "name":
+                continue
+            if key == "enabled":
+                if not isinstance(value, bool):
+                    read._fail(entry_path + (key,), "값은 true/false 여야 합니다", value)
+            elif key == "passes":
+                if not isinstance(value, list) or not all(
+                    isinstance(item, list) and len(item) == 3
+                    and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in item)
+                    for item in value
+                ):
+                    read._fail(entry_path + (key,), "값은 [radius, percent, threshold] 목록이어야 합니다", value)
+            else:
+                read.number(entry_path + (key,), None)
+
+
+def build_config_snapshot(data, source="<config>"):
+    """원본 설정 dict → ConfigSnapshot (잘못된 값이 있으면 ConfigError)."""
+    if not isinstance(data, dict):
+        raise ConfigError(f"설정 파일 최상위는 객체여야 합니다: {source}")
+    read = _Reader(data, source)
+    sub = ("subtitle_settings",)
+    wave = ("video_settings", "wave_effect")
+    scene = ("video_settings", "scene_change_effect")
+    voice = ("voice_settings",)
+    sprite = sub + ("sprite_cache",)
+    exit_animation = sub + ("exit_animation",)
+    chroma = ("chromakey_settings",)
+    frame = ("frame_overlay",)
+    _validate_voice_profiles(read)
+    _validate_filter_chain(read)
+
+    return ConfigSnapshot(
+        source=source,
+        paths=PathSettings(
+            input_dir=read.text(("paths", "input_dir"), "Input"),
+            output_dir=read.text(("paths", "output_dir"), "Output"),
+            temp_dir=read.text(("paths", "temp_dir"), "Temp"),
+            use_timestamp_prefix=read.flag(("paths", "use_timestamp_prefix"), False),
+        ),
+        video=VideoSettings(
+            speed_factor=read.number(("video_settings", "speed_factor"), 1.0, minimum=0.01),
+            fit_mode=read.text(("video_settings", "fit_mode"), "letterbox").lower(),
+            top_padding=max(0, read.number(("video_settings", "top_padding"), 0, int)),
+            bottom_padding=max(0, read.number(("video_settings", "bottom_padding"), 0, int)),
+            letterbox_color=read.get(("video_settings", "letterbox_color"), "#000000"),
+            wave=WaveEffectSettings(
+                amplitude_x=read.number(wave + ("amplitude_x",), 3),
+                amplitude_y=read.number(wave + ("amplitude_y",), 2),
+                frequency=read.number(wave + ("frequency",), 2.0),
+                speed=read.number(wave + ("speed",), 1.5),
+            ),
+            scene_change=SceneChangeSettings(
+                enabled=read.flag(scene + ("enabled",), False),
+                threshold=read.number(scene + ("threshold",), 30.0, minimum=0.0),
+                min_scene_duration=read.number(scene + ("min_scene_duration",), 1.0, minimum=0.0),
+                flash_duration=read.number(scene + ("flash_duration",), 0.15, minimum=0.0),
+                flash_intensity=read.number(scene + ("flash_intensity",), 1.5, minimum=0.0),
+            ),
+            effect_cache_mb=read.number(("video_settings", "effect_cache_mb"), None, minimum=1.0),
+        ),
+        audio=AudioSettings(
+            codec=read.text(("audio_settings", "codec"), "libx264"),
+            audio_codec=read.text(("audio_settings", "audio_codec"), "aac"),
+            voice_volume=read.number(("audio_settings", "voice_volume"), 1.0, minimum=0.0),
+            sound_effect_volume=read.number(("audio_settings", "sound_effect_volume"), 1.0, minimum=0.0),
+            background_music_volume=read.number(("audio_settings", "background_music_volume"), 0.5, minimum=0.0),
+            enable_background_music=read.flag(("audio_settings", "enable_background_music"), True),
+            ducking_volume=read.number(("audio_settings", "ducking_volume"), 0.3, minimum=0.0, maximum=1.0),
+            ducking_attack_ms=read.number(("audio_settings", "ducking_attack_ms"), 60.0, minimum=0.0),
+            ducking_release_ms=read.number(("audio_settings", "ducking_release_ms"), 300.0, minimum=0.0),
+            limiter_threshold_db=read.number(("audio_settings", "limiter_threshold_db"), -1.0, maximum=0.0),
+        ),
+        voice=VoiceSettings(
+            speed=read.number(voice + ("speed",), 1.0, minimum=0.01),
+            tts_workers=read.number(voice + ("tts_workers",), None, int, minimum=1),
+            tts_cache_enabled=read.flag(voice + ("tts_cache", "enabled"), True),
+            tts_cache_dir=read.text(voice + ("tts_cache", "dir"), None),
+            tts_cache_max_mb=read.number(voice + ("tts_cache", "max_mb"), None, minimum=1.0),
+        ),
+        subtitle=SubtitleSettings(
+            stroke_width=read.number(sub + ("stroke_width",), 5, int, minimum=0),
+            stroke_color=read.text(sub + ("stroke_color",), "black"),
+            style=(read.text(sub + ("style",), "capcut") or "capcut").lower(),
+            italic_shear=read.number(sub + ("italic_shear",), 0.22),
+            force_pil_renderer=read.flag(sub + ("force_pil_renderer",), False),
+            random_colors_enabled=read.flag(sub + ("random_colors", "enabled"), False),
+            min_duration=read.number(sub + ("min_duration",), 1.2, minimum=0.0),
+            extra_hold=read.number(sub + ("extra_hold",), 0.6, minimum=0.0),
+            safe_gap=max(0.0, read.number(sub + ("safe_gap",), 0.1)),
+            min_visible_duration=max(0.1, read.number(sub + ("min_visible_duration",), 0.35)),
+            strict_timing=read.flag(sub + ("strict_timing",), True),
+            script_match_ratio=read.number(sub + ("script_match_ratio",), 0.7),
+            script_min_chars=read.number(sub + ("script_min_chars",), 6, int),
+            bottom_safety=read.number(sub + ("bottom_safety",), 8, int),
+            require_ai_script_only=read.flag(sub + ("require_ai_script_only",), True),
+            script_keep_ratio=max(0.0, min(1.0, read.number(sub + ("script_keep_ratio",), 0.5))),
+            line_spacing=read.number(sub + ("line_spacing",), None, int),
+            exit_vertical_offset=read.number(exit_animation + ("vertical_offset",), 60.0),
+            exit_scale_reduction=read.number(exit_animation + ("scale_reduction",), 0.08),
+            sprite_cache_enabled=read.flag(sprite + ("enabled",), True),
+            sprite_cache_dir=read.text(sprite + ("dir",), None),
+            sprite_cache_memory_mb=read.number(sprite + ("memory_mb",), 64.0, minimum=1.0),
+            sprite_cache_disk_mb=read.number(sprite + ("disk_mb",), 256.0, minimum=0.0),
+            sprite_workers=read.number(sprite + ("workers",), 4, int, minimum=1),
+        ),
+        layout=LayoutSettings(
+            video_scale=read.layout("video", "scale", ("video_settings", "main_video_scale"), 1.0, minimum=0.01),
+            video_offset_y=read.layout("video", "offset_y", ("video_settings", "main_video_offset_y"), 40, kind=int),
+            subtitle_font_size=read.layout("subtitle", "font_size", sub + ("text_size",), 35, kind=int, minimum=1),
+            subtitle_bottom_margin=read.layout("subtitle", "bottom_margin", sub + ("bottom_margin",), 600, kind=int),
+            subtitle_side_margin=read.layout("subtitle", "side_margin", sub + ("side_margin",), 90, kind=int),
+        ),
+        chromakey=ChromakeySettings(
+            cache_mb=read.number(chroma + ("cache_mb",), None, minimum=1.0),
+            threshold=read.number(chroma + ("threshold",), 100.0, minimum=0.0),
+            blend=read.number(chroma + ("blend",), 0.0, minimum=0.0),
+            prekey=read.flag(chroma + ("prekey",), True),
+            prekey_dir=read.text(chroma + ("prekey_dir",), None),
+        ),
+        overlay=OverlaySettings(
+            frame_enabled=read.flag(frame + ("enabled",), False),
+            frame_image_path=read.text(frame + ("image_path",), None),
+            frame_scale=read.number(frame + ("scale",), 1.0, minimum=0.01),
+            frame_opacity=read.number(frame + ("opacity",), 1.0, minimum=0.0, maximum=1.0),
+            frame_position=read.get(frame + ("position",), "center"),
+            reaction_enabled=read.flag(("reaction_video", "enabled"), False),
+            reaction_height_ratio=max(0.05, min(0.5, read.number(("reaction_video", "height_ratio"), 0.2))),
+        ),
+        batch=BatchSettings(
+            workers=read.number(("batch_settings", "workers"), 1, int, minimum=1),
+            ffmpeg_threads=read.number(("batch_settings", "ffmpeg_threads"), None, int, minimum=1),
+            claim_ttl_minutes=read.number(("batch_settings", "claim_ttl_minutes"), 360.0, minimum=1.0),
+            job_store_path=read.text(("batch_settings", "job_store_path"), None),
+        ),
+        _values=_flatten(copy.deepcopy(data)),
+    )
+
+
+def load_config_snapshot(path):
+    """설정 파일(JSON)을 읽어 스냅샷으로 (파일이 없으면 기본값만 있는 스냅샷)."""
+    if not os.path.exists(path):
+        return build_config_snapshot({}, path)
+    with open(path, "r", encoding="utf-8") as handle:
+        try:
+            data = json.load(handle)
+        except json.JSONDecodeError as exc:
+            raise ConfigError(f"설정 파일 파싱에 실패했습니다: {path}") from exc
+    return build_config_snapshot(data, path)
+
+
+_SNAPSHOTS = {}
+_SNAPSHOTS_LOCK = threading.Lock()
+
+
+def get_config_snapshot(path):
+    """경로별로 프로세스에서 한 번만 읽는 공용 스냅샷."""
+    key = os.path.abspath(path)
+    with _SNAPSHOTS_LOCK:
+        snapshot = _SNAPSHOTS.get(key)
+        if snapshot is None:
+            snapshot = load_config_snapshot(path)
+            _SNAPSHOTS[key] = snapshot
+        return snapshot
+
+
+if __name__ == "__main__":
+    config_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join("Config", "config.json")
+    try:
+        snapshot = load_config_snapshot(config_path)
+    except ConfigError as exc:
+        print(f"[CONFIG] {exc}")
+        sys.exit(1)
+    for name in ("paths", "video", "audio", "voice", "subtitle", "layout", "chromakey", "overlay", "batch"):
+        print(f"{name}: {getattr(snapshot, name)}")
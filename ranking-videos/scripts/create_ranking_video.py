@@ -8,11 +8,8 @@ from moviepy import (
     TextClip,
     CompositeVideoClip,
     concatenate_videoclips,
-    ColorClip,
-    AudioFileClip,
-    CompositeAudioClip
+    ColorClip
 )
-from moviepy.audio.fx import MultiplyVolume, AudioLoop
 from PIL import Image, ImageDraw, ImageFont
 import json
 import re
@@ -20,6 +17,14 @@ from datetime import datetime
 import sys
 import random
 
+from asset_library import AUDIO_EXTENSIONS, IMAGE_EXTENSIONS, get_asset_library
+from audio_mix import DEFAULT_LIMITER_THRESHOLD_DB, AudioMix, clip_soundtrack, encode_audio, soft_limit
+from font_registry import find_font, get_font
+from media_probe import probe_media_many
+from text_layout import get_measurer, search_font_size, wrap_tokens
+from text_outline import draw_outlined_text
+from pcm_audio import PCM_SAMPLE_RATE, array_clip
+
 try:
     import requests
     import base64
@@ -96,61 +101,46 @@ def load_ranking_config(config_path=None):
 def get_random_background_music(music_dir="background music"):
     """background music 폴더에서 랜덤 오디오 파일 선택"""
 
-    if not os.path.exists(music_dir):
+    audio_files = get_asset_library().files(music_dir, AUDIO_EXTENSIONS)
+    if audio_files is None:
         print(f"[WARNING] background music 폴더를 찾을 수 없습니다: {music_dir}")
         return None
 
-    audio_files = [
-        f for f in os.listdir(music_dir)
-        if f.lower().endswith((".mp3", ".wav", ".m4a", ".aac"))
-    ]
-
     if not audio_files:
         print("[WARNING] background music 폴더에 사용할 수 있는 오디오 파일이 없습니다.")
         return None
 
-    selected = random.choice(audio_files)
-    return os.path.join(music_dir, selected)
+    return random.choice(audio_files)
 
 
 def get_random_highlight_music(music_dir="highlight music"):
     """highlight music 폴더에서 랜덤 오디오 파일 선택"""
 
-    if not os.path.exists(music_dir):
+    audio_files = get_asset_library().files(music_dir, AUDIO_EXTENSIONS)
+    if audio_files is None:
         print(f"[WARNING] highlight music 폴더를 찾을 수 없습니다: {music_dir}")
         return None
 
-    audio_files = [
-        f for f in os.listdir(music_dir)
-        if f.lower().endswith((".mp3", ".wav", ".m4a", ".aac"))
-    ]
-
     if not audio_files:
         print("[WARNING] highlight music 폴더에 사용할 수 있는 오디오 파일이 없습니다.")
         return None
 
-    selected = random.choice(audio_files)
-    return os.path.join(music_dir, selected)
+    return random.choice(audio_files)
 
 
 def get_random_highlight_emoji(emoji_dir="highlight emoji"):
     """highlight emoji 폴더에서 랜덤 PNG 이모지 선택"""
 
-    if not os.path.exists(emoji_dir):
+    emoji_files = get_asset_library().files(emoji_dir, IMAGE_EXTENSIONS)
+    if emoji_files is None:
         print(f"[WARNING] highlight emoji 폴더를 찾을 수 없습니다: {emoji_dir}")
         return None
 
-    emoji_files = [
-        f for f in os.listdir(emoji_dir)
-        if f.lower().endswith((".png", ".jpg", ".jpeg"))
-    ]
-
     if not emoji_files:
         print("[WARNING] highlight emoji 폴더에 사용할 수 있는 이미지 파일이 없습니다.")
         return None
 
-    selected = random.choice(emoji_files)
-    return os.path.join(emoji_dir, selected)
+    return random.choice(emoji_files)
 
 
 def extract_key_moment_from_txt(video_path):
@@ -210,8 +200,9 @@ def create_highlight_ending(first_place_video_path, config):
         return None
 
     try:
-        highlight_audio = AudioFileClip(highlight_music_path)
-        highlight_duration = highlight_audio.duration
+        highlight_asset = get_asset_library().load_audio(highlight_music_path)
+        highlight_audio = array_clip(highlight_asset.samples, highlight_asset.sample_rate)
+        highlight_duration = highlight_asset.duration
         print(f"[HIGHLIGHT] 음악: {os.path.basename(highlight_music_path)} ({highlight_duration:.1f}초)")
     except Exception as e:
         print(f"[WARNING] highlight music 로드 실패: {e}")
@@ -313,8 +304,10 @@ def apply_background_music(video_clip, config):
     # 랭킹 비디오 배경 음악 볼륨 고정
     background_music_volume = 0.5
 
+    # 원본 오디오와 배경 음악을 float32 버퍼 하나에 미리 믹스 (voice_overlay와 같은 AudioMix)
+    soundtrack = AudioMix(video_clip.duration, PCM_SAMPLE_RATE)
     try:
-        music_clip = AudioFileClip(music_path)
+        music_samples = get_asset_library().load_audio(music_path).samples
     except Exception as e:
         print(f"[WARNING] 배경 음악 로드 실패 ({music_path}): {e}")
         return video_clip
@@ -322,14 +315,8 @@ def apply_background_music(video_clip, config):
     # 배경 음악은 최대 54.5초까지만 재생
     music_duration = min(video_clip.duration, 54.5)
 
-    if music_clip.duration < music_duration:
-        music_clip = music_clip.with_effects([AudioLoop(duration=music_duration)])
-
-    music_clip = music_clip.subclipped(0, music_duration).with_start(0)
-
     if background_music_volume != 1.0:
         print(f"[AUDIO] 배경 음악 볼륨 조정: {background_music_volume:.2f}x")
-        music_clip = music_clip.with_effects([MultiplyVolume(background_music_volume)])
 
     if video_clip.duration > 54.5:
         print(f"[MUSIC] 랭킹 비디오에 배경 음악 추가: {os.path.basename(music_path)} (54.5초까지만)")
@@ -337,12 +324,13 @@ def apply_background_music(video_clip, config):
         print(f"[MUSIC] 랭킹 비디오에 배경 음악 추가: {os.path.basename(music_path)}")
 
     base_audio = video_clip.audio
-    if base_audio is None:
-        # 원본 오디오가 없으면 배경 음악만 사용
-        return video_clip.with_audio(music_clip)
+    if base_audio is not None:
+        # 원본 오디오가 있으면 함께 믹스 (없으면 배경 음악만 사용)
+        soundtrack.add(clip_soundtrack(base_audio, video_clip.duration, soundtrack.sample_rate))
+    soundtrack.add(music_samples, 0, background_music_volume, loop=True, duration=music_duration)
 
-    final_audio = CompositeAudioClip([base_audio, music_clip])
-    return video_clip.with_audio(final_audio)
+    # 리미터는 저장 단계의 최종 믹스다운에서 한 번만 적용
+    return video_clip.with_audio(array_clip(soundtrack.render(None), soundtrack.sample_rate))
 
 # 302.ai API 초기화
 def get_302ai_api_key():
@@ -418,9 +406,20 @@ def scan_video_files(output_dir):
     # 파일 수정 시간 기준 정렬 (오름차순 - 최신 파일이 마지막 = 1위)
     video_files.sort(key=lambda x: os.path.getmtime(x), reverse=False)
 
+    # 프로브 캐시로 길이/크기 확인 (읽을 수 없거나 비디오 스트림이 없는 파일은 제외)
+    probes = probe_media_many(video_files, skip_errors=True)
+    playable = [video for video in video_files
+                if video in probes and probes[video].has_video and probes[video].duration > 0]
+    for video in video_files:
+        if video not in playable:
+            print(f"[WARNING] 재생할 수 없는 비디오 파일을 건너뜁니다: {os.path.basename(video)}")
+    video_files = playable
+
     print(f"\n[SCAN] {len(video_files)}개의 비디오 파일을 찾았습니다.")
     for i, video in enumerate(video_files, 1):
-        print(f"  {i}. {os.path.basename(video)}")
+        info = probes[video]
+        width, height = info.display_size
+        print(f"  {i}. {os.path.basename(video)} ({info.duration:.1f}초, {width}x{height})")
 
     return video_files
 
@@ -579,6 +578,25 @@ Output JSON only. No other explanation needed."""
         print("  기본값 사용: EPIC CLIPS")
         return "EPIC CLIPS", "EPIC"
 
+# 텍스트 오버레이 폰트 후보 (macOS 한글 지원 폰트 우선, ExtraBold 사용)
+OVERLAY_FONT_CANDIDATES = [
+    ("/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc", [14], "AppleSDGothicNeo.ttc"),  # ExtraBold
+    ("/System/Library/Fonts/AppleSDGothicNeo.ttc", [14, 6, 5], "AppleSDGothicNeo.ttc"),  # ExtraBold, Bold
+    ("/Library/Fonts/AppleGothic.ttf", [0], "AppleGothic.ttf"),
+    ("/System/Library/Fonts/Supplemental/Arial Unicode.ttf", [0], "Arial Unicode.ttf"),
+    ("/System/Library/Fonts/Supplemental/Impact.ttf", [0], "Impact.ttf"),
+    ("/System/Library/Fonts/Supplemental/Arial Bold.ttf", [0], "Arial Bold.ttf"),
+]
+
+# 썸네일 타이틀 폰트 후보
+TITLE_FONT_CANDIDATES = [
+    ("/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc", [14], "AppleSDGothicNeo.ttc"),
+    ("/System/Library/Fonts/AppleSDGothicNeo.ttc", [14, 6, 5], "AppleSDGothicNeo.ttc"),
+    ("/Library/Fonts/AppleGothic.ttf", [0], "AppleGothic.ttf"),
+    ("/System/Library/Fonts/Supplemental/AppleGothic.ttf", [0], "AppleGothic.ttf"),
+    ("/System/Library/Fonts/Supplemental/Arial Bold.ttf", [0], "Arial Bold.ttf"),
+]
+
 # 텍스트 오버레이 생성 (PIL 기반)
 def create_text_overlay_pil(text, width, height, font_size, color, stroke_color=None, stroke_width=0):
     """PIL을 사용하여 텍스트 오버레이 이미지 생성"""
@@ -586,37 +604,9 @@ def create_text_overlay_pil(text, width, height, font_size, color, stroke_color=
     img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
 
-    # 폰트 로드 (ExtraBold 우선)
-    try:
-        # macOS 기본 폰트 (한글 지원 폰트 우선, ExtraBold 사용)
-        font_candidates = [
-            ("/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc", [14], "AppleSDGothicNeo.ttc"),  # ExtraBold
-            ("/System/Library/Fonts/AppleSDGothicNeo.ttc", [14, 6, 5], "AppleSDGothicNeo.ttc"),  # ExtraBold, Bold
-            ("/Library/Fonts/AppleGothic.ttf", [0], "AppleGothic.ttf"),
-            ("/System/Library/Fonts/Supplemental/Arial Unicode.ttf", [0], "Arial Unicode.ttf"),
-            ("/System/Library/Fonts/Supplemental/Impact.ttf", [0], "Impact.ttf"),
-            ("/System/Library/Fonts/Supplemental/Arial Bold.ttf", [0], "Arial Bold.ttf"),
-        ]
-
-        font = None
-        for font_path, indexes, label in font_candidates:
-            if not os.path.exists(font_path):
-                continue
-
-            for idx in indexes:
-                try:
-                    font = ImageFont.truetype(font_path, font_size, index=idx)
-                    break
-                except:
-                    continue
-
-            if font is not None:
-                break
-
-        if font is None:
-            font = ImageFont.load_default()
-    except:
-        font = ImageFont.load_default()
+    # 폰트 로드 (ExtraBold 우선) - 후보 탐색과 FreeTypeFont는 폰트 레지스트리에 캐시됨
+    resolved = find_font(OVERLAY_FONT_CANDIDATES)
+    font = get_font(resolved[0], font_size, resolved[1]) if resolved else ImageFont.load_default()
 
     # 텍스트 크기 계산 및 자동 줄바꿈 처리
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -626,26 +616,9 @@ def create_text_overlay_pil(text, width, height, font_size, color, stroke_color=
     # 화면 너비의 90%를 최대 너비로 설정
     max_width = int(width * 0.9)
 
-    # 텍스트가 너무 길면 줄바꿈 처리
-    lines = []
+    # 텍스트가 너무 길면 줄바꿈 처리 (누적 글리프 폭으로 증분 측정)
     if text_width > max_width:
-        words = text.split()
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + " " + word if current_line else word
-            test_bbox = draw.textbbox((0, 0), test_line, font=font)
-            test_width = test_bbox[2] - test_bbox[0]
-
-            if test_width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-
-        if current_line:
-            lines.append(current_line)
+        lines = wrap_tokens(text.split(), get_measurer(font), max_width)
     else:
         lines = [text]
 
@@ -661,27 +634,15 @@ def create_text_overlay_pil(text, width, height, font_size, color, stroke_color=
             x = (width - line_width) // 2
             y = start_y + i * (line_height + 10)
 
-            # 외곽선 그리기
-            if stroke_color and stroke_width > 0:
-                for adj_x in range(-stroke_width, stroke_width + 1):
-                    for adj_y in range(-stroke_width, stroke_width + 1):
-                        draw.text((x + adj_x, y + adj_y), line, font=font, fill=stroke_color)
-
-            # 텍스트 그리기
-            draw.text((x, y), line, font=font, fill=color)
+            # 외곽선 + 텍스트 그리기
+            draw_outlined_text(img, (x, y), line, font, color, stroke_color, stroke_width)
     else:
         # 한 줄인 경우 기존 로직
         x = (width - text_width) // 2
         y = (height - text_height) // 2
 
-        # 외곽선 그리기
-        if stroke_color and stroke_width > 0:
-            for adj_x in range(-stroke_width, stroke_width + 1):
-                for adj_y in range(-stroke_width, stroke_width + 1):
-                    draw.text((x + adj_x, y + adj_y), text, font=font, fill=stroke_color)
-
-        # 텍스트 그리기
-        draw.text((x, y), text, font=font, fill=color)
+        # 외곽선 + 텍스트 그리기
+        draw_outlined_text(img, (x, y), text, font, color, stroke_color, stroke_width)
 
     return img
 
@@ -794,36 +755,21 @@ def create_thumbnail_title_overlay(thumbnail_config, video_width, video_height,
 
     # 투명 배경 이미지 생성
     img = Image.new('RGBA', (video_width, overlay_height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
 
     # 최대 너비 (화면의 90%)
     max_width = int(video_width * 0.9)
 
-    # 폰트 설정 함수
+    # 폰트 설정 함수 (크기별 FreeTypeFont는 폰트 레지스트리에서 재사용)
     def load_font(font_size, font_path, index):
-        try:
-            return ImageFont.truetype(font_path, font_size, index=index)
-        except:
-            return ImageFont.load_default()
-
-    # 폰트 후보
-    extrabold_font_candidates = [
-        ("/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc", [14], "AppleSDGothicNeo.ttc"),
-        ("/System/Library/Fonts/AppleSDGothicNeo.ttc", [14, 6, 5], "AppleSDGothicNeo.ttc"),
-        ("/Library/Fonts/AppleGothic.ttf", [0], "AppleGothic.ttf"),
-        ("/System/Library/Fonts/Supplemental/AppleGothic.ttf", [0], "AppleGothic.ttf"),
-        ("/System/Library/Fonts/Supplemental/Arial Bold.ttf", [0], "Arial Bold.ttf"),
-    ]
+        return get_font(font_path, font_size, index)
 
     # 사용 가능한 폰트 경로 찾기
     font_path = None
     font_index = 0
-    for path, indexes, label in extrabold_font_candidates:
-        if os.path.exists(path):
-            font_path = path
-            font_index = indexes[0]
-            print(f"[FONT] 폰트 로드: {label}")
-            break
+    resolved = find_font(TITLE_FONT_CANDIDATES)
+    if resolved:
+        font_path, font_index, label = resolved
+        print(f"[FONT] 폰트 로드: {label}")
 
     if not font_path:
         print("[FONT WARNING] ExtraBold 폰트 로드 실패, 기본 폰트 사용")
@@ -842,32 +788,22 @@ def create_thumbnail_title_overlay(thumbnail_config, video_width, video_height,
         min_font_size = 60  # 최소 폰트 크기
         spacing = 10
 
-        # 폰트 크기 자동 조정: 화면에 맞을 때까지 줄이기
-        font_size = base_font_size
-        font = load_font(font_size, font_path, font_index) if font_path else ImageFont.load_default()
-
-        # 전체 줄의 너비 계산
-        while font_size >= min_font_size:
-            font = load_font(font_size, font_path, font_index) if font_path else ImageFont.load_default()
-
-            total_width = 0
-            word_widths = []
-            for word in words:
-                bbox = draw.textbbox((0, 0), word['text'], font=font)
-                word_width = bbox[2] - bbox[0]
-                word_widths.append(word_width)
-                total_width += word_width
-
-            total_width += spacing * (len(words) - 1)
-
-            # 화면에 맞으면 중단
-            if total_width <= max_width:
-                break
-
-            # 폰트 크기 줄이기
-            font_size -= 5
-
-        if font_size < min_font_size:
+        # 전체 줄의 너비 계산 (단어별 폭 + 간격)
+        def measure_line(size):
+            size_font = load_font(size, font_path, font_index) if font_path else ImageFont.load_default()
+            measurer = get_measurer(size_font)
+            widths = [measurer.width(word['text']) for word in words]
+            return size_font, widths, sum(widths) + spacing * (len(words) - 1)
+
+        # 폰트 크기 자동 조정: 5px 간격 후보 중 화면에 맞는 가장 큰 크기를 이진 탐색
+        candidate_sizes = list(range(base_font_size, min_font_size - 1, -5))
+        fit_index = search_font_size(candidate_sizes, lambda size: measure_line(size)[2] <= max_width)
+        if fit_index < len(candidate_sizes):
+            font_size = candidate_sizes[fit_index]
+            font, word_widths, total_width = measure_line(font_size)
+        else:
+            # 최소 크기에서도 넘치면 최소 크기로 줄바꿈 (너비 로그는 마지막 후보 기준)
+            total_width = measure_line(candidate_sizes[-1])[2]
             font_size = min_font_size
             font = load_font(font_size, font_path, font_index) if font_path else ImageFont.load_default()
 
@@ -882,9 +818,9 @@ def create_thumbnail_title_overlay(thumbnail_config, video_width, video_height,
             current_line_words = []
             current_line_width = 0
 
+            measurer = get_measurer(font)
             for word_idx, word in enumerate(words):
-                bbox = draw.textbbox((0, 0), word['text'], font=font)
-                word_width = bbox[2] - bbox[0]
+                word_width = measurer.width(word['text'])
 
                 test_width = current_line_width + word_width
                 if current_line_words:
@@ -918,16 +854,9 @@ def create_thumbnail_title_overlay(thumbnail_config, video_width, video_height,
                     word_text = word_data['text']
                     word_color = word_data.get('color', '#FFFFFF')
 
-                    # 외곽선
+                    # 외곽선 + 컬러 텍스트
                     stroke_width = 8 if line_idx == 1 else 7
-                    for offset_x in range(-stroke_width, stroke_width + 1):
-                        for offset_y in range(-stroke_width, stroke_width + 1):
-                            if offset_x != 0 or offset_y != 0:
-                                draw.text((current_x + offset_x, y_pos + offset_y),
-                                         word_text, font=font, fill='black')
-
-                    # 컬러 텍스트
-                    draw.text((current_x, y_pos), word_text, font=font, fill=word_color)
+                    draw_outlined_text(img, (current_x, y_pos), word_text, font, word_color, 'black', stroke_width)
                     current_x += word_width + spacing
 
                 # 다음 줄 위치
@@ -947,16 +876,9 @@ def create_thumbnail_title_overlay(thumbnail_config, video_width, video_height,
                 word_text = word['text']
                 word_color = word.get('color', '#FFFFFF')
 
-                # 외곽선 효과
+                # 외곽선 효과 + 컬러 텍스트
                 stroke_width = 8 if line_idx == 1 else 7
-                for offset_x in range(-stroke_width, stroke_width + 1):
-                    for offset_y in range(-stroke_width, stroke_width + 1):
-                        if offset_x != 0 or offset_y != 0:
-                            draw.text((current_x + offset_x, y_pos + offset_y),
-                                     word_text, font=font, fill='black')
-
-                # 컬러 텍스트
-                draw.text((current_x, y_pos), word_text, font=font, fill=word_color)
+                draw_outlined_text(img, (current_x, y_pos), word_text, font, word_color, 'black', stroke_width)
 
                 # 다음 단어 위치로 이동
                 current_x += word_widths[word_idx] + spacing
@@ -980,6 +902,9 @@ def create_ranking_video(video_group, group_index, config, ranking_config):
     print(f"[GROUP {group_index}] 랭킹 비디오 생성 시작")
     print(f"{'='*60}")
 
+    # 배경 음악/하이라이트 음악 PCM 캐시 위치 (paths.temp_dir/asset_cache)
+    get_asset_library(os.path.join(config.get("paths", {}).get("temp_dir", "Temp"), "asset_cache"))
+
     # 1. AI 분석
     print("\n[STEP 1] AI 분석 중...")
     theme, keyword = analyze_common_theme(video_group, ranking_config)
@@ -1110,22 +1035,37 @@ def create_ranking_video(video_group, group_index, config, ranking_config):
     temp_dir = config.get("paths", {}).get("temp_dir", "Temp")
     temp_audio_file = os.path.join(temp_dir, f"temp-audio-ranking-{os.getpid()}.m4a")
 
-    final_video.write_videofile(
-        output_path,
-        codec=config.get("audio_settings", {}).get("codec", "libx264"),
-        audio_codec=config.get("audio_settings", {}).get("audio_codec", "aac"),
-        fps=30,
-        preset='medium',
-        threads=2,  # FFmpeg 스레드 수 제한 (동시 인코딩 대응)
-        temp_audiofile=temp_audio_file,
-        remove_temp=True,
-        ffmpeg_params=[
-            '-metadata', 'handler_name=Core Media Video',
-            '-metadata:s:a:0', 'handler_name=Core Media Audio',
-            '-metadata', 'encoder=H.264',
-            '-brand', 'qt',
-        ]
-    )
+    # 사운드트랙 전체를 한 번에 믹스다운(소프트 리미터) → AAC 스트림 하나로 인코딩 → 비디오 인코딩 때 스트림 복사로 mux
+    soundtrack_file = None
+    if final_video.audio is not None:
+        audio_settings = config.get("audio_settings", {})
+        soundtrack = soft_limit(
+            clip_soundtrack(final_video.audio, final_video.duration),
+            audio_settings.get("limiter_threshold_db", DEFAULT_LIMITER_THRESHOLD_DB),
+        )
+        soundtrack_file = encode_audio(
+            soundtrack, temp_audio_file, PCM_SAMPLE_RATE, audio_settings.get("audio_codec", "aac")
+        )
+
+    try:
+        final_video.write_videofile(
+            output_path,
+            codec=config.get("audio_settings", {}).get("codec", "libx264"),
+            audio=soundtrack_file or False,
+            audio_codec="copy",
+            fps=30,
+            preset='medium',
+            threads=2,  # FFmpeg 스레드 수 제한 (동시 인코딩 대응)
+            ffmpeg_params=[
+                '-metadata', 'handler_name=Core Media Video',
+                '-metadata:s:a:0', 'handler_name=Core Media Audio',
+                '-metadata', 'encoder=H.264',
+                '-brand', 'qt',
+            ]
+        )
+    finally:
+        if soundtrack_file and os.path.exists(soundtrack_file):
+            os.remove(soundtrack_file)
 
     # 8. description.txt 생성
     print("\n[STEP 8] description.txt 생성 중...")
@@ -6,6 +6,21 @@ from moviepy import VideoFileClip
 import json
 import sys
 
+from font_registry import find_font, get_font
+from media_analysis import get_media_analysis
+from media_probe import probe_media
+from text_outline import draw_outlined_text
+
+
+# 썸네일 타이틀 폰트 후보 (macOS 한글 지원 폰트 우선, ExtraBold 사용)
+THUMBNAIL_FONT_CANDIDATES = [
+    ("/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc", [14], "AppleSDGothicNeo.ttc"),  # ExtraBold
+    ("/System/Library/Fonts/AppleSDGothicNeo.ttc", [14, 6, 5], "AppleSDGothicNeo.ttc"),  # ExtraBold, Bold
+    ("/Library/Fonts/AppleGothic.ttf", [0], "AppleGothic.ttf"),
+    ("/System/Library/Fonts/Supplemental/AppleGothic.ttf", [0], "AppleGothic.ttf"),
+    ("/System/Library/Fonts/Supplemental/Arial Bold.ttf", [0], "Arial Bold.ttf"),
+]
+
 
 def load_config(config_path="Config/config.json"):
     """설정 파일 로드"""
@@ -35,15 +50,23 @@ def load_thumbnail_config(config_path=None):
 def extract_frame_from_video(video_path, time_seconds=None):
     """비디오에서 프레임 추출"""
     try:
-        clip = VideoFileClip(video_path)
+        duration = probe_media(video_path).duration
 
-        # 시간 지정이 없으면 중간 프레임 사용
+        # 시간 지정이 없으면 중간 부근에서 가장 선명한 프레임 사용 (분석 기록 없으면 중간 프레임)
         if time_seconds is None:
-            time_seconds = clip.duration / 2
-
-        # 프레임 추출
-        frame = clip.get_frame(time_seconds)
-        clip.close()
+            time_seconds = duration / 2
+            try:
+                time_seconds = min(get_media_analysis(video_path).sharpest_time(time_seconds), duration)
+                print(f"[INFO] 선명도 분석으로 {time_seconds:.2f}초 프레임 선택")
+            except Exception as e:
+                print(f"[WARNING] 선명도 분석 실패, 중간 프레임 사용: {e}")
+
+        # 프레임 추출 (선택한 시점의 프레임 하나만 디코딩)
+        clip = VideoFileClip(video_path)
+        try:
+            frame = clip.get_frame(time_seconds)
+        finally:
+            clip.close()
 
         # numpy array를 PIL Image로 변환
         return Image.fromarray(frame)
@@ -164,46 +187,16 @@ def create_thumbnail_with_overlay(video_path, title_line1=None, title_line2=None
     print("\n[STEP 4] 텍스트 오버레이 추가 중...")
     draw = ImageDraw.Draw(thumbnail)
 
-    # 폰트 설정 (한글 지원 ExtraBold)
-    try:
-        # macOS 한글 지원 폰트 우선 (ExtraBold 사용)
-        extrabold_font_candidates = [
-            ("/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc", [14], "AppleSDGothicNeo.ttc"),  # ExtraBold
-            ("/System/Library/Fonts/AppleSDGothicNeo.ttc", [14, 6, 5], "AppleSDGothicNeo.ttc"),  # ExtraBold, Bold
-            ("/Library/Fonts/AppleGothic.ttf", [0], "AppleGothic.ttf"),
-            ("/System/Library/Fonts/Supplemental/AppleGothic.ttf", [0], "AppleGothic.ttf"),
-            ("/System/Library/Fonts/Supplemental/Arial Bold.ttf", [0], "Arial Bold.ttf"),
-        ]
-
-        fonts = []
-        loaded = False
-        for font_path, indexes, label in extrabold_font_candidates:
-            if not os.path.exists(font_path):
-                continue
-
-            for idx in indexes:
-                try:
-                    # 첫 번째 줄: 105, 두 번째 줄: 112 (자막 35px의 3.0~3.2배)
-                    fonts = [
-                        ImageFont.truetype(font_path, 105, index=idx),
-                        ImageFont.truetype(font_path, 112, index=idx)
-                    ]
-                    idx_info = f" (index={idx})" if len(indexes) > 1 or idx != 0 else ""
-                    print(f"  폰트 로드: {label}{idx_info}")
-                    loaded = True
-                    break
-                except Exception:
-                    continue
-
-            if loaded:
-                break
-
-        if not fonts:
-            print("  [WARNING] 기본 폰트 사용")
-            fonts = [ImageFont.load_default(), ImageFont.load_default()]
-
-    except Exception as e:
-        print(f"  [WARNING] 폰트 로드 실패: {e}, 기본 폰트 사용")
+    # 폰트 설정 (한글 지원 ExtraBold, 후보 탐색과 FreeTypeFont는 폰트 레지스트리에 캐시됨)
+    resolved = find_font(THUMBNAIL_FONT_CANDIDATES)
+    if resolved:
+        font_path, idx, label = resolved
+        # 첫 번째 줄: 105, 두 번째 줄: 112 (자막 35px의 3.0~3.2배)
+        fonts = [get_font(font_path, 105, idx), get_font(font_path, 112, idx)]
+        idx_info = f" (index={idx})" if idx != 0 else ""
+        print(f"  폰트 로드: {label}{idx_info}")
+    else:
+        print("  [WARNING] 기본 폰트 사용")
         fonts = [ImageFont.load_default(), ImageFont.load_default()]
 
     # 각 줄 그리기
@@ -248,16 +241,9 @@ def create_thumbnail_with_overlay(video_path, title_line1=None, title_line2=None
             word_text = word['text']
             word_color = word.get('color', '#FFFFFF')
 
-            # 외곽선 효과 (검은색, 통일된 굵기)
+            # 외곽선 효과 (검은색, 통일된 굵기) + 컬러 텍스트
             stroke_width = 8
-            for offset_x in range(-stroke_width, stroke_width + 1):
-                for offset_y in range(-stroke_width, stroke_width + 1):
-                    if offset_x != 0 or offset_y != 0:
-                        draw.text((current_x + offset_x, y_pos + offset_y),
-                                 word_text, font=font, fill='black')
-
-            # 컬러 텍스트
-            draw.text((current_x, y_pos), word_text, font=font, fill=word_color)
+            draw_outlined_text(thumbnail, (current_x, y_pos), word_text, font, word_color, 'black', stroke_width)
 
             # 다음 단어 위치로 이동
             current_x += word_widths[word_idx] + spacing
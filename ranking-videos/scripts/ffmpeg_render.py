@@ -0,0 +1,336 @@
+"""ffmpeg filter_complex 렌더 백엔드 (overlay_voice_on_video 타임라인을 ffmpeg 1회 실행으로 처리)"""
+
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+from moviepy.config import FFMPEG_BINARY
+from moviepy.tools import compute_position
+
+from layer_compositor import sprite_of
+from video_filters import get_vignette
+
+
+RENDER_BACKENDS = ("moviepy", "ffmpeg")
+DEFAULT_RENDER_BACKEND = "moviepy"
+
+
+def resolve_render_backend(config_value=None, job_value=None):
+    """작업별 지정(metadata) → config(video_settings.render_backend) 순으로 백엔드 결정."""
+    for value in (job_value, config_value):
+        if value is None:
+            continue
+        name = str(value).strip().lower()
+        if name in RENDER_BACKENDS:
+            return name
+        print(f"[WARNING] 알 수 없는 렌더 백엔드 '{value}' → {DEFAULT_RENDER_BACKEND} 사용")
+    return DEFAULT_RENDER_BACKEND
+
+
+def _fmt(value):
+    return f"{float(value):.6f}".rstrip("0").rstrip(".") or "0"
+
+
+def _color_hex(color):
+    r, g, b = (int(c) for c in color[:3])
+    return f"0x{r:02X}{g:02X}{b:02X}"
+
+
+def _odd_msize(radius):
+    size = int(round(2 * float(radius) + 1))
+    if size % 2 == 0:
+        size += 1
+    return max(3, min(23, size))
+
+
+def _active_expr(intervals):
+    """[(start, end), ...] 구간에서만 참인 timeline 식 (moviepy와 같이 start 포함, end 제외)."""
+    terms = [f"gte(t,{_fmt(start)})*lt(t,{_fmt(end)})" for start, end in intervals]
+    return "+".join(terms) if terms else "0"
+
+
+def clip_to_rgba(clip):
+    """moviepy 정지 이미지 클립(TextClip/ImageClip)의 첫 프레임을 RGBA 배열로 변환."""
+    frame = np.asarray(clip.get_frame(0))
+    if frame.dtype != np.uint8:
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+    if frame.ndim == 2:
+        frame = np.stack([frame] * 3, axis=-1)
+    rgb = frame[..., :3]
+    if clip.mask is not None:
+        alpha = (np.asarray(clip.mask.get_frame(0)) * 255).astype(np.uint8)
+        if alpha.shape != rgb.shape[:2]:
+            padded = np.zeros(rgb.shape[:2], dtype=np.uint8)
+            h = min(alpha.shape[0], padded.shape[0])
+            w = min(alpha.shape[1], padded.shape[1])
+            padded[:h, :w] = alpha[:h, :w]
+            alpha = padded
+    else:
+        alpha = np.full(rgb.shape[:2], 255, dtype=np.uint8)
+    return np.dstack([rgb, alpha])
+
+
+class FFmpegRenderJob:
+    """
+    overlay_voice_on_video 타임라인을 ffmpeg filter_complex 한 번으로 렌더링하는 작업.
+
+    - 메인 영상: 필터(vignette 곱/채도/unsharp/rgbashift) → 캔버스 단계(scale + overlay)
+    - 레이어: 플래시(색상 overlay), 리액션 영상, 미리 렌더링한 PNG (enable='between' 식)
+    - 오디오: set_audio_file로 받은 미리 믹스/인코딩한 사운드트랙을 재인코딩 없이 mux (없으면 무음)
+    """
+
+    def __init__(self, video_path, duration, source_size, trim_start=0.0, fps=30, temp_dir=None):
+        self.video_path = video_path
+        self.duration = float(duration)
+        self.source_size = tuple(int(v) for v in source_size)
+        self.trim_start = max(0.0, float(trim_start or 0.0))
+        self.fps = int(fps)
+        self.temp_dir = temp_dir
+        self.filter_steps = []
+        self.stages = []  # [(canvas_size, scaled_size, position, color), ...]
+        self.layers = []
+        self.audio_file = None  # 미리 인코딩한 사운드트랙 (스트림 복사)
+        self.canvas_size = self.source_size
+        self._work_dir = None
+
+    # ---- 타임라인 수집 -------------------------------------------------
+    def set_filter_steps(self, steps):
+        self.filter_steps = list(steps or [])
+
+    def add_canvas_stage(self, canvas_size, scaled_size, position, color=(0, 0, 0)):
+        """현재 화면을 scaled_size로 스케일해서 canvas_size 단색 캔버스의 position에 배치."""
+        canvas_size = tuple(int(v) for v in canvas_size)
+        scaled_size = tuple(int(v) for v in scaled_size)
+        position = compute_position(scaled_size, canvas_size, position)
+        self.stages.append((canvas_size, scaled_size, position, tuple(color)))
+        self.canvas_size = canvas_size
+
+    def add_flash_layer(self, size, intervals, opacity, color=(255, 255, 255), position=(0, 0)):
+        intervals = [(float(s), float(e)) for s, e in intervals if e > s]
+        if intervals:
+            self.layers.append({
+                "kind": "flash",
+                "size": tuple(int(v) for v in size),
+                "position": tuple(int(v) for v in position),
+                "intervals": intervals,
+                "opacity": float(opacity),
+                "color": tuple(color),
+            })
+
+    def add_video_layer(self, path, scaled_size, crop_size, position, loop=True):
+        self.layers.append({
+            "kind": "video",
+            "path": path,
+            "scaled_size": tuple(int(v) for v in scaled_size),
+            "crop_size": tuple(int(v) for v in crop_size),
+            "position": tuple(int(v) for v in position),
+            "loop": bool(loop),
+        })
+
+    def add_clip_layer(self, clip, fade_out=0.0):
+        """정지 이미지 moviepy 클립을 현재 캔버스 기준 위치/시간 그대로 PNG 레이어로 등록."""
+        start = float(clip.start or 0.0)
+        end = float(clip.end) if clip.end is not None else self.duration
+        end = min(end, self.duration)
+        if end <= start:
+            return
+        sprite = sprite_of(clip)
+        if sprite is not None:
+            # 스프라이트는 내용 영역만 premultiplied 그대로 PNG로 내보냄
+            if not sprite.pixels.size:
+                return
+            x, y = compute_position(sprite.size, self.canvas_size, clip.pos(0), clip.relative_pos)
+            rgba = sprite.pixels
+            position = (x + sprite.offset[0], y + sprite.offset[1])
+        else:
+            rgba = clip_to_rgba(clip)
+            size = (rgba.shape[1], rgba.shape[0])
+            position = compute_position(size, self.canvas_size, clip.pos(0), clip.relative_pos)
+        self.layers.append({
+            "kind": "image",
+            "rgba": rgba,
+            "premultiplied": sprite is not None,
+            "position": position,
+            "start": start,
+            "end": end,
+            "fade_out": max(0.0, float(fade_out or 0.0)),
+        })
+
+    def set_audio_file(self, path):
+        """오프라인 믹스다운으로 만든 오디오 파일을 재인코딩 없이 최종 출력에 mux."""
+        self.audio_file = path
+
+    # ---- 그래프 생성 ---------------------------------------------------
+    def _write_png(self, name, array):
+        path = os.path.join(self._work_dir, name)
+        Image.fromarray(array).save(path, compress_level=1)
+        return path
+
+    def _filter_graph(self, inputs, graph, label):
+        w, h = self.source_size
+        fps = self.fps
+        chain = []
+        for name, params in self.filter_steps:
+            if name == "cinematic":
+                vignette = get_vignette(
+                    h, w,
+                    float(params["vignette_power"]),
+                    float(params["vignette_strength"]),
+                    float(params["vignette_min"]),
+                )
+                vignette_png = self._write_png("vignette.png", (vignette[..., 0] * 255).astype(np.uint8))
+                index = len(inputs)
+                inputs.append(["-i", vignette_png])
+                graph.append(f"[{index}:v]format=gbrp,loop=loop=-1:size=1,setpts=N/{fps}/TB[vig]")
+                if chain:
+                    graph.append(f"[{label}]{','.join(chain)}[{label}c]")
+                    label, chain = f"{label}c", []
+                graph.append(f"[{label}][vig]blend=all_mode=multiply:shortest=1[{label}v]")
+                label = f"{label}v"
+                d = float(params["desaturation"])
+                diag, off = _fmt(1.0 - d + d / 3.0), _fmt(d / 3.0)
+                chain.append(
+                    f"colorchannelmixer=rr={diag}:rg={off}:rb={off}:gr={off}:gg={diag}:gb={off}:br={off}:bg={off}:bb={diag}"
+                )
+            elif name == "sharpen":
+                for radius, percent, _threshold in params["passes"]:
+                    size = _odd_msize(radius)
+                    amount = _fmt(max(-2.0, min(5.0, float(percent) / 100.0)))
+                    chain.append(f"unsharp={size}:{size}:{amount}:{size}:{size}:{amount}")
+            elif name == "chromatic":
+                amplitude = float(params["lateral_offset"])
+                offset = f"{_fmt(amplitude)}*sin(2*PI*{_fmt(params['speed'])}*t)"
+                # 정수 픽셀 이동만 가능하므로 offset을 반올림한 단계별로 rgbashift 적용
+                for level in range(1, int(math.floor(abs(amplitude) + 0.5)) + 1):
+                    for sign in (1, -1):
+                        lo, hi = (level - 0.5, level + 0.5) if sign > 0 else (-level - 0.5, -level + 0.5)
+                        chain.append(
+                            f"rgbashift=rh={-sign * level}:bh={sign * level}:edge=smear"
+                            f":enable='gte({offset},{_fmt(lo)})*lt({offset},{_fmt(hi)})'"
+                        )
+        if chain:
+            graph.append(f"[{label}]{','.join(chain)}[{label}f]")
+            label = f"{label}f"
+        return label
+
+    def build_command(self, output_path, codec="libx264", bitrate=None,
+                      preset=None, ffmpeg_params=None, threads=2):
+        if self._work_dir is None:
+            self._work_dir = tempfile.mkdtemp(prefix="ffmpeg-render-", dir=self.temp_dir)
+
+        fps = self.fps
+        inputs = []
+        if self.trim_start > 0:
+            inputs.append(["-ss", _fmt(self.trim_start), "-i", self.video_path])
+        else:
+            inputs.append(["-i", self.video_path])
+
+        graph = [f"[0:v]fps={fps},setpts=PTS-STARTPTS,format=gbrp[v0]"]
+        label = self._filter_graph(inputs, graph, "v0")
+
+        current = self.source_size
+        for index, (canvas, scaled, (x, y), color) in enumerate(self.stages):
+            if scaled != current:
+                graph.append(f"[{label}]scale={scaled[0]}:{scaled[1]}:flags=lanczos[s{index}]")
+                label = f"s{index}"
+            if canvas != scaled or (x, y) != (0, 0):
+                graph.append(f"color=c={_color_hex(color)}:s={canvas[0]}x{canvas[1]}:r={fps}[bg{index}]")
+                graph.append(f"[bg{index}][{label}]overlay=x={x}:y={y}:shortest=1:format=gbrp[g{index}]")
+                label = f"g{index}"
+            current = canvas
+
+        for index, layer in enumerate(self.layers):
+            kind = layer["kind"]
+            if kind == "flash":
+                fw, fh = layer["size"]
+                r, g, b = (int(c) for c in layer["color"][:3])
+                graph.append(
+                    f"color=c=0x{r:02X}{g:02X}{b:02X}@{_fmt(layer['opacity'])}:s={fw}x{fh}:r={fps},format=rgba[l{index}]"
+                )
+                enable = _active_expr(layer["intervals"])
+                x, y = layer["position"]
+                graph.append(f"[{label}][l{index}]overlay=x={x}:y={y}:format=gbrp:enable='{enable}'[o{index}]")
+            elif kind == "video":
+                input_index = len(inputs)
+                inputs.append((["-stream_loop", "-1"] if layer["loop"] else []) + ["-i", layer["path"]])
+                sw, sh = layer["scaled_size"]
+                cw, ch = layer["crop_size"]
+                graph.append(
+                    f"[{input_index}:v]fps={fps},setpts=PTS-STARTPTS,scale={sw}:{sh}:flags=lanczos,"
+                    f"crop={cw}:{ch}:0:0[l{index}]"
+                )
+                x, y = layer["position"]
+                graph.append(f"[{label}][l{index}]overlay=x={x}:y={y}:eof_action=pass:format=gbrp[o{index}]")
+            else:
+                input_index = len(inputs)
+                inputs.append(["-i", self._write_png(f"layer_{index}.png", layer["rgba"])])
+                start, end, fade = layer["start"], layer["end"], layer["fade_out"]
+                source = f"[{input_index}:v]format=rgba"
+                if fade > 0:
+                    frames = int(math.ceil((end - start) * fps)) + 1
+                    source += (
+                        f",loop=loop={frames - 1}:size=1,setpts=N/{fps}/TB+{_fmt(start)}/TB"
+                        f",fade=t=out:st={_fmt(max(start, end - fade))}:d={_fmt(fade)}"
+                    )
+                else:
+                    source += f",setpts=PTS-STARTPTS+{_fmt(start)}/TB"
+                graph.append(f"{source}[l{index}]")
+                x, y = layer["position"]
+                alpha_mode = ":alpha=premultiplied" if layer["premultiplied"] else ""
+                graph.append(
+                    f"[{label}][l{index}]overlay=x={x}:y={y}:format=gbrp{alpha_mode}"
+                    f":enable='{_active_expr([(start, end)])}'[o{index}]"
+                )
+            label = f"o{index}"
+
+        if current != (1080, 1920):
+            graph.append(f"[{label}]scale=1080:1920:flags=lanczos[final]")
+            label = "final"
+        graph.append(f"[{label}]format=yuv420p[vout]")
+
+        audio_map = None
+        if self.audio_file:
+            audio_map = f"{len(inputs)}:a"
+            inputs.append(["-i", self.audio_file])
+
+        command = [FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error"]
+        for args in inputs:
+            command.extend(args)
+        command += ["-filter_complex", ";".join(graph), "-map", "[vout]"]
+        if audio_map:
+            command += ["-map", audio_map, "-c:a", "copy"]
+        command += ["-c:v", codec, "-r", str(fps), "-pix_fmt", "yuv420p", "-threads", str(threads)]
+        if preset:
+            command += ["-preset", str(preset)]
+        if bitrate:
+            command += ["-b:v", str(bitrate)]
+        if ffmpeg_params:
+            command += [str(p) for p in ffmpeg_params]
+        command += ["-t", _fmt(self.duration), output_path]
+        return command
+
+    def render(self, output_path, **encode_kwargs):
+        """ffmpeg 실행. 실패 시 RuntimeError (호출 측에서 moviepy 경로로 대체)."""
+        command = self.build_command(output_path, **encode_kwargs)
+        audio_desc = "믹스 완료 사운드트랙" if self.audio_file else "없음"
+        print(f"[FFMPEG] filter_complex 렌더링 시작 (레이어 {len(self.layers)}개, 오디오 {audio_desc})")
+        started = time.perf_counter()
+        try:
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        finally:
+            self.cleanup()
+        if result.returncode != 0:
+            tail = "\n".join(result.stderr.strip().splitlines()[-10:])
+            raise RuntimeError(f"ffmpeg 렌더링 실패 (code {result.returncode}): {tail}")
+        print(f"[FFMPEG] 렌더링 완료: {time.perf_counter() - started:.1f}초")
+        return output_path
+
+    def cleanup(self):
+        if self._work_dir and os.path.isdir(self._work_dir):
+            shutil.rmtree(self._work_dir, ignore_errors=True)
+        self._work_dir = None
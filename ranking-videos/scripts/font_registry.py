@@ -0,0 +1,253 @@
+"""프로세스 공용 폰트 레지스트리 (시스템 폰트 1회 탐색 + (path, index, size)별 FreeTypeFont 캐시)"""
+
+import os
+import platform
+import threading
+
+from PIL import ImageFont
+
+
+SYSTEM = platform.system()
+
+# 플랫폼별 폰트 폴더 (최초 조회 시 한 번만 스캔)
+FONT_DIRECTORIES = {
+    "Windows": [
+        os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+        os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts"),
+    ],
+    "Darwin": [
+        "/System/Library/Fonts",
+        "/Library/Fonts",
+        os.path.expanduser("~/Library/Fonts"),
+    ],
+    "Linux": [
+        "/usr/share/fonts",
+        "/usr/local/share/fonts",
+        os.path.expanduser("~/.fonts"),
+        os.path.expanduser("~/.local/share/fonts"),
+    ],
+}
+
+FONT_EXTENSIONS = (".ttf", ".ttc", ".otf", ".otc")
+
+# 문자 종류별 폴백 체인 (앞에서부터 처음 존재하는 폰트 사용)
+_WINDOWS_CHAIN = [
+    r"C:\Windows\Fonts\malgunbd.ttf",     # 맑은 고딕 Bold (굵은 고딕)
+    r"C:\Windows\Fonts\gulimb.ttc",       # 굴림 Bold
+    r"C:\Windows\Fonts\arialbd.ttf",      # Arial Bold
+    r"C:\Windows\Fonts\malgun.ttf",       # 맑은 고딕
+    r"C:\Windows\Fonts\malgunsl.ttf",     # 맑은 고딕 Semilight
+    r"C:\Windows\Fonts\batang.ttc",       # 바탕
+    r"C:\Windows\Fonts\gulim.ttc",        # 굴림
+    r"C:\Windows\Fonts\arial.ttf",
+]
+# macOS 한글 자막 우선 (Impact 등은 한글 미지원) → 모든 언어에서 AppleSDGothicNeo ExtraBold (index 14) 우선
+_DARWIN_CHAIN = [
+    "/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/System/Library/Fonts/Supplemental/NotoSansKR-Regular.otf",
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Impact.ttf",  # Impact (YouTube 자막 스탠다드)
+    "/System/Library/Fonts/Supplemental/Arial Black.ttf",  # Arial Black (굵고 강렬)
+    "/System/Library/Fonts/Supplemental/DIN Condensed Bold.ttf",
+    "/System/Library/Fonts/Supplemental/DIN Alternate Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/System/Library/Fonts/HelveticaNeue.ttc",  # Helvetica Neue Bold (index 5)
+    "/System/Library/Fonts/SFNS.ttf",  # San Francisco
+    "/System/Library/Fonts/Avenir Next.ttc",  # Avenir Next Heavy (index 8)
+    "/System/Library/Fonts/Helvetica.ttc",  # Helvetica Bold
+    "/Library/Fonts/Arial.ttf",
+]
+_LINUX_CJK = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansKR-Regular.otf",
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+]
+_LINUX_LATIN = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+]
+
+FALLBACK_CHAINS = {
+    "Windows": {"hangul": _WINDOWS_CHAIN, "latin": _WINDOWS_CHAIN, "digits": _WINDOWS_CHAIN},
+    "Darwin": {"hangul": _DARWIN_CHAIN, "latin": _DARWIN_CHAIN, "digits": _DARWIN_CHAIN},
+    "Linux": {
+        "hangul": _LINUX_CJK + _LINUX_LATIN,
+        "latin": _LINUX_LATIN + _LINUX_CJK,
+        "digits": _LINUX_LATIN + _LINUX_CJK,
+    },
+}
+
+MAX_CACHED_FONTS = 512
+
+
+def text_script(text):
+    """텍스트의 문자 종류 판별: 'hangul' (한글/CJK 포함), 'digits' (숫자/기호만), 그 외 'latin'."""
+    has_letter = False
+    for ch in text or "":
+        code = ord(ch)
+        if (0xAC00 <= code <= 0xD7A3 or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F
+                or 0x3040 <= code <= 0x30FF or 0x4E00 <= code <= 0x9FFF):
+            return "hangul"
+        if ch.isalpha():
+            has_letter = True
+    return "latin" if has_letter else "digits"
+
+
+class FontRegistry:
+    """
+    시스템 폰트 탐색 결과와 로드된 FreeTypeFont를 프로세스 전체에서 공유.
+
+    - 폰트 폴더는 최초 조회 시 한 번만 스캔하고, 이후 존재 여부는 집합 조회로 판단
+    - get_font(): (path, index, size) 키로 FreeTypeFont 캐시 (ImageFont.truetype 재호출 없음)
+    - find_font(): (경로, [인덱스...], 라벨) 후보 목록에서 처음 로드 가능한 폰트를 찾아 기억
+    """
+
+    def __init__(self, system=SYSTEM):
+        self.system = system if system in FALLBACK_CHAINS else "Linux"
+        self._lock = threading.RLock()
+        self._available = None
+        self._roots = []
+        self._exists_cache = {}
+        self._fonts = {}
+        self._resolved = {}
+        self.hits = 0
+        self.loads = 0
+
+    @staticmethod
+    def _normalize(path):
+        return os.path.normcase(os.path.normpath(path))
+
+    def discover(self):
+        """플랫폼 폰트 폴더를 한 번 스캔해 사용 가능한 폰트 파일 집합 구성."""
+        with self._lock:
+            if self._available is not None:
+                return self._available
+            available = set()
+            roots = []
+            for directory in FONT_DIRECTORIES.get(self.system, []):
+                if not directory or not os.path.isdir(directory):
+                    continue
+                roots.append(self._normalize(directory))
+                for root, _, names in os.walk(directory):
+                    for name in names:
+                        if name.lower().endswith(FONT_EXTENSIONS):
+                            available.add(self._normalize(os.path.join(root, name)))
+            self._roots = roots
+            self._available = available
+            return available
+
+    def exists(self, path):
+        """폰트 파일 존재 여부 (스캔한 폴더 안이면 집합 조회, 밖이면 1회 stat 후 기억)."""
+        if not path:
+            return False
+        available = self.discover()
+        normalized = self._normalize(path)
+        if normalized in available:
+            return True
+        if any(normalized.startswith(root + os.sep) for root in self._roots):
+            return False
+        with self._lock:
+            cached = self._exists_cache.get(normalized)
+            if cached is None:
+                cached = os.path.exists(path)
+                self._exists_cache[normalized] = cached
+            return cached
+
+    def get_font(self, path, size, index=0, fallback=True):
+        """
+        (path, index, size) 키로 캐시된 FreeTypeFont 반환.
+
+        로드 실패 시 fallback=True 이면 ImageFont.load_default(), False 이면 OSError 전달.
+        """
+        if not path:
+            if fallback:
+                return ImageFont.load_default()
+            raise OSError("font path is empty")
+        key = (path, int(index or 0), int(size))
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self.hits += 1
+                return font
+        try:
+            font = ImageFont.truetype(path, int(size), index=int(index or 0))
+        except OSError:
+            if not fallback:
+                raise
+            return ImageFont.load_default()
+        with self._lock:
+            self.loads += 1
+            if len(self._fonts) >= MAX_CACHED_FONTS:
+                self._fonts.pop(next(iter(self._fonts)))
+            self._fonts[key] = font
+        return font
+
+    def find_font(self, candidates):
+        """
+        candidates: [(path, [index, ...], label), ...] 에서 처음 로드 가능한 (path, index, label).
+
+        결과는 후보 목록별로 기억하며, 하나도 없으면 None.
+        """
+        key = tuple((path, tuple(indexes), label) for path, indexes, label in candidates)
+        with self._lock:
+            if key in self._resolved:
+                return self._resolved[key]
+        result = None
+        for path, indexes, label in candidates:
+            if not self.exists(path):
+                continue
+            for idx in indexes:
+                try:
+                    # 인덱스 유효성 확인용 (작은 크기로 로드해 캐시에도 남김)
+                    self.get_font(path, 12, idx, fallback=False)
+                except OSError:
+                    continue
+                result = (path, idx, label)
+                break
+            if result is not None:
+                break
+        with self._lock:
+            self._resolved[key] = result
+        return result
+
+    def first_existing(self, paths):
+        """경로 목록 중 처음 존재하는 폰트 파일 경로 (없으면 None)."""
+        for path in paths:
+            if self.exists(path):
+                return path
+        return None
+
+    def fallback_chain(self, script):
+        """문자 종류('hangul'/'latin'/'digits')별 폴백 체인 중 실제로 존재하는 경로 목록."""
+        chains = FALLBACK_CHAINS[self.system]
+        return [path for path in chains.get(script, chains["latin"]) if self.exists(path)]
+
+    def font_for_text(self, text, size):
+        """텍스트 문자 종류에 맞는 체인의 첫 폰트로 FreeTypeFont 반환."""
+        chain = self.fallback_chain(text_script(text))
+        return self.get_font(chain[0] if chain else None, size)
+
+
+REGISTRY = FontRegistry()
+
+
+def get_font(path, size, index=0, fallback=True):
+    return REGISTRY.get_font(path, size, index, fallback)
+
+
+def find_font(candidates):
+    return REGISTRY.find_font(candidates)
+
+
+def font_exists(path):
+    return REGISTRY.exists(path)
+
+
+def first_existing_font(paths):
+    return REGISTRY.first_existing(paths)
+
+
+def fallback_chain(script):
+    return REGISTRY.fallback_chain(script)
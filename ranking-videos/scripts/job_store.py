@@ -0,0 +1,391 @@
+"""영속 작업 저장소 (Input 비디오/ZIP 멤버 색인, 상태·내용 해시·출력 경로를 SQLite에 기록해 실행 간 중복 처리 방지)"""
+
+import contextlib
+import hashlib
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import zipfile
+
+
+# 작업 상태 (queued → scripting → tts → rendering → rendered/uploaded, 또는 failed/duplicate)
+JOB_STATES = ("queued", "scripting", "tts", "rendering", "rendered", "uploaded", "failed", "duplicate")
+ACTIVE_STATES = ("scripting", "tts", "rendering")
+# 이 상태의 작업과 내용 해시가 같으면 새 입력은 중복으로 처리
+_DEDUPE_STATES = ("queued",) + ACTIVE_STATES + ("rendered", "uploaded")
+
+DEFAULT_DB_PATH = os.path.join("Temp", "jobs.sqlite")
+ZIP_MEMBER_SEPARATOR = "::"
+_HASH_CHUNK = 1024 * 1024
+
+_COLUMNS = (
+    "id", "source_key", "origin", "member", "folder_name", "size", "mtime_ns", "content_hash",
+    "state", "video_path", "output_path", "error", "attempts", "worker", "updated_at",
+)
+
+
+def worker_id():
+    """작업을 잡은 프로세스 식별자 (호스트:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _md5_stream(handle):
+    digest = hashlib.md5()
+    for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Job:
+    """
+    작업 한 건.
+
+    - origin: Input 안의 원본 (비디오 파일 또는 ZIP), member: ZIP 안의 비디오 경로 (파일이면 None)
+    - size / mtime_ns: origin의 크기/수정 시각 (바뀌면 다시 색인)
+    - video_path: 실제로 처리할 파일 (ZIP 멤버는 작업을 잡은 뒤 추출한 경로)
+    """
+
+    __slots__ = _COLUMNS
+
+    def __init__(self, **values):
+        for name in _COLUMNS:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**dict(zip(_COLUMNS, row)))
+
+    @property
+    def name(self):
+        return os.path.basename(self.member or self.origin)
+
+    def __repr__(self):
+        return f"Job(id={self.id}, state={self.state}, source={self.source_key})"
+
+
+class JobStore:
+    """
+    SQLite 기반 작업 저장소.
+
+    - discover(): Input 폴더를 훑어 크기/수정 시각이 바뀐 원본만 해시해서 upsert (ZIP은 압축을 풀지 않고 멤버를 스트림으로 해시)
+    - 내용 해시(md5)가 같은 작업이 이미 있으면 새 입력은 duplicate (실행이 달라도 같은 DB를 쓰면 공유)
+    - WAL 저널을 쓰므로 DB는 로컬 디스크에 두고 같은 머신의 프로세스끼리만 공유
+      (네트워크 공유 폴더의 SQLite는 WAL/파일 잠금이 보장되지 않음)
+    - claim(): queued 작업을 한 트랜잭션(BEGIN IMMEDIATE)에서 scripting으로 바꿔 한 워커만 잡게 함
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = os.path.abspath(db_path)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, source_key TEXT UNIQUE NOT NULL,"
+                " origin TEXT NOT NULL, member TEXT, folder_name TEXT, size INTEGER, mtime_ns INTEGER,"
+                " content_hash TEXT, state TEXT NOT NULL, video_path TEXT, output_path TEXT, error TEXT,"
+                " attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, created_at REAL, updated_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_hash ON jobs (content_hash)")
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_origin ON jobs (origin)")
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, source_key)")
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # 트랜잭션은 _transaction()에서 직접 관리
+            connection = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                pass
+            self._local.connection = connection
+        return connection
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (여러 프로세스가 동시에 claim해도 한 곳만 성공)."""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _select(self, where="", params=(), connection=None):
+        connection = connection or self._connection()
+        rows = connection.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs {where}", params).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    # ---- 색인 ----
+
+    def _file_entries(self, path, tag_for):
+        with open(path, "rb") as handle:
+            content_hash = _md5_stream(handle)
+        folder_name = tag_for(os.path.basename(path)) if tag_for else ""
+        if folder_name:
+            print(f"[TAG] 파일명에서 태그 추출: {os.path.basename(path)} → {folder_name}")
+        return [(path, None, folder_name or "", content_hash)]
+
+    @staticmethod
+    def _zip_entries(path, extensions):
+        archive_name = os.path.splitext(os.path.basename(path))[0]
+        entries = []
+        with zipfile.ZipFile(path, "r") as archive:
+            for member in archive.namelist():
+                if member.endswith("/") or os.path.splitext(member)[1].lower() not in extensions:
+                    continue
+                with archive.open(member) as handle:
+                    content_hash = _md5_stream(handle)
+                # ZIP 내부 폴더 이름 (첫 번째 폴더, 없으면 ZIP 이름)
+                parts = member.split("/")
+                folder_name = parts[0] if len(parts) > 1 else archive_name
+                entries.append((f"{path}{ZIP_MEMBER_SEPARATOR}{member}", member, folder_name, content_hash))
+        return entries
+
+    def _upsert(self, origin, stat, entries):
+        """원본 하나의 항목들을 upsert. 새로 duplicate가 된 Job 목록 반환."""
+        now = time.time()
+        duplicates = []
+        with self._transaction() as connection:
+            for source_key, member, folder_name, content_hash in entries:
+                existing = self._select("WHERE source_key = ?", (source_key,), connection)
+                if existing and (existing[0].state in ACTIVE_STATES or existing[0].content_hash == content_hash):
+                    continue  # 다른 워커가 처리 중이거나 내용이 그대로인 멤버 (ZIP 안 다른 파일만 바뀜)
+                duplicate = connection.execute(
+                    f"SELECT id FROM jobs WHERE content_hash = ? AND source_key != ? "
+                    f"AND state IN ({','.join('?' * len(_DEDUPE_STATES))}) LIMIT 1",
+                    (content_hash, source_key) + _DEDUPE_STATES,
+                ).fetchone()
+                state = "duplicate" if duplicate else "queued"
+                connection.execute(
+                    "INSERT INTO jobs (source_key, origin, member, folder_name, size, mtime_ns, content_hash,"
+                    " state, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(source_key) DO UPDATE SET folder_name = excluded.folder_name,"
+                    " size = excluded.size, mtime_ns = excluded.mtime_ns, content_hash = excluded.content_hash,"
+                    " state = excluded.state, video_path = NULL, output_path = NULL, error = NULL,"
+                    " worker = NULL, updated_at = excluded.updated_at",
+                    (source_key, origin, member, folder_name, stat.st_size, stat.st_mtime_ns,
+                     content_hash, state, now, now),
+                )
+                if duplicate:
+                    duplicates.extend(self._select("WHERE source_key = ?", (source_key,), connection))
+            # 내용이 그대로라 건너뛴 멤버 행도 원본 크기/수정 시각을 맞춰 다음 색인에서 다시 열지 않음
+            connection.execute(
+                "UPDATE jobs SET size = ?, mtime_ns = ? WHERE origin = ?", (stat.st_size, stat.st_mtime_ns, origin)
+            )
+        return duplicates
+
+    def discover(self, input_dir, extensions, tag_for=None, skip_dirs=("Used",)):
+        """
+        input_dir의 비디오/ZIP을 색인 (크기/수정 시각이 그대로인 원본은 열지 않음).
+
+        Returns:
+            dict: {"new": 새로 색인한 원본 수, "unchanged": 건너뛴 원본 수, "duplicates": [Job]}
+        """
+        extensions = tuple(ext.lower() for ext in extensions)
+        skip_roots = [os.path.abspath(os.path.join(input_dir, name)) for name in skip_dirs]
+        known = {
+            origin: (size, mtime_ns)
+            for origin, size, mtime_ns in self._connection().execute(
+                "SELECT origin, size, mtime_ns FROM jobs GROUP BY origin"
+            )
+        }
+        result = {"new": 0, "unchanged": 0, "duplicates": []}
+        for root, dirs, files in os.walk(input_dir):
+            dirs[:] = sorted(
+                d for d in dirs
+                if not any(os.path.abspath(os.path.join(root, d)).startswith(skip) for skip in skip_roots)
+            )
+            for filename in sorted(files):
+                ext = os.path.splitext(filename)[1].lower()
+                if ext != ".zip" and ext not in extensions:
+                    continue
+                origin = os.path.abspath(os.path.join(root, filename))
+                try:
+                    stat = os.stat(origin)
+                except OSError:
+                    continue
+                if known.get(origin) == (stat.st_size, stat.st_mtime_ns):
+                    result["unchanged"] += 1
+                    continue
+                try:
+                    if ext == ".zip":
+                        entries = self._zip_entries(origin, extensions)
+                        if entries:
+                            print(f"[ZIP] ZIP에서 비디오 {len(entries)}개 발견: {origin}")
+                        else:
+                            print(f"[WARNING]  ZIP에서 비디오를 찾지 못했습니다: {origin}")
+                    else:
+                        entries = self._file_entries(origin, tag_for)
+                except zipfile.BadZipFile as exc:
+                    print(f"[ERROR] ZIP 파일을 열 수 없습니다: {origin} ({exc})")
+                    continue
+                except OSError as exc:
+                    print(f"[WARNING] 입력 파일을 읽을 수 없습니다: {origin} ({exc})")
+                    continue
+                result["duplicates"].extend(self._upsert(origin, stat, entries))
+                result["new"] += 1
+        return result
+
+    # ---- 작업 선점/상태 ----
+
+    def claim(self, job_id, worker=None, stale_minutes=None):
+        """
+        queued 작업을 scripting으로 바꿔 선점 (성공하면 Job, 아니면 None).
+
+        stale_minutes를 주면 그보다 오래 갱신이 없는 진행 중 작업(죽은 워커)도 다시 잡는다.
+        선점하는 순간 같은 내용의 다른 작업이 이미 진행/완료되었으면 duplicate로 바꾸고 None.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            found = self._select("WHERE id = ?", (job_id,), connection)
+            if not found:
+                return None
+            job = found[0]
+            stale = (
+                stale_minutes is not None and job.state in ACTIVE_STATES
+                and (job.updated_at or 0) < now - float(stale_minutes) * 60.0
+            )
+            if job.state != "queued" and not stale:
+                return None
+            duplicate = connection.execute(
+                f"SELECT id FROM jobs WHERE content_hash = ? AND id != ? "
+                f"AND state IN ({','.join('?' * (len(_DEDUPE_STATES) - 1))}) LIMIT 1",
+                (job.content_hash, job.id) + _DEDUPE_STATES[1:],
+            ).fetchone()
+            if duplicate:
+                connection.execute(
+                    "UPDATE jobs SET state = 'duplicate', updated_at = ? WHERE id = ?", (now, job.id)
+                )
+                return None
+            connection.execute(
+                "UPDATE jobs SET state = 'scripting', worker = ?, error = NULL, attempts = attempts + 1,"
+                " updated_at = ? WHERE id = ?",
+                (worker or worker_id(), now, job.id),
+            )
+        return self.get(job.id)
+
+    def claimable_jobs(self, stale_minutes=None):
+        """선점할 수 있는 작업 (queued, stale_minutes를 주면 그보다 오래 멈춘 진행 중 작업 포함), 경로순."""
+        if stale_minutes is None:
+            return self._select("WHERE state = 'queued' ORDER BY source_key")
+        return self._select(
+            f"WHERE state = 'queued' OR (state IN ({','.join('?' * len(ACTIVE_STATES))}) AND updated_at < ?) "
+            "ORDER BY source_key",
+            ACTIVE_STATES + (time.time() - float(stale_minutes) * 60.0,),
+        )
+
+    def next_job(self, worker=None, stale_minutes=None):
+        """경로순으로 가장 앞선 선점 가능한 작업을 선점 (없으면 None)."""
+        for job in self.claimable_jobs(stale_minutes):
+            claimed = self.claim(job.id, worker, stale_minutes)
+            if claimed is not None:
+                return claimed
+        return None
+
+    def get(self, job_id):
+        found = self._select("WHERE id = ?", (job_id,))
+        return found[0] if found else None
+
+    def set_state(self, job_id, state, **fields):
+        """상태와 함께 video_path / output_path / error 갱신."""
+        if state not in JOB_STATES:
+            raise ValueError(f"알 수 없는 작업 상태: {state}")
+        unknown = set(fields) - {"video_path", "output_path", "error"}
+        if unknown:
+            raise ValueError(f"갱신할 수 없는 작업 필드: {sorted(unknown)}")
+        assignments = ", ".join(["state = ?", "updated_at = ?"] + [f"{name} = ?" for name in fields])
+        with self._transaction() as connection:
+            connection.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                (state, time.time()) + tuple(fields.values()) + (job_id,),
+            )
+
+    def set_video_path(self, job_id, video_path):
+        """추출한 파일 경로만 기록 (상태는 건드리지 않으므로 선점된 작업이 queued로 돌아가지 않음)."""
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET video_path = ?, updated_at = ? WHERE id = ?", (video_path, time.time(), job_id)
+            )
+
+    def abandon(self, job_id, error):
+        """아직 진행 중 상태로 남은 작업을 failed로 (워커가 결과를 남기지 못하고 끝난 경우)."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                f"UPDATE jobs SET state = 'failed', error = ?, updated_at = ? "
+                f"WHERE id = ? AND state IN ({','.join('?' * len(ACTIVE_STATES))})",
+                (error, time.time(), job_id) + ACTIVE_STATES,
+            )
+        return cursor.rowcount > 0
+
+    def pending_for_origin(self, origin, exclude_id=None):
+        """같은 원본(ZIP)에서 아직 끝나지 않은 작업 수."""
+        states = ("queued",) + ACTIVE_STATES
+        row = self._connection().execute(
+            f"SELECT COUNT(*) FROM jobs WHERE origin = ? AND id != ? AND state IN ({','.join('?' * len(states))})",
+            (os.path.abspath(origin), -1 if exclude_id is None else exclude_id) + states,
+        ).fetchone()
+        return row[0]
+
+    def retry_failed(self):
+        """failed 작업을 다시 queued로. 바뀐 작업 수 반환."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET state = 'queued', error = NULL, updated_at = ? WHERE state = 'failed'",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def counts(self):
+        rows = self._connection().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def claims(self, stale_minutes=None):
+        """batch_runner.run_batch용 선점 객체 (키 = 작업 id)."""
+        return StoreClaims(self, stale_minutes)
+
+
+class StoreClaims:
+    """작업 저장소 상태로 선점/해제 (해제 시 진행 중으로 남은 작업은 failed)."""
+
+    def __init__(self, store, stale_minutes=None):
+        self.store = store
+        self.stale_minutes = stale_minutes
+
+    def claim(self, job_id):
+        return self.store.claim(job_id, stale_minutes=self.stale_minutes) is not None
+
+    def release(self, job_id):
+        self.store.abandon(job_id, "워커가 결과를 남기지 않고 종료됨")
+
+
+_SHARED_STORE = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_job_store(db_path=None):
+    """프로세스 공용 작업 저장소 (db_path가 바뀌면 새로 염)."""
+    global _SHARED_STORE
+    db_path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    with _SHARED_LOCK:
+        if _SHARED_STORE is None or _SHARED_STORE.db_path != db_path:
+            _SHARED_STORE = JobStore(db_path)
+        return _SHARED_STORE
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    store = get_job_store(args[0] if args else None)
+    if "--retry-failed" in sys.argv:
+        print(f"[JOBS] 실패 작업 {store.retry_failed()}개를 다시 대기열에 넣었습니다")
+    print(f"[JOBS] {store.db_path}")
+    for job_state in JOB_STATES:
+        print(f"   {job_state}: {store.counts().get(job_state, 0)}")
+    for failed in store._select("WHERE state = 'failed' ORDER BY updated_at DESC LIMIT 20"):
+        print(f"   [failed] {failed.source_key}: {failed.error}")
@@ -0,0 +1,462 @@
+"""평면 레이어 합성기 (중첩 CompositeVideoClip 대신 출력 좌표의 레이어 목록을 프레임당 1회 그리기)"""
+
+import math
+from bisect import bisect_right
+
+import numpy as np
+from PIL import Image
+from moviepy.video.VideoClip import VideoClip
+from moviepy.tools import compute_position
+
+
+def scaled_size(size, scale):
+    """moviepy clip.resized(scale) 와 같은 규칙(int 절삭)으로 스케일 후 크기 계산."""
+    return int(scale * size[0]), int(scale * size[1])
+
+
+def _transform_rect(rect, kx, ky, dx, dy):
+    x0, y0, x1, y1 = rect
+    return x0 * kx + dx, y0 * ky + dy, x1 * kx + dx, y1 * ky + dy
+
+
+def _clip_rect(rect, width, height):
+    x0, y0, x1, y1 = rect
+    return max(0.0, x0), max(0.0, y0), min(float(width), x1), min(float(height), y1)
+
+
+def _round_rect(rect):
+    x0, y0, x1, y1 = (int(round(v)) for v in rect)
+    return x0, y0, x1, y1
+
+
+def _blend_region(region, src, alpha):
+    """region = src*a + region*(255-a) (PIL alpha_composite 와 같은 8비트 반올림)."""
+    alpha = alpha.astype(np.uint16)[..., np.newaxis]
+    mixed = src.astype(np.uint16) * alpha
+    mixed += region.astype(np.uint16) * (255 - alpha)
+    mixed += 127
+    mixed //= 255
+    region[...] = mixed
+
+
+class Sprite:
+    """
+    텍스트/아이콘 오버레이용 스프라이트.
+
+    - pixels: 내용 bbox로 잘라낸 premultiplied uint8 RGBA 버퍼
+    - offset: 원래 캔버스(size) 안에서 pixels의 좌상단 위치
+    - blend_into(): 정수 연산으로 대상 프레임에 제자리 합성
+    """
+
+    __slots__ = ("pixels", "offset", "size")
+
+    def __init__(self, pixels, offset, size):
+        self.pixels = pixels
+        self.offset = (int(offset[0]), int(offset[1]))
+        self.size = (int(size[0]), int(size[1]))
+
+    @classmethod
+    def from_rgba(cls, rgba):
+        """straight alpha RGBA 배열(h, w, 4)에서 투명 여백을 잘라내고 premultiply."""
+        rgba = np.asarray(rgba)
+        if rgba.dtype != np.uint8:
+            rgba = np.clip(rgba, 0, 255).astype(np.uint8)
+        height, width = rgba.shape[:2]
+        alpha = rgba[..., 3]
+        rows = np.flatnonzero(alpha.any(axis=1))
+        cols = np.flatnonzero(alpha.any(axis=0))
+        if rows.size == 0:
+            return cls(np.zeros((0, 0, 4), dtype=np.uint8), (0, 0), (width, height))
+        y0, y1 = int(rows[0]), int(rows[-1]) + 1
+        x0, x1 = int(cols[0]), int(cols[-1]) + 1
+        crop = rgba[y0:y1, x0:x1]
+        pixels = np.empty(crop.shape, dtype=np.uint8)
+        a = crop[..., 3:4].astype(np.uint16)
+        premultiplied = crop[..., :3] * a
+        premultiplied += 127
+        premultiplied //= 255
+        pixels[..., :3] = premultiplied
+        pixels[..., 3] = crop[..., 3]
+        return cls(pixels, (x0, y0), (width, height))
+
+    @classmethod
+    def from_rgb_alpha(cls, rgb, alpha):
+        alpha = np.asarray(alpha)
+        if alpha.ndim == 3:
+            alpha = alpha[..., 0]
+        if alpha.dtype != np.uint8:
+            if alpha.max() <= 1.0:
+                alpha = alpha * 255.0
+            alpha = np.clip(np.rint(alpha), 0, 255).astype(np.uint8)
+        return cls.from_rgba(np.dstack([np.asarray(rgb)[..., :3], alpha]))
+
+    @property
+    def nbytes(self):
+        return self.pixels.nbytes
+
+    def to_rgba(self):
+        """원래 캔버스 크기의 straight alpha RGBA 배열로 복원 (moviepy 호환 경로용)."""
+        width, height = self.size
+        rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        if self.pixels.size:
+            x0, y0 = self.offset
+            h, w = self.pixels.shape[:2]
+            a = self.pixels[..., 3:4].astype(np.uint32)
+            rgb = self.pixels[..., :3].astype(np.uint32) * 255 + a // 2
+            np.floor_divide(rgb, np.maximum(a, 1), out=rgb)
+            rgba[y0:y0 + h, x0:x0 + w, :3] = np.minimum(rgb, 255)
+            rgba[y0:y0 + h, x0:x0 + w, 3] = self.pixels[..., 3]
+        return rgba
+
+    def blend_into(self, frame, x, y, brightness=255):
+        """
+        캔버스 좌상단을 frame의 (x, y)에 두고 합성: dst = src_premul + dst * (255 - a) / 255.
+
+        brightness < 255 이면 색상만 검정 쪽으로 낮춤 (moviepy FadeOut 과 같은 의미).
+        """
+        if not self.pixels.size:
+            return
+        frame_h, frame_w = frame.shape[:2]
+        h, w = self.pixels.shape[:2]
+        left, top = x + self.offset[0], y + self.offset[1]
+        x0, y0 = max(0, left), max(0, top)
+        x1, y1 = min(frame_w, left + w), min(frame_h, top + h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        src = self.pixels[y0 - top:y1 - top, x0 - left:x1 - left]
+        region = frame[y0:y1, x0:x1, :3]
+        inverse = 255 - src[..., 3:4].astype(np.uint16)
+        mixed = region * inverse
+        mixed += 127
+        mixed //= 255
+        if brightness >= 255:
+            mixed += src[..., :3]
+        else:
+            color = src[..., :3].astype(np.uint16) * max(0, int(brightness))
+            color += 127
+            color //= 255
+            mixed += color
+        np.minimum(mixed, 255, out=mixed)
+        region[...] = mixed
+
+
+class SpriteClip(VideoClip):
+    """
+    Sprite를 담은 moviepy 호환 클립 (ImageClip + float 마스크 대신 사용).
+
+    LayerCompositor는 효과가 걸리지 않은 SpriteClip이면 sprite를 바로 합성하고,
+    그 외 경로(get_frame, 효과 적용 등)에서는 필요할 때만 전체 크기 프레임/마스크를 만든다.
+    """
+
+    def __init__(self, sprite, duration=None):
+        super().__init__(duration=duration)
+        self.sprite = sprite
+        self.size = sprite.size
+        self.frame_function = self._full_frame
+        mask = VideoClip(is_mask=True, duration=duration)
+        mask.size = sprite.size
+        mask.frame_function = self._mask_frame
+        self.mask = mask
+
+    def _full_frame(self, t):
+        return self.sprite.to_rgba()[..., :3]
+
+    def _mask_frame(self, t):
+        return self.sprite.to_rgba()[..., 3] / 255.0
+
+
+class SpriteSequenceClip(VideoClip):
+    """
+    프레임마다 다른 Sprite를 내주는 클립 (미리 키잉된 크로마키 영상 등).
+
+    sprite_at(t)는 캔버스 크기(size)가 같은 Sprite를 반환하며,
+    LayerCompositor는 효과가 걸리지 않은 경우 해당 Sprite를 바로 합성한다.
+    """
+
+    def __init__(self, sprite_at, size, duration=None):
+        super().__init__(duration=duration)
+        self.sprite_at = sprite_at
+        self.size = (int(size[0]), int(size[1]))
+        self.frame_function = self._full_frame
+        mask = VideoClip(is_mask=True, duration=duration)
+        mask.size = self.size
+        mask.frame_function = self._mask_frame
+        self.mask = mask
+
+    def _full_frame(self, t):
+        return self.sprite_at(t).to_rgba()[..., :3]
+
+    def _mask_frame(self, t):
+        return self.sprite_at(t).to_rgba()[..., 3] / 255.0
+
+
+def sprite_of(clip):
+    """효과 없이 위치/시간만 바뀐 SpriteClip이면 Sprite, 아니면 None."""
+    sprite = getattr(clip, "sprite", None)
+    if sprite is None or clip.mask is None:
+        return None
+    if getattr(clip.frame_function, "__func__", None) is not SpriteClip._full_frame:
+        return None
+    if getattr(clip.mask.frame_function, "__func__", None) is not SpriteClip._mask_frame:
+        return None
+    return sprite
+
+
+def sprite_sequence_of(clip):
+    """효과 없이 위치/시간만 바뀐 SpriteSequenceClip이면 sprite_at 함수, 아니면 None."""
+    sprite_at = getattr(clip, "sprite_at", None)
+    if sprite_at is None or clip.mask is None:
+        return None
+    if getattr(clip.frame_function, "__func__", None) is not SpriteSequenceClip._full_frame:
+        return None
+    if getattr(clip.mask.frame_function, "__func__", None) is not SpriteSequenceClip._mask_frame:
+        return None
+    return sprite_at
+
+
+class OverlayTimeline:
+    """
+    레이어 시간 구간 인덱스 (프레임마다 활성 레이어만 조회).
+
+    - add(start, end, item): [start, end) 구간 등록 (end=None이면 끝까지), 같은 item을 여러 구간으로 등록 가능
+    - active(t): t에 활성인 item을 등록(z) 순서대로 반환
+    - 구간을 bucket_seconds 단위 버킷에 미리 나눠 담아 두고 조회 시 해당 버킷만 확인
+    - 조회할 때마다 활성 레이어 수를 기록해 report()로 프레임별 통계 출력
+    """
+
+    def __init__(self, bucket_seconds=1.0):
+        self.bucket_seconds = float(bucket_seconds)
+        self._items = []
+        self._intervals = []  # [(start, end, item_index), ...]
+        self._buckets = None
+        self._open_ended = None
+        self._open_starts = None
+        self.frame_counts = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, start, end, item):
+        """item을 [start, end) 구간에 등록. 같은 item의 추가 구간은 add_interval()로 등록."""
+        self._items.append(item)
+        index = len(self._items) - 1
+        self.add_interval(index, start, end)
+        return index
+
+    def add_interval(self, index, start, end):
+        start = max(0.0, float(start))
+        end = None if end is None else float(end)
+        if end is not None and end <= start:
+            return
+        self._intervals.append((start, end, index))
+        self._buckets = None
+
+    def _build(self):
+        buckets = {}
+        open_ended = []
+        for start, end, index in self._intervals:
+            first = int(math.floor(start / self.bucket_seconds))
+            if end is None:
+                open_ended.append((start, end, index))
+                continue
+            last = int(math.floor(end / self.bucket_seconds))
+            for bucket in range(first, last + 1):
+                buckets.setdefault(bucket, []).append((start, end, index))
+        self._open_ended = sorted(open_ended)
+        self._open_starts = [start for start, _, _ in self._open_ended]
+        self._buckets = buckets
+
+    def active(self, t):
+        if self._buckets is None:
+            self._build()
+        t = float(t)
+        indices = set()
+        for start, end, index in self._buckets.get(int(math.floor(t / self.bucket_seconds)), ()):
+            if start <= t < end:
+                indices.add(index)
+        for start, _, index in self._open_ended[:bisect_right(self._open_starts, t)]:
+            indices.add(index)
+        self.frame_counts.append(len(indices))
+        return [self._items[index] for index in sorted(indices)]
+
+    def report(self, label="[LAYER]"):
+        if not self.frame_counts:
+            return
+        counts = np.asarray(self.frame_counts)
+        histogram = np.bincount(counts)
+        distribution = ", ".join(f"{n}개: {c}" for n, c in enumerate(histogram) if c)
+        print(
+            f"{label} 레이어 {len(self._items)}개, {counts.size}프레임 평균 활성 {counts.mean():.2f}개 "
+            f"(최대 {counts.max()}개) - 분포 {distribution}"
+        )
+
+
+class LayerCompositor(VideoClip):
+    """
+    메인 영상 + 오버레이 레이어를 출력 해상도에서 한 번에 그리는 합성 클립.
+
+    - add_canvas_stage(): 기존 "스케일 → 단색 캔버스에 배치" 단계를 누적해서
+      메인 영상의 출력 좌표 변환(스케일/오프셋/가시 영역)과 캔버스 배경 사각형으로 환산
+    - 메인 영상은 프레임당 1회만 리샘플링 (PIL resize box로 소스 영역을 바로 출력 크기로)
+    - add_flash_layer()/add_clip_layer(): 현재 캔버스 좌표 기준 레이어를 순서대로 그리기
+      (OverlayTimeline 구간 인덱스로 프레임마다 활성 레이어만 평가)
+    """
+
+    def __init__(self, video):
+        super().__init__(duration=video.duration)
+        self.video = video
+        self.size = tuple(video.size)
+        w, h = self.size
+        self._fills = []  # [(rect, color), ...] 아래쪽 캔버스부터
+        self._video_scale = (1.0, 1.0)
+        self._video_offset = (0.0, 0.0)
+        self._video_rect = (0.0, 0.0, float(w), float(h))
+        self.layers = OverlayTimeline()
+        self.frame_function = self._render_frame
+
+    def add_canvas_stage(self, canvas_size, scaled_size, position, color=(0, 0, 0)):
+        """현재 화면을 scaled_size로 스케일해서 canvas_size 단색 캔버스의 position에 배치."""
+        if self.layers:
+            raise ValueError("레이어를 추가한 뒤에는 캔버스 단계를 추가할 수 없습니다")
+        canvas_w, canvas_h = (int(v) for v in canvas_size)
+        prev_w, prev_h = self.size
+        kx = float(scaled_size[0]) / max(1, prev_w)
+        ky = float(scaled_size[1]) / max(1, prev_h)
+        dx, dy = compute_position(tuple(int(v) for v in scaled_size), (canvas_w, canvas_h), position)
+
+        fills = [((0.0, 0.0, float(canvas_w), float(canvas_h)), tuple(int(c) for c in color[:3]))]
+        for rect, fill_color in self._fills:
+            rect = _clip_rect(_transform_rect(rect, kx, ky, dx, dy), canvas_w, canvas_h)
+            if rect[0] < rect[2] and rect[1] < rect[3]:
+                fills.append((rect, fill_color))
+        self._fills = fills
+        sx, sy = self._video_scale
+        ox, oy = self._video_offset
+        self._video_scale = (sx * kx, sy * ky)
+        self._video_offset = (ox * kx + dx, oy * ky + dy)
+        self._video_rect = _clip_rect(_transform_rect(self._video_rect, kx, ky, dx, dy), canvas_w, canvas_h)
+        self.size = (canvas_w, canvas_h)
+
+    def add_flash_layer(self, size, intervals, opacity, color=(255, 255, 255), position=(0, 0)):
+        intervals = [(float(s), float(e)) for s, e in intervals if e > s]
+        if not intervals:
+            return
+        x, y = (int(v) for v in position)
+        rect = _round_rect(_clip_rect((x, y, x + int(size[0]), y + int(size[1])), *self.size))
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            return
+        layer = {
+            "kind": "flash",
+            "rect": rect,
+            "alpha": int(np.clip(float(opacity), 0.0, 1.0) * 255),
+            "color": np.array(color[:3], dtype=np.uint16),
+        }
+        index = self.layers.add(*intervals[0], layer)
+        for start, end in intervals[1:]:
+            self.layers.add_interval(index, start, end)
+
+    def add_clip_layer(self, clip, fade_out=0.0):
+        """
+        moviepy 클립(정지/동영상, 마스크 포함)을 현재 캔버스 좌표의 레이어로 추가.
+
+        fade_out: 끝나기 전 해당 초 동안 색상을 검정으로 낮춤 (FadeOut 효과 대신 합성 단계에서 처리)
+        """
+        start = float(clip.start or 0.0)
+        end = float(clip.end) if clip.end is not None else None
+        fade_out = float(fade_out or 0.0) if end is not None else 0.0
+        self.layers.add(start, end, {
+            "kind": "clip",
+            "clip": clip,
+            "sprite": sprite_of(clip),
+            "sprites": sprite_sequence_of(clip),
+            "start": start,
+            "end": end,
+            "fade_out": fade_out,
+        })
+
+    def _draw_video(self, frame, t):
+        source = self.video.get_frame(t)
+        if source.dtype != np.uint8:
+            source = np.clip(source, 0, 255).astype(np.uint8)
+        source = source[..., :3]
+        dx0, dy0, dx1, dy1 = _round_rect(self._video_rect)
+        if dx0 >= dx1 or dy0 >= dy1:
+            return
+        sx, sy = self._video_scale
+        ox, oy = self._video_offset
+        box = ((dx0 - ox) / sx, (dy0 - oy) / sy, (dx1 - ox) / sx, (dy1 - oy) / sy)
+        target_w, target_h = dx1 - dx0, dy1 - dy0
+        src_h, src_w = source.shape[:2]
+        if (
+            abs(sx - 1.0) < 1e-9 and abs(sy - 1.0) < 1e-9
+            and all(abs(v - round(v)) < 1e-6 for v in box)
+        ):
+            bx0, by0 = int(round(box[0])), int(round(box[1]))
+            frame[dy0:dy1, dx0:dx1] = source[by0:by0 + target_h, bx0:bx0 + target_w]
+            return
+        box = (max(0.0, box[0]), max(0.0, box[1]), min(float(src_w), box[2]), min(float(src_h), box[3]))
+        resized = Image.fromarray(source).resize((target_w, target_h), Image.Resampling.LANCZOS, box=box)
+        frame[dy0:dy1, dx0:dx1] = np.asarray(resized)
+
+    def _draw_clip(self, frame, layer, t):
+        clip = layer["clip"]
+        ct = t - layer["start"]
+        brightness = 255
+        if layer["fade_out"] > 0 and layer["end"] - t < layer["fade_out"]:
+            brightness = int(255 * max(0.0, layer["end"] - t) / layer["fade_out"])
+
+        sprite = layer["sprite"]
+        if sprite is None and layer["sprites"] is not None:
+            sprite = layer["sprites"](ct)
+        if sprite is not None:
+            x, y = compute_position(sprite.size, self.size, clip.pos(ct), clip.relative_pos)
+            sprite.blend_into(frame, x, y, brightness)
+            return
+
+        image = clip.get_frame(ct)
+        if image.dtype != np.uint8:
+            image = np.clip(image, 0, 255).astype(np.uint8)
+        if image.ndim == 2:
+            image = np.stack([image] * 3, axis=-1)
+        image = image[..., :3]
+        h, w = image.shape[:2]
+        canvas_w, canvas_h = self.size
+        x, y = compute_position((w, h), (canvas_w, canvas_h), clip.pos(ct), clip.relative_pos)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(canvas_w, x + w), min(canvas_h, y + h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        src = image[y0 - y:y1 - y, x0 - x:x1 - x]
+        if brightness < 255:
+            src = (src.astype(np.uint16) * brightness + 127) // 255
+        region = frame[y0:y1, x0:x1]
+        if clip.mask is None:
+            region[...] = src
+            return
+        mask = (clip.mask.get_frame(ct) * 255).astype(np.uint8)
+        alpha = np.zeros((h, w), dtype=np.uint8)
+        mh, mw = min(h, mask.shape[0]), min(w, mask.shape[1])
+        alpha[:mh, :mw] = mask[:mh, :mw]
+        _blend_region(region, src, alpha[y0 - y:y1 - y, x0 - x:x1 - x])
+
+    def _render_frame(self, t):
+        width, height = self.size
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        for rect, color in self._fills:
+            x0, y0, x1, y1 = _round_rect(rect)
+            frame[y0:y1, x0:x1] = color
+        self._draw_video(frame, t)
+
+        for layer in self.layers.active(t):
+            if layer["kind"] == "flash":
+                x0, y0, x1, y1 = layer["rect"]
+                region = frame[y0:y1, x0:x1]
+                alpha = layer["alpha"]
+                mixed = region.astype(np.uint16) * (255 - alpha)
+                mixed += layer["color"] * alpha
+                mixed += 127
+                mixed //= 255
+                region[...] = mixed
+            else:
+                self._draw_clip(frame, layer, t)
+        return frame
@@ -0,0 +1,309 @@
+"""저해상도 스트리밍 분석 (ffmpeg 회색조 비디오 + 모노 PCM 1회 디코딩 → 씬 전환/무음/에너지/선명도 기록)"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from moviepy.config import FFMPEG_BINARY
+
+
+# 분석 결과가 바뀌는 코드 변경 시 올려서 기존 분석 캐시를 무효화
+ANALYSIS_VERSION = 1
+
+ANALYSIS_WIDTH = 320
+ANALYSIS_HEIGHT = 180
+DEFAULT_SAMPLE_FPS = 15
+AUDIO_SAMPLE_RATE = 16000
+# 오디오 피크/에너지 포락선 간격 (초)
+ENVELOPE_HOP = 0.01
+DEFAULT_CACHE_DIR = os.path.join("Temp", "analysis_cache")
+
+
+def parse_decibels(value, default=-30.0):
+    """'-30dB' / '-30' / -30 → -30.0"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.match(r"^\s*(-?[0-9.]+)\s*(?:dB)?\s*$", str(value or ""), flags=re.IGNORECASE)
+    return float(match.group(1)) if match else float(default)
+
+
+def _sharpness(gray):
+    """라플라시안 분산 (클수록 초점이 맞고 흔들림이 적은 프레임)."""
+    center = gray[1:-1, 1:-1]
+    laplacian = 4.0 * center - gray[:-2, 1:-1] - gray[2:, 1:-1] - gray[1:-1, :-2] - gray[1:-1, 2:]
+    return float(laplacian.var())
+
+
+class MediaAnalysis:
+    """
+    영상 하나의 분석 기록 (원본 시간 기준).
+
+    - frame_diffs[i]: 샘플 프레임 i와 i-1의 평균 절대 밝기 차 (i=0은 0)
+    - sharpness[i]: 샘플 프레임 i의 라플라시안 분산
+    - peaks / energy: ENVELOPE_HOP 간격의 오디오 절대 피크 / RMS (0.0-1.0)
+    """
+
+    def __init__(self, sample_fps, frame_diffs, sharpness, peaks, energy, duration, has_audio):
+        self.sample_fps = float(sample_fps)
+        self.frame_diffs = np.asarray(frame_diffs, dtype=np.float32)
+        self.sharpness = np.asarray(sharpness, dtype=np.float32)
+        self.peaks = np.asarray(peaks, dtype=np.float32)
+        self.energy = np.asarray(energy, dtype=np.float32)
+        self.duration = float(duration)
+        self.has_audio = bool(has_audio)
+
+    # ---- 씬 전환 ----
+
+    def scene_changes(self, threshold=30.0, min_scene_duration=1.0, time_offset=0.0, speed=1.0):
+        """
+        씬 전환 시점 목록 (출력 시간 기준).
+
+        time_offset: 앞부분을 잘라낸 초 (그 이전 전환은 제외), speed: 재생 속도 배율.
+        min_scene_duration은 기존 detect_scene_changes와 같이 출력 시간 기준으로 적용.
+        """
+        if threshold <= 0 or self.frame_diffs.size < 2:
+            return []
+        speed = float(speed or 1.0)
+        first = int(np.ceil(float(time_offset) * self.sample_fps)) + 1
+        last_change_time = -min_scene_duration
+        change_times = []
+        for index in np.flatnonzero(self.frame_diffs >= threshold):
+            if index < first:
+                continue
+            current_time = (int(index) / self.sample_fps - float(time_offset)) / speed
+            if (current_time - last_change_time) >= min_scene_duration:
+                change_times.append(current_time)
+                last_change_time = current_time
+        return change_times
+
+    # ---- 무음/에너지 ----
+
+    def silence_intervals(self, noise_threshold="-30dB", min_silence=0.5):
+        """
+        무음 구간 [(start, end), ...] — ffmpeg silencedetect와 같은 규칙.
+
+        피크가 noise_threshold 미만인 구간이 min_silence 이상 이어지면 무음, 끝까지 무음이면 end=duration.
+        """
+        if not self.has_audio or not self.peaks.size:
+            return []
+        limit = 10.0 ** (parse_decibels(noise_threshold) / 20.0)
+        quiet = np.concatenate([[False], self.peaks < limit, [False]])
+        edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+        intervals = []
+        for start, end in zip(edges[::2], edges[1::2]):
+            start_time = float(start) * ENVELOPE_HOP
+            end_time = min(self.duration, float(end) * ENVELOPE_HOP)
+            if end_time - start_time >= min_silence:
+                intervals.append((start_time, end_time))
+        return intervals
+
+    def silence_offset(self, noise_threshold="-30dB", min_silence=0.5):
+        """첫 무음 구간의 끝 시간 (기존 silencedetect 첫 silence_end와 같은 의미, 없으면 0.0)."""
+        intervals = self.silence_intervals(noise_threshold, min_silence)
+        return float(intervals[0][1]) if intervals else 0.0
+
+    def energy_at(self, t):
+        if not self.energy.size:
+            return 0.0
+        index = min(self.energy.size - 1, max(0, int(float(t) / ENVELOPE_HOP)))
+        return float(self.energy[index])
+
+    # ---- 썸네일 ----
+
+    def sharpest_time(self, center=None, window=None):
+        """
+        center ± window 안에서 가장 선명한 샘플 프레임 시간 (기본: 영상 중간 ± 길이의 15%).
+
+        분석 프레임이 없으면 center를 그대로 반환.
+        """
+        if center is None:
+            center = self.duration / 2
+        if not self.sharpness.size:
+            return center
+        if window is None:
+            window = self.duration * 0.15
+        times = np.arange(self.sharpness.size) / self.sample_fps
+        candidates = np.flatnonzero(np.abs(times - center) <= window)
+        if not candidates.size:
+            return center
+        best = candidates[np.argmax(self.sharpness[candidates])]
+        return float(min(times[best], max(0.0, self.duration - 1.0 / self.sample_fps)))
+
+    # ---- 저장 ----
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            np.savez(
+                handle,
+                frame_diffs=self.frame_diffs,
+                sharpness=self.sharpness,
+                peaks=self.peaks,
+                energy=self.energy,
+                meta=np.array(json.dumps({
+                    "sample_fps": self.sample_fps,
+                    "duration": self.duration,
+                    "has_audio": self.has_audio,
+                })),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                meta["sample_fps"], data["frame_diffs"], data["sharpness"],
+                data["peaks"], data["energy"], meta["duration"], meta["has_audio"],
+            )
+
+
+def _run_analysis(video_path, sample_fps, with_audio):
+    frame_size = ANALYSIS_WIDTH * ANALYSIS_HEIGHT
+    command = [
+        FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-nostdin",
+        "-i", video_path,
+        "-map", "0:v:0",
+        "-vf", f"fps={sample_fps},scale={ANALYSIS_WIDTH}:{ANALYSIS_HEIGHT}:flags=area,format=gray",
+        "-f", "rawvideo", "pipe:1",
+    ]
+    pcm_path = None
+    if with_audio:
+        fd, pcm_path = tempfile.mkstemp(suffix=".pcm")
+        os.close(fd)
+        command += ["-map", "0:a:0", "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE), "-f", "s16le", "-y", pcm_path]
+
+    frame_diffs = []
+    sharpness = []
+    try:
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+            previous = None
+            try:
+                while True:
+                    chunk = process.stdout.read(frame_size)
+                    if len(chunk) < frame_size:
+                        break
+                    gray = np.frombuffer(chunk, dtype=np.uint8).reshape(ANALYSIS_HEIGHT, ANALYSIS_WIDTH)
+                    gray = gray.astype(np.float32)
+                    frame_diffs.append(0.0 if previous is None else float(np.mean(np.abs(gray - previous))))
+                    sharpness.append(_sharpness(gray))
+                    previous = gray
+            finally:
+                process.stdout.close()
+                process.wait()
+            if process.returncode != 0:
+                stderr_file.seek(0)
+                message = stderr_file.read().decode("utf-8", "replace").strip()
+                raise RuntimeError(message or f"ffmpeg exit {process.returncode}")
+
+        peaks = np.zeros(0, dtype=np.float32)
+        energy = np.zeros(0, dtype=np.float32)
+        audio_duration = 0.0
+        if pcm_path:
+            samples = np.fromfile(pcm_path, dtype=np.int16).astype(np.float32) / 32768.0
+            audio_duration = samples.size / AUDIO_SAMPLE_RATE
+            hop = int(AUDIO_SAMPLE_RATE * ENVELOPE_HOP)
+            count = int(np.ceil(samples.size / hop)) if samples.size else 0
+            if count:
+                padded = np.zeros(count * hop, dtype=np.float32)
+                padded[:samples.size] = samples
+                blocks = padded.reshape(count, hop)
+                peaks = np.abs(blocks).max(axis=1)
+                energy = np.sqrt(np.mean(blocks * blocks, axis=1))
+        video_duration = len(frame_diffs) / float(sample_fps)
+        return MediaAnalysis(
+            sample_fps, frame_diffs, sharpness, peaks, energy,
+            max(video_duration, audio_duration), pcm_path is not None,
+        )
+    finally:
+        if pcm_path and os.path.exists(pcm_path):
+            try:
+                os.remove(pcm_path)
+            except OSError:
+                pass
+
+
+def analyze_media(video_path, sample_fps=DEFAULT_SAMPLE_FPS):
+    """
+    ffmpeg 1회 실행으로 320x180 회색조 프레임(stdout 파이프)과 16kHz 모노 PCM을 함께 디코딩해 분석.
+
+    오디오 스트림이 없는 파일은 비디오만 다시 분석한다.
+    """
+    try:
+        return _run_analysis(video_path, sample_fps, with_audio=True)
+    except RuntimeError as exc:
+        if "does not contain any stream" not in str(exc) and "matches no streams" not in str(exc):
+            raise
+        return _run_analysis(video_path, sample_fps, with_audio=False)
+
+
+_RECORDS = {}
+_RECORDS_LOCK = threading.Lock()
+
+
+def _record_key(video_path, sample_fps):
+    stat = os.stat(video_path)
+    return (os.path.abspath(video_path), stat.st_size, stat.st_mtime_ns, float(sample_fps))
+
+
+def get_media_analysis(video_path, cache_dir=DEFAULT_CACHE_DIR, sample_fps=DEFAULT_SAMPLE_FPS):
+    """
+    영상별 분석 기록 (프로세스 메모리 → <cache_dir>/<key>.npz → 새로 분석 순).
+
+    키는 (절대 경로, 파일 크기, 수정 시각, 샘플 fps)이므로 파일이 바뀌면 다시 분석한다.
+    """
+    key = _record_key(video_path, sample_fps)
+    with _RECORDS_LOCK:
+        record = _RECORDS.get(key)
+    if record is not None:
+        return record
+
+    cache_path = None
+    if cache_dir:
+        digest = hashlib.sha1(json.dumps([ANALYSIS_VERSION, *key]).encode("utf-8")).hexdigest()
+        cache_path = os.path.join(cache_dir, f"{digest}.npz")
+        if os.path.exists(cache_path):
+            try:
+                record = MediaAnalysis.load(cache_path)
+            except Exception as exc:
+                print(f"   [ANALYSIS] 손상된 분석 캐시 파일 삭제: {cache_path} ({exc})")
+                try:
+                    os.remove(cache_path)
+                except OSError:
+                    pass
+
+    if record is None:
+        started = time.time()
+        record = analyze_media(video_path, sample_fps)
+        print(
+            f"   [ANALYSIS] {os.path.basename(video_path)}: 프레임 {record.frame_diffs.size}개, "
+            f"오디오 {'있음' if record.has_audio else '없음'}, {time.time() - started:.2f}초"
+        )
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                record.save(cache_path)
+            except OSError as exc:
+                print(f"   [ANALYSIS] 분석 캐시 저장 실패: {exc}")
+
+    with _RECORDS_LOCK:
+        _RECORDS[key] = record
+    return record
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python scripts/media_analysis.py <비디오 경로>")
+        sys.exit(1)
+    analysis = get_media_analysis(sys.argv[1])
+    print(f"씬 전환: {[round(t, 2) for t in analysis.scene_changes()]}")
+    print(f"무음 구간: {[(round(s, 2), round(e, 2)) for s, e in analysis.silence_intervals()]}")
+    print(f"가장 선명한 프레임: {analysis.sharpest_time():.2f}초")
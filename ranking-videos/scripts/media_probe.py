@@ -0,0 +1,281 @@
+"""미디어 프로브 캐시 ((경로, 크기, 수정 시각) + 선택적 부분 해시 → 길이/fps/크기/코덱/오디오/회전, SQLite 저장)"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+
+# 프로브 결과 형식이 바뀌면 올려서 기존 항목을 무효화
+PROBE_VERSION = 1
+
+# ranking-videos/Temp/media_probe.sqlite (실행 위치와 무관하게 두 앱이 같은 저장소 공유)
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Temp", "media_probe.sqlite")
+# 부분 해시: 파일 앞/뒤 구간만 읽음
+PARTIAL_HASH_BYTES = 64 * 1024
+
+
+class MediaInfo:
+    """프로브 결과 (길이 초, fps, (w, h), 비디오 코덱, 비디오/오디오 유무, 오디오 샘플레이트, 회전 각도)."""
+
+    __slots__ = ("duration", "fps", "size", "video_codec", "has_video", "has_audio", "audio_fps", "rotation")
+
+    def __init__(self, duration=0.0, fps=None, size=None, video_codec=None, has_video=False,
+                 has_audio=False, audio_fps=None, rotation=0):
+        self.duration = float(duration or 0.0)
+        self.fps = float(fps) if fps else None
+        self.size = (int(size[0]), int(size[1])) if size else None
+        self.video_codec = video_codec
+        self.has_video = bool(has_video)
+        self.has_audio = bool(has_audio)
+        self.audio_fps = int(audio_fps) if audio_fps else None
+        self.rotation = int(rotation or 0)
+
+    @property
+    def display_size(self):
+        """회전 메타데이터를 적용한 화면 표시 크기 (VideoFileClip.size와 같은 값)."""
+        if self.size and self.rotation in (90, 270, -90, -270):
+            return (self.size[1], self.size[0])
+        return self.size
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    @classmethod
+    def from_ffmpeg_infos(cls, infos):
+        has_video = bool(infos.get("video_found"))
+        duration = infos.get("duration") or 0.0
+        if has_video and infos.get("video_duration"):
+            duration = infos["video_duration"]
+        return cls(
+            duration=duration,
+            fps=infos.get("video_fps") if has_video else None,
+            size=infos.get("video_size") if has_video else None,
+            video_codec=infos.get("video_codec_name") if has_video else None,
+            has_video=has_video,
+            has_audio=bool(infos.get("audio_found")),
+            audio_fps=infos.get("audio_fps"),
+            rotation=infos.get("video_rotation", 0),
+        )
+
+    def __repr__(self):
+        return (
+            f"MediaInfo(duration={self.duration:.3f}, fps={self.fps}, size={self.size}, "
+            f"video_codec={self.video_codec!r}, has_audio={self.has_audio}, rotation={self.rotation})"
+        )
+
+
+def partial_hash(path, chunk=PARTIAL_HASH_BYTES):
+    """파일 크기 + 앞/뒤 chunk 바이트의 sha1 (복사/이동으로 mtime만 바뀐 파일 식별용)."""
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(str(size).encode("ascii"))
+    with open(path, "rb") as handle:
+        digest.update(handle.read(chunk))
+        if size > chunk:
+            handle.seek(max(chunk, size - chunk))
+            digest.update(handle.read(chunk))
+    return digest.hexdigest()
+
+
+class MediaProbeCache:
+    """
+    SQLite 기반 미디어 프로브 캐시.
+
+    - 키: 절대 경로 + 파일 크기 + 수정 시각(ns) → 같으면 ffmpeg 실행 없이 저장된 결과 사용
+    - 키가 없으면 부분 해시를 계산해 같은 내용의 기존 항목(복사/이동된 파일)을 경로/mtime이 달라도 재사용
+    - verify_hash=True: 키가 일치해도 부분 해시를 다시 계산해 내용이 그대로인지 확인
+    - 프로세스 메모리 캐시를 앞에 두어 같은 실행 안의 반복 조회는 SQLite도 거치지 않음
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = os.path.abspath(db_path)
+        self.hits = 0
+        self.probes = 0
+        self._memory = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS probes ("
+                " path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER,"
+                " partial_hash TEXT, version INTEGER, info TEXT, probed_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS probes_hash ON probes (partial_hash, size)")
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10.0)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                pass
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _file_key(path):
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+    def _store(self, key, info, file_hash):
+        abs_path, size, mtime_ns = key
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (abs_path, size, mtime_ns, file_hash, PROBE_VERSION, json.dumps(info.to_dict()), time.time()),
+            )
+        with self._lock:
+            self._memory[key] = (info, file_hash)
+
+    def _lookup_rows(self, keys):
+        """[(abs_path, size, mtime_ns), ...] 중 저장소에 일치하는 항목 {key: (MediaInfo, 부분 해시)}."""
+        found = {}
+        paths = [key[0] for key in keys]
+        connection = self._connection()
+        for start in range(0, len(paths), 500):
+            batch = paths[start:start + 500]
+            rows = connection.execute(
+                "SELECT path, size, mtime_ns, partial_hash, version, info FROM probes "
+                f"WHERE path IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            for path, size, mtime_ns, file_hash, version, info in rows:
+                if version == PROBE_VERSION:
+                    found[(path, size, mtime_ns)] = (MediaInfo.from_dict(json.loads(info)), file_hash)
+        return {key: found[key] for key in keys if key in found}
+
+    def _lookup_hash(self, file_hash, size):
+        row = self._connection().execute(
+            "SELECT info FROM probes WHERE partial_hash = ? AND size = ? AND version = ? LIMIT 1",
+            (file_hash, size, PROBE_VERSION),
+        ).fetchone()
+        return MediaInfo.from_dict(json.loads(row[0])) if row else None
+
+    def probe(self, path, verify_hash=False):
+        """path의 MediaInfo (캐시 → 부분 해시 일치 항목 → ffmpeg 프로브 순)."""
+        return self.probe_many([path], verify_hash)[path]
+
+    def probe_many(self, paths, verify_hash=False, skip_errors=False):
+        """
+        여러 파일을 한 번의 SQLite 조회로 확인하고, 없는 파일만 ffmpeg로 프로브. {path: MediaInfo}
+
+        - 새로 프로브할 파일은 부분 해시를 먼저 계산해 같은 내용의 기존 항목(복사/이동된 파일)을 재사용
+        - verify_hash=True: (경로, 크기, 수정 시각)이 일치해도 부분 해시를 다시 계산해 확인
+        - skip_errors=True: 읽을 수 없는 파일은 경고만 출력하고 결과에서 뺀다
+        """
+        keys = {}
+        for path in paths:
+            try:
+                keys[path] = self._file_key(path)
+            except OSError as exc:
+                if not skip_errors:
+                    raise
+                print(f"   [PROBE] 파일을 읽을 수 없습니다: {path} ({exc})")
+
+        cached = {}
+        missing = []
+        with self._lock:
+            for path, key in keys.items():
+                entry = self._memory.get(key)
+                if entry is not None:
+                    cached[path] = entry
+                else:
+                    missing.append(path)
+        if missing:
+            stored = self._lookup_rows([keys[path] for path in missing])
+            with self._lock:
+                self._memory.update(stored)
+            for path in missing:
+                if keys[path] in stored:
+                    cached[path] = stored[keys[path]]
+
+        results = {}
+        for path, key in keys.items():
+            entry = cached.get(path)
+            file_hash = None
+            if entry is not None:
+                info, stored_hash = entry
+                if not verify_hash:
+                    results[path] = info
+                    self.hits += 1
+                    continue
+                file_hash = partial_hash(path)
+                if file_hash == stored_hash:
+                    results[path] = info
+                    self.hits += 1
+                    continue
+            try:
+                file_hash = file_hash or partial_hash(path)
+                info = self._lookup_hash(file_hash, key[1])
+                if info is None:
+                    self.probes += 1
+                    info = MediaInfo.from_ffmpeg_infos(ffmpeg_parse_infos(path))
+                else:
+                    self.hits += 1
+            except (IOError, OSError) as exc:
+                if not skip_errors:
+                    raise
+                print(f"   [PROBE] 미디어 정보를 읽을 수 없습니다: {path} ({exc})")
+                continue
+            self._store(key, info, file_hash)
+            results[path] = info
+        return results
+
+    def report(self, label="[PROBE]"):
+        print(f"{label} 미디어 프로브 캐시: 적중 {self.hits}, 새로 프로브 {self.probes}")
+
+
+_SHARED_CACHE = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_media_probe_cache(db_path=None):
+    """프로세스 공용 프로브 캐시 (db_path가 바뀌면 새로 염)."""
+    global _SHARED_CACHE
+    db_path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None or _SHARED_CACHE.db_path != db_path:
+            _SHARED_CACHE = MediaProbeCache(db_path)
+        return _SHARED_CACHE
+
+
+def probe_media(path, verify_hash=False):
+    return get_media_probe_cache().probe(path, verify_hash)
+
+
+def probe_media_many(paths, verify_hash=False, skip_errors=False):
+    return get_media_probe_cache().probe_many(paths, verify_hash, skip_errors)
+
+
+def media_duration(path):
+    """미디어 길이 (초)."""
+    return probe_media(path).duration
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python scripts/media_probe.py <파일 또는 폴더> ...")
+        sys.exit(1)
+    targets = []
+    for target in sys.argv[1:]:
+        if os.path.isdir(target):
+            targets.extend(os.path.join(target, name) for name in sorted(os.listdir(target))
+                           if os.path.isfile(os.path.join(target, name)))
+        else:
+            targets.append(target)
+    started = time.time()
+    for path, info in probe_media_many(targets, skip_errors=True).items():
+        print(f"{os.path.basename(path)}: {info}")
+    get_media_probe_cache().report()
+    print(f"{len(targets)}개 파일 {1000 * (time.time() - started):.1f}ms")
@@ -0,0 +1,103 @@
+"""메모리 PCM 오디오 유틸 (ffmpeg 파이프 디코딩, WAV 직렬화, pydub 연결, 배열 기반 moviepy 오디오 클립)"""
+
+import io
+import subprocess
+import wave
+
+import numpy as np
+from moviepy.audio.AudioClip import AudioArrayClip
+from moviepy.config import FFMPEG_BINARY
+
+
+# 나레이션 처리 샘플레이트 (AudioFileClip 기본값과 같음)
+PCM_SAMPLE_RATE = 44100
+
+
+def decode_audio(source, sample_rate=PCM_SAMPLE_RATE, channels=1):
+    """
+    오디오 파일 경로 또는 인코딩된 바이트(mp3 등)를 float32 PCM (samples, channels) 배열로 디코딩.
+
+    바이트는 ffmpeg stdin으로 넘기므로 디스크에 쓰지 않는다.
+    """
+    from_bytes = isinstance(source, (bytes, bytearray, memoryview))
+    command = [
+        FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0" if from_bytes else str(source),
+        "-vn", "-f", "f32le", "-acodec", "pcm_f32le",
+        "-ac", str(int(channels)), "-ar", str(int(sample_rate)), "pipe:1",
+    ]
+    result = subprocess.run(
+        command,
+        input=bytes(source) if from_bytes else None,
+        stdin=None if from_bytes else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"오디오 디코딩 실패: {message}")
+    samples = np.frombuffer(result.stdout, dtype=np.float32)
+    return samples[: len(samples) - len(samples) % int(channels)].reshape(-1, int(channels)).copy()
+
+
+def _as_2d(samples):
+    samples = np.asarray(samples, dtype=np.float32)
+    return samples.reshape(-1, 1) if samples.ndim == 1 else samples
+
+
+def to_int16(samples):
+    return (np.clip(_as_2d(samples), -1.0, 1.0) * 32767.0).round().astype(np.int16)
+
+
+def from_int16(data, channels):
+    return (np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0).reshape(-1, channels)
+
+
+def write_wav(target, samples, sample_rate=PCM_SAMPLE_RATE):
+    """16-bit PCM WAV로 저장 (target: 경로 또는 파일 객체)."""
+    pcm = to_int16(samples)
+    with wave.open(target, "wb") as handle:
+        handle.setnchannels(pcm.shape[1])
+        handle.setsampwidth(2)
+        handle.setframerate(int(sample_rate))
+        handle.writeframes(pcm.tobytes())
+
+
+def wav_bytes(samples, sample_rate=PCM_SAMPLE_RATE):
+    buffer = io.BytesIO()
+    write_wav(buffer, samples, sample_rate)
+    return buffer.getvalue()
+
+
+def read_wav(source):
+    """16-bit PCM WAV → (float32 (samples, channels), sample_rate)."""
+    with wave.open(source, "rb") as handle:
+        if handle.getsampwidth() != 2:
+            raise ValueError(f"16-bit PCM WAV만 지원합니다 (sample width {handle.getsampwidth()})")
+        channels = handle.getnchannels()
+        sample_rate = handle.getframerate()
+        data = handle.readframes(handle.getnframes())
+    return from_int16(data, channels), sample_rate
+
+
+def to_segment(samples, sample_rate=PCM_SAMPLE_RATE):
+    """PCM 배열 → pydub AudioSegment (16-bit, 메모리 안에서만 변환)."""
+    from pydub import AudioSegment
+
+    pcm = to_int16(samples)
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=int(sample_rate), channels=pcm.shape[1])
+
+
+def from_segment(segment):
+    """pydub AudioSegment → (float32 (samples, channels), sample_rate)."""
+    segment = segment.set_sample_width(2)
+    return from_int16(segment.raw_data, segment.channels), segment.frame_rate
+
+
+def array_clip(samples, sample_rate=PCM_SAMPLE_RATE, channels=2):
+    """PCM 배열을 moviepy AudioArrayClip으로 (모노는 channels 수만큼 복제)."""
+    samples = _as_2d(samples)
+    if samples.shape[1] == 1 and channels > 1:
+        samples = np.repeat(samples, channels, axis=1)
+    # AudioArrayClip은 end를 채우지 않으므로 with_start로 설정 (CompositeAudioClip 길이 계산용)
+    return AudioArrayClip(samples, fps=int(sample_rate)).with_start(0)
@@ -0,0 +1,270 @@
+"""자막 스프라이트 캐시 (텍스트/폰트/스타일 키 → premultiplied 스프라이트, 메모리 LRU + 디스크 저장)"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from layer_compositor import Sprite
+
+
+# 렌더링 결과가 바뀌는 코드 변경 시 올려서 기존 디스크 캐시를 무효화
+SPRITE_CACHE_VERSION = 1
+
+DEFAULT_MEMORY_MB = 64
+DEFAULT_DISK_MB = 256
+DEFAULT_WORKERS = 4
+
+
+def font_identity(font_path, font_index=0):
+    """폰트 파일 경로 + TTC 인덱스 + 파일 크기/수정 시각 (폰트 파일이 바뀌면 키도 바뀜)."""
+    if not font_path:
+        return ["<default>", 0, 0, 0]
+    try:
+        stat = os.stat(font_path)
+        return [os.path.abspath(font_path), int(font_index or 0), stat.st_size, int(stat.st_mtime)]
+    except OSError:
+        return [str(font_path), int(font_index or 0), 0, 0]
+
+
+def sprite_cache_key(**params):
+    """자막 렌더링 파라미터 전체를 정렬된 JSON으로 직렬화한 뒤 sha1 해시."""
+    payload = json.dumps(
+        {"version": SPRITE_CACHE_VERSION, **params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class SubtitleSpriteCache:
+    """
+    내용 주소(content-addressed) 자막 스프라이트 캐시.
+
+    - 메모리: 바이트 한도가 있는 LRU (OrderedDict)
+    - 디스크: <cache_dir>/<key[:2]>/<key>.npz, 읽을 때 mtime 갱신 → 오래된 파일부터 정리
+    - prerender(): 캐시에 없는 자막만 스레드 풀에서 미리 렌더링
+    """
+
+    def __init__(self, cache_dir=None, max_memory_bytes=DEFAULT_MEMORY_MB * 1024 * 1024,
+                 max_disk_bytes=DEFAULT_DISK_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = int(max_memory_bytes)
+        self.max_disk_bytes = int(max_disk_bytes)
+        self.current_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # ---- 메모리 ----
+
+    def _remember(self, key, sprite):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = sprite
+            self.current_bytes += sprite.nbytes
+            # 방금 넣은 항목 하나는 한도를 넘더라도 유지
+            while self.current_bytes > self.max_memory_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+    # ---- 디스크 ----
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npz")
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                sprite = Sprite(
+                    np.ascontiguousarray(data["pixels"], dtype=np.uint8),
+                    tuple(int(v) for v in data["offset"]),
+                    tuple(int(v) for v in data["size"]),
+                )
+            os.utime(path, None)
+            return sprite
+        except Exception as exc:
+            print(f"   [CACHE] 손상된 자막 캐시 파일 삭제: {path} ({exc})")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _save_to_disk(self, key, sprite):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as handle:
+                np.savez(
+                    handle,
+                    pixels=sprite.pixels,
+                    offset=np.asarray(sprite.offset, dtype=np.int32),
+                    size=np.asarray(sprite.size, dtype=np.int32),
+                )
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            print(f"   [CACHE] 자막 캐시 저장 실패: {exc}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def trim_disk(self):
+        """디스크 캐시가 max_disk_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 삭제."""
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return 0
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(".npz"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        removed = 0
+        if total > self.max_disk_bytes:
+            files.sort()
+            for _, size, path in files:
+                if total <= self.max_disk_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+        return removed
+
+    # ---- 조회/렌더링 ----
+
+    def get(self, key):
+        """메모리 → 디스크 순으로 조회 (없으면 None)."""
+        with self._lock:
+            sprite = self._entries.get(key)
+            if sprite is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return sprite
+        sprite = self._load_from_disk(key)
+        if sprite is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(key, sprite)
+        return sprite
+
+    def put(self, key, sprite):
+        self._remember(key, sprite)
+        self._save_to_disk(key, sprite)
+
+    def get_or_render(self, key, renderer):
+        sprite = self.get(key)
+        if sprite is None:
+            with self._lock:
+                self.misses += 1
+            sprite = renderer()
+            self.put(key, sprite)
+        return sprite
+
+    def prerender(self, jobs, max_workers=DEFAULT_WORKERS):
+        """
+        jobs: [(key, renderer), ...] — 캐시에 없는 키만 스레드 풀에서 렌더링.
+
+        같은 키는 한 번만 렌더링하며 {key: Sprite} 를 반환한다.
+        개별 렌더링 실패는 결과에서 빠지고 경고만 출력한다.
+        """
+        results = {}
+        pending = OrderedDict()
+        for key, renderer in jobs:
+            if key in results or key in pending:
+                continue
+            sprite = self.get(key)
+            if sprite is not None:
+                results[key] = sprite
+            else:
+                pending[key] = renderer
+
+        if pending:
+            with self._lock:
+                self.misses += len(pending)
+            workers = max(1, min(int(max_workers or 1), len(pending)))
+
+            def render(item):
+                key, renderer = item
+                sprite = renderer()
+                self.put(key, sprite)
+                return key, sprite
+
+            if workers == 1:
+                rendered = []
+                for item in pending.items():
+                    try:
+                        rendered.append(render(item))
+                    except Exception as exc:
+                        print(f"   [WARNING] 자막 스프라이트 렌더링 실패: {exc}")
+            else:
+                rendered = []
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(render, item) for item in pending.items()]
+                    for future in futures:
+                        try:
+                            rendered.append(future.result())
+                        except Exception as exc:
+                            print(f"   [WARNING] 자막 스프라이트 렌더링 실패: {exc}")
+            results.update(rendered)
+            self.trim_disk()
+        return results
+
+    def report(self, label="[CACHE]"):
+        print(
+            f"{label} 자막 스프라이트 캐시: 메모리 적중 {self.memory_hits}, 디스크 적중 {self.disk_hits}, "
+            f"렌더링 {self.misses}, 메모리 {self.current_bytes / (1024 * 1024):.1f}MB / "
+            f"{self.max_memory_bytes / (1024 * 1024):.0f}MB"
+        )
+
+
+_SHARED_CACHE = None
+
+
+def get_subtitle_sprite_cache(cache_dir=None, memory_mb=DEFAULT_MEMORY_MB, disk_mb=DEFAULT_DISK_MB):
+    """프로세스 공용 캐시 (같은 프로세스에서 여러 영상을 처리할 때 메모리 캐시를 재사용)."""
+    global _SHARED_CACHE
+    try:
+        max_memory = max(1.0, float(memory_mb)) * 1024 * 1024
+        max_disk = max(0.0, float(disk_mb)) * 1024 * 1024
+    except (TypeError, ValueError):
+        print(f"[WARNING] sprite_cache 한도 값이 올바르지 않아 기본값을 사용합니다: {memory_mb!r}, {disk_mb!r}")
+        max_memory = DEFAULT_MEMORY_MB * 1024 * 1024
+        max_disk = DEFAULT_DISK_MB * 1024 * 1024
+    if max_disk <= 0:
+        cache_dir = None  # disk_mb <= 0 이면 메모리 캐시만 사용
+    if _SHARED_CACHE is None or _SHARED_CACHE.cache_dir != cache_dir:
+        _SHARED_CACHE = SubtitleSpriteCache(cache_dir, max_memory, max_disk)
+    else:
+        _SHARED_CACHE.max_memory_bytes = int(max_memory)
+        _SHARED_CACHE.max_disk_bytes = int(max_disk)
+    return _SHARED_CACHE
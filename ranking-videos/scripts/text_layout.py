@@ -0,0 +1,204 @@
+"""증분 텍스트 레이아웃 (글리프/커닝 폭 캐시 + 누적 폭 기반 줄바꿈 + 이진 탐색 폰트 크기)"""
+
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+# 추정 폭이 한도에서 이 값(px) 이내면 textbbox로 정확히 다시 측정
+ESTIMATE_MARGIN = 2.0
+MAX_MEASURERS = 256
+MAX_CACHED_TEXTS = 4096
+
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+class _Run:
+    """문자열 하나의 누적 폭 상태 (advance 합, 마지막 글자 시작 위치, 첫/마지막 글자)."""
+
+    __slots__ = ("advance", "last_start", "first", "last")
+
+    def __init__(self, advance, last_start, first, last):
+        self.advance = advance
+        self.last_start = last_start
+        self.first = first
+        self.last = last
+
+
+_EMPTY_RUN = _Run(0.0, 0.0, "", "")
+
+
+class TextMeasurer:
+    """
+    (폰트, 외곽선 두께)별 텍스트 측정기.
+
+    - 글자별 advance / 잉크 범위와 글자쌍 커닝을 한 번만 측정해 캐시
+    - 줄 폭은 누적 advance로 추정하고, 한도와 가까울 때만 textbbox로 정확히 측정
+      → 판정 결과는 매번 textbbox를 호출하던 기존 줄바꿈과 동일
+    """
+
+    def __init__(self, font, stroke_width=0):
+        self.font = font
+        self.stroke_width = int(stroke_width or 0)
+        self._glyphs = {}
+        self._kerning = {}
+        self._runs = {}
+        self._bboxes = {}
+        self.estimates = 0
+        self.exact = 0
+        # raqm 레이아웃은 합자/셰이핑으로 글자 단위 합과 더 크게 어긋날 수 있음
+        self.margin = ESTIMATE_MARGIN
+        if getattr(font, "layout_engine", None) == ImageFont.Layout.RAQM:
+            self.margin += getattr(font, "size", 0) * 0.25
+        self._supports_estimate = isinstance(font, ImageFont.FreeTypeFont)
+
+    # ---- 정확한 측정 (ImageDraw.textbbox와 같은 값) ----
+
+    def bbox(self, text):
+        cached = self._bboxes.get(text)
+        if cached is None:
+            self.exact += 1
+            cached = _MEASURE_DRAW.textbbox((0, 0), text, font=self.font, stroke_width=self.stroke_width)
+            if len(self._bboxes) >= MAX_CACHED_TEXTS:
+                self._bboxes.clear()
+            self._bboxes[text] = cached
+        return cached
+
+    def width(self, text):
+        bbox = self.bbox(text)
+        return bbox[2] - bbox[0]
+
+    # ---- 누적 폭 추정 ----
+
+    def _glyph(self, ch):
+        glyph = self._glyphs.get(ch)
+        if glyph is None:
+            ink = self.font.getbbox(ch)
+            glyph = (self.font.getlength(ch), ink[0], ink[2])
+            self._glyphs[ch] = glyph
+        return glyph
+
+    def _kern(self, left, right):
+        if not left or not right:
+            return 0.0
+        pair = left + right
+        kern = self._kerning.get(pair)
+        if kern is None:
+            kern = self.font.getlength(pair) - self._glyph(left)[0] - self._glyph(right)[0]
+            self._kerning[pair] = kern
+        return kern
+
+    def run(self, text):
+        """토큰 하나의 누적 상태 (토큰 단위로 캐시)."""
+        if not text:
+            return _EMPTY_RUN
+        cached = self._runs.get(text)
+        if cached is None:
+            advance = 0.0
+            last_start = 0.0
+            previous = ""
+            for ch in text:
+                advance += self._kern(previous, ch)
+                last_start = advance
+                advance += self._glyph(ch)[0]
+                previous = ch
+            cached = _Run(advance, last_start, text[0], text[-1])
+            if len(self._runs) >= MAX_CACHED_TEXTS:
+                self._runs.clear()
+            self._runs[text] = cached
+        return cached
+
+    def join(self, left, right):
+        """두 문자열 상태를 이어 붙인 상태 (경계 커닝 포함)."""
+        if not left.first:
+            return right
+        if not right.first:
+            return left
+        offset = left.advance + self._kern(left.last, right.first)
+        return _Run(offset + right.advance, offset + right.last_start, left.first, right.last)
+
+    def fits(self, text, state, max_value, edge="width"):
+        """
+        text의 textbbox 폭(edge="width") 또는 오른쪽 끝(edge="right")이 max_value 이하인지.
+
+        state는 text에 대한 run()/join() 결과.
+        """
+        if (not self._supports_estimate or not text or "\n" in text
+                or text[0].isspace() or text[-1].isspace()):
+            return self._exact_value(text, edge) <= max_value
+        x0 = self._glyph(state.first)[1] - self.stroke_width
+        x1 = state.last_start + self._glyph(state.last)[2] + self.stroke_width
+        estimate = x1 - x0 if edge == "width" else x1
+        if abs(estimate - max_value) <= self.margin:
+            return self._exact_value(text, edge) <= max_value
+        self.estimates += 1
+        return estimate <= max_value
+
+    def _exact_value(self, text, edge):
+        bbox = self.bbox(text)
+        return bbox[2] - bbox[0] if edge == "width" else bbox[2]
+
+
+_MEASURERS = OrderedDict()
+
+
+def get_measurer(font, stroke_width=0):
+    """폰트 객체 + 외곽선 두께별 공용 측정기 (폰트 레지스트리의 캐시된 폰트와 함께 사용)."""
+    key = (id(font), int(stroke_width or 0))
+    entry = _MEASURERS.get(key)
+    if entry is not None and entry.font is font:
+        _MEASURERS.move_to_end(key)
+        return entry
+    entry = TextMeasurer(font, stroke_width)
+    _MEASURERS[key] = entry
+    while len(_MEASURERS) > MAX_MEASURERS:
+        _MEASURERS.popitem(last=False)
+    return entry
+
+
+def wrap_tokens(tokens, measurer, max_value, joiner=" ", edge="width"):
+    """
+    탐욕적 줄바꿈: 후보 줄(현재 줄 + joiner + 토큰)이 맞으면 이어 붙이고, 아니면 새 줄 시작.
+
+    후보 줄 폭은 누적 상태에 토큰 하나만 더해 계산하므로 줄 길이에 비례한 재측정이 없다.
+    반환값은 줄 문자열 목록 (빈 줄은 포함하지 않음).
+    """
+    lines = []
+    line = ""
+    line_state = _EMPTY_RUN
+    joiner_state = measurer.run(joiner)
+    for token in tokens:
+        token_state = measurer.run(token)
+        if line:
+            candidate = line + joiner + token
+            candidate_state = measurer.join(measurer.join(line_state, joiner_state), token_state)
+        else:
+            candidate = token
+            candidate_state = token_state
+        if measurer.fits(candidate, candidate_state, max_value, edge):
+            line = candidate
+            line_state = candidate_state
+        else:
+            if line:
+                lines.append(line)
+            line = token
+            line_state = token_state
+    if line:
+        lines.append(line)
+    return lines
+
+
+def search_font_size(sizes, fits):
+    """
+    큰 것부터 정렬된 후보 크기 목록에서 fits(size)가 처음 참이 되는 인덱스 (없으면 len(sizes)).
+
+    텍스트 폭은 폰트 크기에 대해 단조 증가하므로 선형 감소 대신 이진 탐색으로 찾는다.
+    """
+    low, high = 0, len(sizes)
+    while low < high:
+        middle = (low + high) // 2
+        if fits(sizes[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return low
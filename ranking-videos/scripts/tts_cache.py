@@ -0,0 +1,211 @@
+"""TTS 결과 캐시 (텍스트/모델/보이스/속도/음성 프로필/후처리 배속 해시 → 최종 가공 음성 파일, 디스크 LRU)"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from collections import OrderedDict
+
+
+# 음성 후처리 결과가 바뀌는 코드 변경 시 올려서 기존 캐시를 무효화
+TTS_CACHE_VERSION = 3
+
+# ranking-videos/Temp/tts_cache (실행 위치와 무관하게 두 앱이 같은 저장소 공유)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Temp", "tts_cache")
+DEFAULT_MAX_MB = 512
+
+
+def tts_cache_key(text, provider, model, voice, speed=1.0, profile=None, post_speedup=1.0, audio_format="mp3",
+                  **extra):
+    """
+    음성 결과를 결정하는 입력 전체를 정렬된 JSON으로 직렬화한 뒤 sha1 해시.
+
+    profile: 적용된 음성 프로필 파라미터 dict (후처리가 없으면 None)
+    post_speedup: 프로필 후처리 뒤에 추가로 적용한 배속 (없으면 1.0)
+    """
+    payload = json.dumps(
+        {
+            "version": TTS_CACHE_VERSION,
+            "text": text,
+            "provider": provider,
+            "model": model,
+            "voice": voice,
+            "speed": float(speed),
+            "profile": profile,
+            "post_speedup": float(post_speedup),
+            "format": audio_format,
+            **extra,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    내용 주소(content-addressed) TTS 결과 캐시.
+
+    - 디스크: <cache_dir>/<key[:2]>/<key>.<ext>, 적중 시 mtime 갱신
+    - 색인: 처음 사용할 때 한 번 디렉터리를 훑어 (mtime 순) LRU 색인을 만들고 이후에는 갱신만 함
+    - 저장 후 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 삭제
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = int(max_bytes)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index = None
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{ext}")
+
+    def _load_index(self):
+        """{path: size} 를 오래 사용하지 않은 순서로 (호출자가 _lock 보유)."""
+        if self._index is not None:
+            return self._index
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        files.sort()
+        self._index = OrderedDict((path, size) for _, path, size in files)
+        self.current_bytes = sum(self._index.values())
+        return self._index
+
+    def _trim(self, keep):
+        """한도를 넘으면 오래된 파일부터 삭제 (방금 저장한 keep 하나는 유지, 호출자가 _lock 보유)."""
+        index = self._load_index()
+        while self.current_bytes > self.max_bytes and len(index) > 1:
+            path, size = next(iter(index.items()))
+            if path == keep:
+                index.move_to_end(path)
+                continue
+            index.pop(path)
+            self.current_bytes -= size
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+
+    def lookup(self, key, ext="mp3"):
+        """캐시된 파일 경로 (없으면 None). 적중하면 LRU 순서와 mtime을 갱신."""
+        path = self._path(key, ext)
+        with self._lock:
+            index = self._load_index()
+            if not os.path.exists(path):
+                # 다른 프로세스가 지운 파일은 색인에서도 뺌
+                if path in index:
+                    self.current_bytes -= index.pop(path)
+                self.misses += 1
+                return None
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            if path not in index:
+                # 다른 프로세스가 저장한 파일
+                try:
+                    index[path] = os.path.getsize(path)
+                    self.current_bytes += index[path]
+                except OSError:
+                    pass
+            if path in index:
+                index.move_to_end(path)
+            self.hits += 1
+        return path
+
+    def fetch(self, key, output_path, ext="mp3"):
+        """캐시 항목을 output_path로 복사. 적중하면 True."""
+        path = self.lookup(key, ext)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, output_path)
+        except OSError as exc:
+            print(f"   [TTS-CACHE] 캐시 파일 복사 실패: {path} ({exc})")
+            return False
+        return True
+
+    def store(self, key, source_path, ext="mp3"):
+        """source_path의 최종 가공 음성을 캐시에 저장 (임시 파일에 쓴 뒤 교체)."""
+        return self._commit(key, ext, lambda tmp_path: shutil.copyfile(source_path, tmp_path))
+
+    def store_bytes(self, key, data, ext="wav"):
+        """메모리에 있는 최종 음성 바이트를 그대로 캐시에 저장."""
+        def write(tmp_path):
+            with open(tmp_path, "wb") as handle:
+                handle.write(data)
+        return self._commit(key, ext, write)
+
+    def _commit(self, key, ext, writer):
+        path = self._path(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as exc:
+            print(f"   [TTS-CACHE] 캐시 저장 실패: {exc}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+        with self._lock:
+            index = self._load_index()
+            self.current_bytes += size - index.pop(path, 0)
+            index[path] = size
+            self._trim(keep=path)
+        return path
+
+    def report(self, label="[TTS-CACHE]"):
+        print(
+            f"{label} TTS 캐시: 적중 {self.hits}, 새로 합성 {self.misses}, 삭제 {self.evictions}, "
+            f"{self.current_bytes / (1024 * 1024):.1f}MB / {self.max_bytes / (1024 * 1024):.0f}MB"
+        )
+
+
+_SHARED_CACHE = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_tts_cache(cache_dir=None, max_mb=DEFAULT_MAX_MB):
+    """프로세스 공용 TTS 캐시 (cache_dir/한도가 바뀌면 새로 만듦)."""
+    global _SHARED_CACHE
+    cache_dir = os.path.abspath(cache_dir or DEFAULT_CACHE_DIR)
+    try:
+        max_bytes = int(max(1.0, float(max_mb)) * 1024 * 1024)
+    except (TypeError, ValueError):
+        print(f"[WARNING] tts_cache.max_mb 값이 올바르지 않아 기본값을 사용합니다: {max_mb!r}")
+        max_bytes = DEFAULT_MAX_MB * 1024 * 1024
+    with _SHARED_LOCK:
+        if (_SHARED_CACHE is None or _SHARED_CACHE.cache_dir != cache_dir
+                or _SHARED_CACHE.max_bytes != max_bytes):
+            _SHARED_CACHE = TTSCache(cache_dir, max_bytes)
+        return _SHARED_CACHE
+
+
+if __name__ == "__main__":
+    cache = get_tts_cache(sys.argv[1] if len(sys.argv) > 1 else None)
+    with cache._lock:
+        entries = len(cache._load_index())
+    print(f"{cache.cache_dir}: {entries}개 항목")
+    cache.report()
@@ -0,0 +1,373 @@
+"""프레임 필터 체인 엔진 (시네마틱/샤픈/색수차를 프레임당 1회 패스로 처리)"""
+
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+
+# config에 filter_chain이 없을 때 사용하는 기본 체인 (기존 voice_overlay 순서와 동일)
+DEFAULT_FILTER_CHAIN = ("cinematic", "sharpen", "chromatic")
+
+# 필터별 기본 파라미터 (기존 apply_* 함수의 하드코딩 값)
+FILTER_DEFAULTS = {
+    "cinematic": {
+        "vignette_power": 1.8,
+        "vignette_strength": 0.85,
+        "vignette_min": 0.15,
+        "desaturation": 0.15,
+    },
+    "sharpen": {
+        # (radius, percent, threshold) - 캡컷 sharpen=15 → sharpen=29 2단계
+        "passes": [[2, 150, 3], [2, 290, 2]],
+    },
+    "chromatic": {
+        "speed": 0.33,
+        "lateral_offset": 0.75,
+    },
+}
+
+
+def _build_vignette(h, w, power, strength, minimum):
+    """(h, w, 1) 비네트 배율 맵 생성 (채널 축은 브로드캐스트)."""
+    Y, X = np.ogrid[:h, :w]
+    center_y, center_x = h / 2, w / 2
+    dist_from_center = np.sqrt((X - center_x) ** 2 + (Y - center_y) ** 2)
+    max_dist = np.sqrt(center_x ** 2 + center_y ** 2)
+    vignette = 1 - ((dist_from_center / max_dist) ** power) * strength
+    vignette = np.clip(vignette, minimum, 1.0)
+    return vignette[..., np.newaxis]
+
+
+# 사전 계산 자산 캐시 기본 한도 (해상도가 여러 개 섞여도 메모리가 무한히 늘지 않도록)
+DEFAULT_ASSET_CACHE_MB = 256
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+class FrameAssetCache:
+    """
+    프레임 크기 + 효과 파라미터로 키잉된 사전 계산 자산 캐시.
+
+    비네트 배율 맵, 리맵 기본 그리드, 그레인 텍스처, 작업 버퍼 등을 보관하며
+    총 바이트 수가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거한다.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key, builder):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = builder()
+        size = _nbytes(value)
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+        # 방금 만든 항목 하나는 한도를 넘더라도 유지
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+        return value
+
+    def set_limit(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+
+ASSET_CACHE = FrameAssetCache(DEFAULT_ASSET_CACHE_MB * 1024 * 1024)
+
+
+def set_asset_cache_limit(max_mb):
+    """video_settings.effect_cache_mb 값으로 캐시 한도 조정."""
+    try:
+        ASSET_CACHE.set_limit(max(1.0, float(max_mb)) * 1024 * 1024)
+    except (TypeError, ValueError):
+        print(f"[WARNING] effect_cache_mb 값이 올바르지 않아 기본값을 사용합니다: {max_mb!r}")
+
+
+def get_vignette(h, w, power, strength, minimum):
+    """(h, w, 1) 비네트 배율 맵 (프레임 곱셈 한 번으로 적용)."""
+    key = ("vignette", h, w, float(power), float(strength), float(minimum))
+    return ASSET_CACHE.get(key, lambda: _build_vignette(h, w, float(power), float(strength), float(minimum)))
+
+
+def get_remap_grid(h, w):
+    """cv2.remap용 기본 좌표 그리드 (map_x, map_y, float32)."""
+    def build():
+        Y, X = np.meshgrid(np.arange(h), np.arange(w), indexing="ij")
+        return X.astype(np.float32), Y.astype(np.float32)
+
+    return ASSET_CACHE.get(("remap_grid", h, w), build)
+
+
+def get_scratch(name, shape, dtype):
+    """프레임마다 재사용하는 작업 버퍼 (호출 간 내용은 보장하지 않음)."""
+    shape = tuple(shape)
+    dtype = np.dtype(dtype)
+    return ASSET_CACHE.get(("scratch", name, shape, dtype.str), lambda: np.empty(shape, dtype=dtype))
+
+
+def get_grain_pool(shape, low, high, count=4, margin=32):
+    """
+    필름 그레인 텍스처 풀 (프레임보다 margin만큼 큰 int8 노이즈 count장).
+
+    매 프레임 난수를 새로 만들지 않고 풀에서 한 장을 골라 임의 위치를 잘라 쓴다.
+    """
+    h, w = shape[:2]
+    channels = shape[2] if len(shape) > 2 else 1
+
+    def build():
+        rng = np.random.default_rng()
+        return tuple(
+            rng.integers(low, high, (h + margin, w + margin, channels), dtype=np.int8)
+            for _ in range(count)
+        )
+
+    return ASSET_CACHE.get(("grain", h, w, channels, int(low), int(high), count, margin), build)
+
+
+def sample_grain(shape, low, high):
+    """풀에서 프레임 크기의 그레인 텍스처 하나를 (뷰로) 반환."""
+    pool = get_grain_pool(shape, low, high)
+    h, w = shape[:2]
+    texture = pool[np.random.randint(len(pool))]
+    dy = np.random.randint(texture.shape[0] - h + 1)
+    dx = np.random.randint(texture.shape[1] - w + 1)
+    grain = texture[dy:dy + h, dx:dx + w]
+    return grain if len(shape) > 2 else grain[..., 0]
+
+
+def _copy_shifted_columns(src, shift, out):
+    """out[:, x] = src[:, x - shift] (정수 이동, 가장자리 복제)."""
+    w = src.shape[1]
+    if shift >= w:
+        out[...] = src[:, :1]
+    elif shift <= -w:
+        out[...] = src[:, -1:]
+    elif shift > 0:
+        out[:, shift:] = src[:, :w - shift]
+        out[:, :shift] = src[:, :1]
+    elif shift < 0:
+        out[:, :w + shift] = src[:, -shift:]
+        out[:, w + shift:] = src[:, -1:]
+    else:
+        out[...] = src
+
+
+class FrameFilterChain:
+    """
+    활성화된 필터를 하나의 프레임 함수로 묶은 체인.
+
+    - clip.transform(chain) 형태로 사용 (get_frame, t 시그니처)
+    - 프레임 크기별로 비네트 맵과 작업 버퍼를 한 번만 할당해서 재사용
+    - 반환되는 프레임은 다음 호출 전까지만 유효 (내부 버퍼 재사용)
+    - 처리 프레임 수/시간을 누적하여 report()로 fps 출력
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)  # [(name, params), ...]
+        self._shape = None
+        self._vignette = None
+        self._work = None
+        self._gray = None
+        self._plane_a = None
+        self._plane_b = None
+        self._outputs = None
+        self.frame_count = 0
+        self.elapsed = 0.0
+
+    def __bool__(self):
+        return bool(self.steps)
+
+    def describe(self):
+        return " → ".join(name for name, _ in self.steps) or "(없음)"
+
+    def _prepare(self, shape):
+        h, w = shape[:2]
+        self._shape = shape
+        self._vignette = None
+        for name, params in self.steps:
+            if name == "cinematic":
+                self._vignette = get_vignette(
+                    h, w,
+                    float(params["vignette_power"]),
+                    float(params["vignette_strength"]),
+                    float(params["vignette_min"]),
+                )
+        # 시네마틱 단계는 기존 필터와 같은 절삭 결과를 내도록 float64로 계산
+        self._work = np.empty((h, w, 3), dtype=np.float64)
+        self._gray = np.empty((h, w, 1), dtype=np.float64)
+        self._plane_a = np.empty((h, w), dtype=np.float32)
+        self._plane_b = np.empty((h, w), dtype=np.float32)
+        # 단계 간 입력/출력이 겹치지 않도록 2개 버퍼를 번갈아 사용
+        self._outputs = (np.empty((h, w, 3), dtype=np.uint8), np.empty((h, w, 3), dtype=np.uint8))
+
+    def _cinematic(self, src, dst, t, params):
+        work = self._work
+        np.multiply(src, self._vignette, out=work)
+        np.trunc(work, out=work)  # 기존 (frame * vignette).astype('uint8') 와 동일한 절삭
+        np.mean(work, axis=-1, keepdims=True, out=self._gray)
+        desaturation = float(params["desaturation"])
+        work *= 1.0 - desaturation
+        self._gray *= desaturation
+        work += self._gray
+        np.copyto(dst, work, casting="unsafe")
+
+    def _sharpen(self, src, dst, t, params):
+        pil_image = Image.fromarray(src)
+        for radius, percent, threshold in params["passes"]:
+            pil_image = pil_image.filter(
+                ImageFilter.UnsharpMask(radius=radius, percent=int(percent), threshold=int(threshold))
+            )
+        dst[...] = np.asarray(pil_image)
+
+    def _chromatic(self, src, dst, t, params):
+        offset = float(params["lateral_offset"]) * np.sin(2 * np.pi * float(params["speed"]) * t)
+        dst[..., 1] = src[..., 1]
+        # 채널 2는 +offset, 채널 0은 -offset 만큼 선형 보간 이동 (warpAffine 과 동일한 방향)
+        for channel, shift in ((2, offset), (0, -offset)):
+            whole = int(np.floor(shift))
+            frac = float(shift - whole)
+            plane = src[..., channel]
+            _copy_shifted_columns(plane, whole, self._plane_a)
+            if frac > 1e-6:
+                _copy_shifted_columns(plane, whole + 1, self._plane_b)
+                self._plane_b -= self._plane_a
+                self._plane_b *= frac
+                self._plane_a += self._plane_b
+            self._plane_a += 0.5
+            np.copyto(dst[..., channel], self._plane_a, casting="unsafe")
+
+    def __call__(self, get_frame, t):
+        frame = get_frame(t)
+        if not self.steps:
+            return frame
+
+        started = time.perf_counter()
+        if frame.dtype != np.uint8:
+            frame = np.clip(frame, 0, 255).astype(np.uint8)
+        if frame.ndim == 3 and frame.shape[2] > 3:
+            frame = frame[..., :3]
+        if self._shape != frame.shape:
+            self._prepare(frame.shape)
+
+        current = frame
+        for index, (name, params) in enumerate(self.steps):
+            target = self._outputs[index % 2]
+            getattr(self, f"_{name}")(current, target, t, params)
+            current = target
+
+        self.elapsed += time.perf_counter() - started
+        self.frame_count += 1
+        return current
+
+    def fps(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.frame_count / self.elapsed
+
+    def report(self, label="[FILTER]"):
+        if not self.frame_count:
+            return
+        print(
+            f"{label} 필터 체인 처리: {self.frame_count}프레임, "
+            f"{self.elapsed:.2f}초 ({self.fps():.1f} fps, {self.describe()})"
+        )
+
+
+def build_filter_chain(chain_config=None):
+    """
+    config의 video_settings.filter_chain 값으로 FrameFilterChain 생성.
+
+    각 항목은 필터 이름 문자열 또는 {"name": ..., 파라미터...} 딕셔너리.
+    None이면 DEFAULT_FILTER_CHAIN 을 사용.
+    """
+    if chain_config is None:
+        chain_config = DEFAULT_FILTER_CHAIN
+
+    steps = []
+    for entry in chain_config:
+        if isinstance(entry, str):
+            name, overrides = entry, {}
+        elif isinstance(entry, dict):
+            name = entry.get("name")
+            overrides = {k: v for k, v in entry.items() if k != "name"}
+        else:
+            print(f"[WARNING] 필터 체인 항목 형식이 올바르지 않아 건너뜁니다: {entry!r}")
+            continue
+
+        name = str(name or "").strip().lower()
+        if name not in FILTER_DEFAULTS:
+            print(f"[WARNING] 알 수 없는 필터 '{name}'를 건너뜁니다 (지원: {', '.join(FILTER_DEFAULTS)})")
+            continue
+        if overrides.get("enabled") is False:
+            continue
+        overrides.pop("enabled", None)
+
+        params = dict(FILTER_DEFAULTS[name])
+        params.update(overrides)
+        steps.append((name, params))
+
+    return FrameFilterChain(steps)
+
+
+def benchmark_filter_chain(video_path, seconds=5.0, chain_config=None):
+    """고정 클립 구간에서 기존 3단계 필터와 통합 체인의 fps를 비교 출력."""
+    from moviepy import VideoFileClip
+    import voice_overlay
+
+    source = VideoFileClip(video_path, audio=False)
+    try:
+        duration = min(float(seconds), source.duration or 0.0)
+        clip = source.subclipped(0, duration)
+
+        legacy = clip.image_transform(voice_overlay.apply_cinematic_filter)
+        legacy = legacy.image_transform(voice_overlay.apply_sharpen_filter)
+        legacy = legacy.transform(voice_overlay.apply_chromatic_aberration)
+
+        chain = build_filter_chain(chain_config)
+        fused = clip.transform(chain)
+
+        results = {}
+        for label, target in (("legacy", legacy), ("fused", fused)):
+            started = time.perf_counter()
+            frames = sum(1 for _ in target.iter_frames(dtype="uint8"))
+            elapsed = time.perf_counter() - started
+            results[label] = frames / elapsed if elapsed > 0 else 0.0
+            print(f"[BENCH] {label}: {frames}프레임 {elapsed:.2f}초 ({results[label]:.1f} fps)")
+
+        if results.get("legacy"):
+            print(f"[BENCH] 속도 향상: {results['fused'] / results['legacy']:.2f}x")
+        return results
+    finally:
+        source.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python scripts/video_filters.py <비디오 경로> [초]")
+        sys.exit(1)
+    benchmark_filter_chain(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else 5.0)
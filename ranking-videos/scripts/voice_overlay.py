@@ -4,28 +4,21 @@
 import os
 os.environ["GOOGLE_API_USE_CLIENT_CERTIFICATE"] = "false"
 
-from moviepy import VideoFileClip, AudioFileClip, CompositeAudioClip, TextClip, CompositeVideoClip, ImageClip, ColorClip, concatenate_videoclips
-from moviepy.video.VideoClip import VideoClip
-from moviepy.audio.fx import MultiplyVolume, AudioLoop
+from moviepy import VideoFileClip, TextClip, ImageClip
 from moviepy.video.fx import MultiplyColor, FadeOut, Resize
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageColor
 import time
+import math
 import zipfile
 import shutil
 import unicodedata
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 
-try:
-    from pydub import AudioSegment
-    from pydub.effects import speedup, compress_dynamic_range
-    PYDUB_IMPORT_ERROR = None
-except ModuleNotFoundError as exc:  # Python 3.13 requires optional pyaudioop
-    AudioSegment = None
-    speedup = None
-    compress_dynamic_range = None
-    PYDUB_IMPORT_ERROR = exc
 import re
 import os
 import json
@@ -49,6 +42,25 @@ except ImportError:
         SubtitleGenerator = None
         AUTO_SUBTITLE_AVAILABLE = False
 
+from video_filters import build_filter_chain, get_vignette, get_remap_grid, get_scratch, set_asset_cache_limit
+from ffmpeg_render import FFmpegRenderJob, resolve_render_backend
+from layer_compositor import LayerCompositor, Sprite, SpriteClip, scaled_size
+from font_registry import fallback_chain, get_font
+from text_layout import get_measurer, wrap_tokens
+from subtitle_cache import font_identity, get_subtitle_sprite_cache, sprite_cache_key
+from media_analysis import get_media_analysis
+from media_probe import probe_media
+from chromakey import DEFAULT_CACHE_MB as DEFAULT_CHROMAKEY_CACHE_MB, ChromakeyEngine, load_prekeyed_reaction
+from tts_cache import DEFAULT_MAX_MB as DEFAULT_TTS_CACHE_MB, get_tts_cache, tts_cache_key
+from audio_dsp import compress_dynamic_range, pitch_shift as pitch_shift_pcm, time_stretch
+from config_snapshot import get_config_snapshot
+from asset_library import AUDIO_EXTENSIONS, get_asset_library
+from audio_mix import AudioMix, apply_ducking, encode_audio
+from batch_runner import default_ffmpeg_threads, run_batch
+from job_store import get_job_store
+from pcm_audio import (
+    PCM_SAMPLE_RATE as NARRATION_SAMPLE_RATE, decode_audio, read_wav, wav_bytes,
+)
 
 
 # 폰트 설정 캐시 (TTC 인덱스)
@@ -67,20 +79,15 @@ def get_textclip_font_name(font_path):
 
 
 def load_pil_font(font_path, font_size):
-    """등록된 TTC 인덱스를 고려하여 PIL 폰트를 로드."""
+    """등록된 TTC 인덱스를 고려하여 PIL 폰트를 로드 (폰트 레지스트리 캐시 사용)."""
     if not font_path:
         return ImageFont.load_default()
     index = FONT_INDEX_OVERRIDES.get(font_path, 0)
     try:
-        return ImageFont.truetype(font_path, font_size, index=index)
+        return get_font(font_path, font_size, index, fallback=False)
     except OSError:
         # 인덱스 문제 등으로 실패하면 기본 인덱스로 다시 시도
-        if index:
-            try:
-                return ImageFont.truetype(font_path, font_size)
-            except OSError:
-                pass
-        return ImageFont.load_default()
+        return get_font(font_path, font_size, 0) if index else ImageFont.load_default()
 
 
 # 지원하는 비디오 확장자 목록
@@ -135,146 +142,88 @@ def extract_tag_from_filename(filename):
     return tag
 
 
-def _extract_videos_from_archives(input_dir):
-    """
-    입력 폴더 내 ZIP 파일에서 비디오를 추출해 Temp/extracted_videos 에 저장.
-
-    Returns:
-        (list[str], str, dict, dict): 추출된 비디오 경로 목록, 추출 루트 디렉터리, source_map, folder_map
-    """
-    extracted_videos = []
-    source_map = {}
-    folder_map = {}  # 비디오 경로 -> ZIP 내부 폴더 이름
-    temp_root = get_config_value(["paths", "temp_dir"], "Temp")
-    extract_root = os.path.join(temp_root, "extracted_videos")
-    os.makedirs(extract_root, exist_ok=True)
-
-    used_root = os.path.abspath(os.path.join(input_dir, "Used"))
-
-    for root, dirs, files in os.walk(input_dir):
-        # Used 폴더는 스킵
-        dirs[:] = [
-            d for d in dirs
-            if not os.path.abspath(os.path.join(root, d)).startswith(used_root)
-        ]
-        for filename in files:
-            if os.path.splitext(filename)[1].lower() != ".zip":
-                continue
+def _job_store():
+    """입력 작업 저장소 (batch_settings.job_store_path, 없으면 paths.temp_dir/jobs.sqlite)."""
+    return get_job_store(CONFIG.batch.job_store_path or os.path.join(CONFIG.paths.temp_dir, "jobs.sqlite"))
 
-            zip_path = os.path.join(root, filename)
-            archive_name = os.path.splitext(os.path.basename(zip_path))[0]
-            target_dir = os.path.join(extract_root, archive_name)
-
-            if os.path.exists(target_dir):
-                try:
-                    shutil.rmtree(target_dir)
-                except (OSError, PermissionError) as e:
-                    # Windows에서 파일이 사용 중일 수 있음 - 무시하고 계속 진행
-                    print(f"[WARNING] 기존 디렉토리 삭제 실패 (무시): {e}")
-            os.makedirs(target_dir, exist_ok=True)
-
-            try:
-                with zipfile.ZipFile(zip_path, "r") as archive:
-                    extracted_count = 0
-                    for member in archive.namelist():
-                        if member.endswith("/"):
-                            continue
-
-                        ext = os.path.splitext(member)[1].lower()
-                        if ext not in SUPPORTED_VIDEO_EXTENSIONS:
-                            continue
-
-                        try:
-                            extracted_path = _safe_extract_zip_member(archive, member, target_dir)
-                            extracted_videos.append(extracted_path)
-                            source_map[extracted_path] = zip_path
-
-                            # ZIP 내부 폴더 이름 추출 (첫 번째 폴더)
-                            member_parts = member.split('/')
-                            if len(member_parts) > 1:
-                                folder_name = member_parts[0]
-                            else:
-                                folder_name = archive_name
-                            folder_map[extracted_path] = folder_name
-
-                            extracted_count += 1
-                        except RuntimeError as exc:
-                            print(f"[WARNING]  ZIP 추출을 건너뜁니다 ({exc})")
-
-                if extracted_count:
-                    print(f"[ZIP] ZIP에서 비디오 {extracted_count}개 추출: {zip_path}")
-                else:
-                    print(f"[WARNING]  ZIP에서 비디오를 찾지 못했습니다: {zip_path}")
-            except zipfile.BadZipFile as exc:
-                print(f"[ERROR] ZIP 파일을 열 수 없습니다: {zip_path} ({exc})")
-
-    return extracted_videos, extract_root, source_map, folder_map
 
+def _discover_inputs(store, input_dir):
+    """
+    Input 폴더를 작업 저장소에 색인 (바뀐 원본만 해시, ZIP은 압축을 풀지 않음).
 
-def find_first_video_file(input_dir):
-    """주어진 디렉터리와 하위 폴더에서 이름순으로 가장 빠른 비디오 파일을 반환"""
-    # 모든 비디오 파일을 재귀적으로 검색
-    all_videos = []
-    seen = set()
+    이번에 중복으로 판정된 입력은 예전과 같이 Used 폴더로 옮긴다.
+    """
+    result = store.discover(input_dir, SUPPORTED_VIDEO_EXTENSIONS, tag_for=extract_tag_from_filename)
+    for duplicate in result["duplicates"]:
+        print(f"\n[SKIP] 이미 처리된 비디오입니다 (중복): {duplicate.name}")
+        if not store.pending_for_origin(duplicate.origin):
+            move_input_file_to_used(duplicate.origin)
+    if result["new"]:
+        print(f"[FOLDER] 새로 색인한 입력: {result['new']}개 (변경 없음 {result['unchanged']}개)")
+    return result
 
-    extracted_videos, extract_root, source_map, folder_map = _extract_videos_from_archives(input_dir)
 
-    search_roots = [input_dir]
-    if extract_root and os.path.exists(extract_root):
-        search_roots.append(extract_root)
+def _materialize_job(job):
+    """
+    작업을 main()에 넘길 (입력 비디오, 원본 경로, 폴더 이름)으로.
 
-    for video_path in extracted_videos:
-        abs_path = os.path.abspath(video_path)
-        if abs_path not in seen:
-            seen.add(abs_path)
-            origin = source_map.get(video_path, input_dir)
-            folder_name = folder_map.get(video_path, "")
-            all_videos.append((abs_path, origin, folder_name))
+    ZIP 멤버는 이때 해당 멤버 하나만 Temp/extracted_videos/<ZIP 이름>/ 에 추출한다.
+    """
+    if not job.member:
+        if not os.path.exists(job.origin):
+            raise FileNotFoundError(f"입력 비디오가 없습니다: {job.origin}")
+        return job.origin, job.origin, job.folder_name or ""
 
-    used_root = os.path.abspath(os.path.join(input_dir, "Used"))
+    if job.video_path and os.path.exists(job.video_path):
+        return job.video_path, job.origin, job.folder_name or ""
 
-    for root_dir in search_roots:
-        if not root_dir or not os.path.exists(root_dir):
-            continue
+    archive_name = os.path.splitext(os.path.basename(job.origin))[0]
+    target_dir = os.path.join(CONFIG.paths.temp_dir, "extracted_videos", archive_name)
+    with zipfile.ZipFile(job.origin, "r") as archive:
+        extracted_path = _safe_extract_zip_member(archive, job.member, target_dir)
+    print(f"[ZIP] ZIP에서 비디오 추출: {job.origin} → {extracted_path}")
+    _job_store().set_video_path(job.id, extracted_path)
+    return extracted_path, job.origin, job.folder_name or ""
 
-        for root, dirs, files in os.walk(root_dir):
-            # Used 폴더는 스킵
-            dirs[:] = [
-                d for d in dirs
-                if not os.path.abspath(os.path.join(root, d)).startswith(used_root)
-            ]
 
-            for filename in files:
-                if os.path.splitext(filename)[1].lower() in SUPPORTED_VIDEO_EXTENSIONS:
-                    full_path = os.path.abspath(os.path.join(root, filename))
+# 지금 이 프로세스가 처리 중인 작업 저장소 id (없으면 None)
+_CURRENT_JOB_ID = None
 
-                    # Used 폴더 내부의 파일은 스킵
-                    if full_path.startswith(used_root):
-                        continue
 
-                    if full_path not in seen:
-                        seen.add(full_path)
-                        origin = source_map.get(full_path, input_dir)
-                        folder_name = folder_map.get(full_path, "")
-                        if root_dir == input_dir:
-                            origin = full_path
-                            # Input 폴더에 직접 있는 비디오의 경우 파일명에서 태그 추출
-                            extracted_tag = extract_tag_from_filename(filename)
-                            if extracted_tag:
-                                folder_name = extracted_tag
-                                print(f"[TAG] 파일명에서 태그 추출: {filename} → {folder_name}")
-                        all_videos.append((full_path, origin, folder_name))
+def _mark_job(state, **fields):
+    """처리 중인 작업의 상태 기록 (작업 저장소 없이 main()을 직접 부른 경우는 무시)."""
+    if _CURRENT_JOB_ID is None:
+        return
+    try:
+        _job_store().set_state(_CURRENT_JOB_ID, state, **fields)
+    except Exception as exc:
+        print(f"[WARNING] 작업 상태 기록 실패 ({state}): {exc}")
 
-    if not all_videos:
-        raise FileNotFoundError(f"'{input_dir}'와 하위 폴더에서 비디오 파일을 찾지 못했습니다.")
 
-    # 경로 기준으로 정렬 (알파벳순)
-    all_videos.sort(key=lambda item: item[0])
+def _origin_still_needed(original_source):
+    """같은 원본(ZIP)에서 아직 처리할 다른 작업이 남았는지 (남았으면 원본을 옮기지 않음)."""
+    if _CURRENT_JOB_ID is None or not original_source:
+        return False
+    return _job_store().pending_for_origin(original_source, exclude_id=_CURRENT_JOB_ID) > 0
 
-    print(f"[FOLDER] 발견된 비디오 파일: {len(all_videos)}개")
-    print(f"   선택된 파일: {all_videos[0][0]}")
 
-    return all_videos[0]
+def _run_stored_job(job):
+    """선점한 작업 하나를 처리하고 출력 경로 반환 (실패하면 작업을 failed로 남기고 None)."""
+    global _CURRENT_JOB_ID
+    store = _job_store()
+    _CURRENT_JOB_ID = job.id
+    error = "출력 파일 없이 종료됨"
+    try:
+        return main(_materialize_job(job))
+    except Exception as exc:
+        import traceback
+        traceback.print_exc()
+        error = f"{type(exc).__name__}: {exc}"
+        print(f"\n[ERROR] 비디오 처리 실패: {job.name} ({error})")
+        return None
+    finally:
+        _CURRENT_JOB_ID = None
+        store.abandon(job.id, error)
 
 
 def move_input_file_to_used(original_path):
@@ -282,7 +231,7 @@ def move_input_file_to_used(original_path):
     if not original_path or not os.path.exists(original_path):
         return False
 
-    input_dir = get_config_value(["paths", "input_dir"], "Input")
+    input_dir = CONFIG.paths.input_dir
     input_dir_abs = os.path.abspath(input_dir)
     origin_abs = os.path.abspath(original_path)
 
@@ -327,7 +276,7 @@ def cleanup_extracted_video(path_to_video):
     if not path_to_video:
         return False
 
-    temp_root = get_config_value(["paths", "temp_dir"], "Temp")
+    temp_root = CONFIG.paths.temp_dir
     extract_root = os.path.abspath(os.path.join(temp_root, "extracted_videos"))
     abs_path = os.path.abspath(path_to_video)
 
@@ -361,49 +310,28 @@ def cleanup_extracted_video(path_to_video):
 CONFIG_PATH = os.environ.get("CONFIG_FILE", os.path.join("Config", "config.json"))
 
 
-def load_config():
-    """설정 파일(JSON)을 로드하고 없으면 빈 딕셔너리를 반환"""
-    if not os.path.exists(CONFIG_PATH):
-        return {}
+# 시작할 때 한 번 읽고 검증한 불변 설정 스냅샷 (잘못된 값은 렌더링 전에 ConfigError)
+CONFIG = get_config_snapshot(CONFIG_PATH)
 
-    with open(CONFIG_PATH, "r", encoding="utf-8") as cfg:
-        try:
-            return json.load(cfg)
-        except json.JSONDecodeError as exc:
-            raise ValueError(f"설정 파일 파싱에 실패했습니다: {CONFIG_PATH}") from exc
 
+def get_config_value(path, default=None):
+    """중첩된 설정 값을 안전하게 조회 (자주 읽는 값은 CONFIG의 속성을 사용)"""
+    return CONFIG.value(path, default)
 
-CONFIG = load_config()
 
+# 배치 워커가 작업마다 따로 쓰는 임시 폴더 / ffmpeg 스레드 수 (None이면 단일 프로세스 기본값)
+_JOB_TEMP_DIR = None
+_RENDER_THREADS = None
 
-def get_config_value(path, default=None):
-    """중첩된 설정 값을 안전하게 조회"""
-    current = CONFIG
-    for key in path:
-        if not isinstance(current, dict):
-            return default
-        current = current.get(key)
-    return current if current is not None else default
 
+def job_temp_dir():
+    """작업별 임시 파일(임시 오디오, ffmpeg 작업 폴더, MoviePy temp) 위치 (공유 캐시는 paths.temp_dir 그대로)."""
+    return _JOB_TEMP_DIR or CONFIG.paths.temp_dir
 
-def get_layout_value(category, key, fallback_path=None, default=None):
-    """layout_settings 우선, 없으면 기존 경로에서 값을 반환."""
-    layout = get_config_value(["layout_settings", category, key], None)
-    if layout is not None:
-        return layout
-    if fallback_path:
-        return get_config_value(fallback_path, default)
-    return default
 
-
-def get_layout_value(category, key, fallback_path=None, default=None):
-    """layout_settings 우선, 없으면 기존 경로에서 값을 반환."""
-    layout = get_config_value(["layout_settings", category, key], None)
-    if layout is not None:
-        return layout
-    if fallback_path:
-        return get_config_value(fallback_path, default)
-    return default
+def render_threads():
+    """렌더링 ffmpeg 스레드 수 (batch_settings.ffmpeg_threads, 없으면 2)."""
+    return _RENDER_THREADS or default_ffmpeg_threads(1, CONFIG.batch.ffmpeg_threads)
 
 
 def _get_302ai_config():
@@ -727,11 +655,7 @@ def generate_script_with_gemini(video_path: str) -> str:
     if not ai_settings.get("enabled", True):
         raise RuntimeError("AI 자동 스크립트 생성이 비활성화되어 있습니다.")
 
-    clip = VideoFileClip(video_path)
-    try:
-        duration = clip.duration or 0.0
-    finally:
-        clip.close()
+    duration = probe_media(video_path).duration
 
     config = _get_302ai_config()
     prompt = _build_gemini_prompt(duration)
@@ -1040,77 +964,179 @@ def get_random_sound_effect():
     """sound effects 폴더에서 랜덤 오디오 파일 선택"""
     sound_effects_dir = "sound effects"
 
-    if not os.path.exists(sound_effects_dir):
+    # 폴더 목록은 에셋 라이브러리가 폴더 mtime이 바뀔 때만 다시 읽음
+    audio_files = get_asset_library().files(sound_effects_dir, AUDIO_EXTENSIONS)
+    if audio_files is None:
         print(f"[WARNING] sound effects 폴더를 찾을 수 없습니다: {sound_effects_dir}")
         return None
 
-    audio_files = [
-        f for f in os.listdir(sound_effects_dir)
-        if f.lower().endswith(('.mp3', '.wav', '.m4a', '.aac'))
-    ]
-
     if not audio_files:
         print(f"[WARNING] sound effects 폴더에 오디오 파일이 없습니다.")
         return None
 
-    selected = random.choice(audio_files)
-    return os.path.join(sound_effects_dir, selected)
+    return random.choice(audio_files)
 
 
 def get_random_background_music():
     """background music 폴더에서 랜덤 오디오 파일 선택"""
     music_dir = "background music"
 
-    if not os.path.exists(music_dir):
+    audio_files = get_asset_library().files(music_dir, AUDIO_EXTENSIONS)
+    if audio_files is None:
         print(f"[WARNING] background music 폴더를 찾을 수 없습니다: {music_dir}")
         return None
 
-    audio_files = [
-        f for f in os.listdir(music_dir)
-        if f.lower().endswith(('.mp3', '.wav', '.m4a', '.aac'))
-    ]
-
     if not audio_files:
         print("[WARNING] background music 폴더에 오디오 파일이 없습니다.")
         return None
 
-    selected = random.choice(audio_files)
-    return os.path.join(music_dir, selected)
+    return random.choice(audio_files)
 
 
 def get_start_sound():
     """start sound 폴더에서 랜덤 오디오 파일 선택"""
     start_sound_dir = "start sound"
 
-    if not os.path.exists(start_sound_dir):
+    audio_files = get_asset_library().files(start_sound_dir, AUDIO_EXTENSIONS)
+    if audio_files is None:
         print(f"[WARNING] start sound 폴더를 찾을 수 없습니다: {start_sound_dir}")
         return None
 
-    audio_files = [
-        f for f in os.listdir(start_sound_dir)
-        if f.lower().endswith(('.mp3', '.wav', '.m4a', '.aac'))
-    ]
-
     if not audio_files:
         print("[WARNING] start sound 폴더에 오디오 파일이 없습니다.")
         return None
 
-    selected = random.choice(audio_files)
-    return os.path.join(start_sound_dir, selected)
+    return random.choice(audio_files)
+
+
+DEFAULT_TTS_WORKERS = 4
+NARRATION_SPEEDUP = 1.2
+
+_TTS_SESSION = None
+_TTS_SESSION_LOCK = threading.Lock()
+
+
+def get_tts_session():
+    """302.ai TTS 호출용 공용 keep-alive 세션 (세그먼트마다 새 연결/TLS 핸드셰이크를 하지 않음)."""
+    global _TTS_SESSION
+    with _TTS_SESSION_LOCK:
+        if _TTS_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _TTS_SESSION = session
+        return _TTS_SESSION
+
+
+def synthesize_narration(segments, max_workers=DEFAULT_TTS_WORKERS):
+    """
+    세그먼트 텍스트를 동시에 TTS 합성하고 (작업 수 제한) 내레이션 속도 조정까지 적용.
+
+    반환값은 세그먼트 순서대로의 float32 PCM 배열 목록 (NARRATION_SAMPLE_RATE, 스테레오).
+    하나라도 실패하면 타임라인상 가장 앞선 세그먼트의 예외를 그대로 전달한다.
+    """
+    if not segments:
+        return []
+    workers = max(1, min(int(max_workers or 1), len(segments)))
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(generate_voice, segment['text'], NARRATION_SPEEDUP)
+            for segment in segments
+        ]
+    voices = [future.result() for future in futures]
+    print(f"[TTS] {len(segments)}개 세그먼트 합성 완료 (동시 {workers}개, {time.time() - started:.2f}초)")
+    cache = get_narration_tts_cache()
+    if cache is not None:
+        cache.report()
+    return voices
+
+
+def get_narration_tts_cache():
+    """voice_settings.tts_cache 설정의 공용 TTS 결과 캐시 (enabled=false면 None)."""
+    voice = CONFIG.voice
+    if not voice.tts_cache_enabled:
+        return None
+    try:
+        return get_tts_cache(voice.tts_cache_dir or None, voice.tts_cache_max_mb or DEFAULT_TTS_CACHE_MB)
+    except OSError as exc:
+        print(f"[WARNING] TTS 캐시를 열 수 없어 캐시 없이 진행합니다: {exc}")
+        return None
+
+
+def voice_profile_params():
+    """apply_voice_profile이 실제로 적용할 음성 프로필 파라미터 (후처리를 하지 않으면 None)."""
+    profile_key = str(get_config_value(["voice_settings", "profile"], "default") or "default").strip().lower()
+    if profile_key in {"", "default"}:
+        return None
+    profile_config = get_config_value(["voice_profiles", profile_key], None)
+    return dict(profile_config) if isinstance(profile_config, dict) else None
+
 
+def narration_cache_key(text, post_speedup=1.0):
+    """MiniMax 모델/보이스/속도 + 음성 프로필 + 후처리 배속까지 포함한 TTS 캐시 키."""
+    return tts_cache_key(
+        text,
+        provider="302.ai-minimax",
+        model=get_config_value(["minimax_settings", "model"], "speech-01-turbo"),
+        voice=get_config_value(["voice_settings", "voice"], "Korean_SweetGirl"),
+        speed=CONFIG.voice.speed,
+        profile=voice_profile_params(),
+        post_speedup=post_speedup,
+        audio_format="pcm16",
+        sample_rate=NARRATION_SAMPLE_RATE,
+        channels=2,
+    )
+
+
+def apply_narration_speedup(samples, playback_speed, sample_rate=NARRATION_SAMPLE_RATE):
+    """내레이션 배속 조정 (WSOLA 타임 스트레치, 피치 유지)."""
+    samples = time_stretch(samples, playback_speed, sample_rate)
+    print(f"[SPEED] 보이스 속도 {playback_speed}배로 조정 완료")
+    return samples
+
+
+def generate_voice(text, post_speedup=1.0):
+    """
+    302.ai MiniMax TTS를 사용하여 음성을 생성 (음성 프로필 후처리 + post_speedup 배속까지 적용).
+
+    TTS 응답(mp3)은 메모리에서 한 번만 디코딩하고 이후 처리는 모두 PCM 배열로 한다.
+    같은 텍스트/보이스/프로필/배속의 최종 결과가 TTS 캐시에 있으면 API를 호출하지 않는다.
+    반환값: float32 (samples, 2) 배열 (NARRATION_SAMPLE_RATE)
+    """
+    cache = get_narration_tts_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = narration_cache_key(text, post_speedup)
+        cached_path = cache.lookup(cache_key, ext="wav")
+        if cached_path is not None:
+            try:
+                samples, sample_rate = read_wav(cached_path)
+                if sample_rate == NARRATION_SAMPLE_RATE:
+                    print(f"[TTS-CACHE] 캐시된 음성 사용 ({len(samples) / sample_rate:.2f}초)")
+                    return samples
+            except (OSError, ValueError, EOFError) as exc:
+                print(f"[WARNING] TTS 캐시 파일을 읽지 못해 다시 합성합니다: {exc}")
 
-def generate_voice(text, output_path):
-    """302.ai MiniMax TTS를 사용하여 음성을 생성"""
     try:
-        generate_voice_minimax(text, output_path)
-        apply_voice_profile(output_path)
-        print(f"[OK] 음성 생성 완료: {output_path}")
+        audio_bytes = generate_voice_minimax(text)
+        # AudioFileClip과 같은 스테레오 디코딩 (모노 TTS는 ffmpeg 업믹스 레벨 그대로)
+        samples = decode_audio(audio_bytes, NARRATION_SAMPLE_RATE, channels=2)
+        samples = apply_voice_profile(samples, NARRATION_SAMPLE_RATE)
+        print(f"[OK] 음성 생성 완료 ({len(samples) / NARRATION_SAMPLE_RATE:.2f}초)")
     except Exception as exc:
         raise RuntimeError(f"TTS 음성 생성 실패: {exc}") from exc
 
+    if post_speedup != 1.0:
+        samples = apply_narration_speedup(samples, post_speedup)
+    if cache is not None:
+        cache.store_bytes(cache_key, wav_bytes(samples, NARRATION_SAMPLE_RATE), ext="wav")
+    return samples
 
-def generate_voice_minimax(text, output_path):
-    """302.ai MiniMax TTS API로 음성을 생성"""
+
+def generate_voice_minimax(text, output_path=None):
+    """302.ai MiniMax TTS API로 음성을 생성 (mp3 바이트 반환, output_path가 있으면 파일로도 저장)"""
     # API 키 가져오기 (환경변수 또는 config.json)
     api_key = os.getenv("AI_302_API_KEY")
     if not api_key:
@@ -1127,7 +1153,7 @@ def generate_voice_minimax(text, output_path):
     base_url = get_config_value(["minimax_settings", "base_url"], "https://api.302.ai/v1")
     model = get_config_value(["minimax_settings", "model"], "speech-01-turbo")
     voice = get_config_value(["voice_settings", "voice"], "Korean_SweetGirl")
-    speed = float(get_config_value(["voice_settings", "speed"], 1.0))
+    speed = CONFIG.voice.speed
 
     # API 엔드포인트
     url = f"{base_url}/audio/speech"
@@ -1155,14 +1181,15 @@ def generate_voice_minimax(text, output_path):
 
     for attempt in range(max_retries):
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = get_tts_session().post(url, headers=headers, json=data, timeout=30)
 
             if response.status_code == 200:
                 # 오디오 데이터 저장
-                with open(output_path, "wb") as audio_file:
-                    audio_file.write(response.content)
+                if output_path:
+                    with open(output_path, "wb") as audio_file:
+                        audio_file.write(response.content)
                 print(f"[TTS] 음성 생성 성공: {len(response.content)} bytes")
-                return
+                return response.content
             else:
                 error_text = response.text
                 raise RuntimeError(f"API 오류 (HTTP {response.status_code}): {error_text}")
@@ -1186,28 +1213,17 @@ def generate_voice_minimax(text, output_path):
                 raise RuntimeError(f"TTS 음성 생성 실패 ({max_retries}회 재시도 후): {exc}") from exc
 
 
-def apply_voice_profile(audio_path):
-    """선택된 음성 프로필에 맞춰 음성을 후처리"""
+def apply_voice_profile(samples, sample_rate=NARRATION_SAMPLE_RATE):
+    """선택된 음성 프로필에 맞춰 음성 PCM을 메모리에서 후처리 (처리한 PCM 반환)"""
     profile_name = str(get_config_value(["voice_settings", "profile"], "default") or "default").strip()
     profile_key = profile_name.lower()
     if profile_key in {"", "default"}:
-        return
-
-    if not os.path.exists(audio_path):
-        return
-
-    if AudioSegment is None or PYDUB_IMPORT_ERROR is not None:
-        missing_module = getattr(PYDUB_IMPORT_ERROR, "name", "pydub") if PYDUB_IMPORT_ERROR else "pydub"
-        print(
-            f"[WARNING]  '{profile_name}' 음성 프로필 후처리를 위해 `pydub` 모듈이 필요합니다. "
-            f"현재 '{missing_module}'을(를) 불러오지 못해 후처리를 건너뜁니다."
-        )
-        return
+        return samples
 
     profile_config = get_config_value(["voice_profiles", profile_key], None)
     if not isinstance(profile_config, dict):
         print(f"[WARNING]  '{profile_name}' 음성 프로필 설정을 찾을 수 없어 후처리를 건너뜁니다.")
-        return
+        return samples
 
     playback_speed = float(profile_config.get("speed", 1.0))
     pitch_shift = float(profile_config.get("pitch_shift", 0.0))
@@ -1217,52 +1233,38 @@ def apply_voice_profile(audio_path):
     compression_release = float(profile_config.get("compression_release", 120.0))
     gain = float(profile_config.get("gain", 0.0))
 
-    audio = AudioSegment.from_file(audio_path)
-    original_frame_rate = audio.frame_rate
-
+    # 피치/속도는 서로 독립 (피치 시프트는 길이 유지, 속도 조정은 피치 유지)
     if pitch_shift:
-        audio = shift_pitch(audio, pitch_shift, original_frame_rate)
+        samples = pitch_shift_pcm(samples, pitch_shift, sample_rate)
 
-    if playback_speed > 1.0:
-        audio = speedup(audio, playback_speed=playback_speed, chunk_size=50, crossfade=25)
-    elif 0 < playback_speed < 1.0:
-        slowed = audio._spawn(audio.raw_data, overrides={"frame_rate": int(audio.frame_rate * playback_speed)})
-        audio = slowed.set_frame_rate(original_frame_rate)
+    if playback_speed > 0 and playback_speed != 1.0:
+        samples = time_stretch(samples, playback_speed, sample_rate)
 
-    audio = compress_dynamic_range(
-        audio,
+    return compress_dynamic_range(
+        samples,
+        sample_rate,
         threshold=compression_threshold,
         ratio=compression_ratio,
         attack=compression_attack,
         release=compression_release,
+        makeup_gain=gain,
     )
 
-    if gain:
-        audio = audio.apply_gain(gain)
-
-    audio.export(audio_path, format="mp3")
-
-
-def shift_pitch(audio_segment, semitones, frame_rate):
-    """프레임 레이트를 조정하여 간단히 피치를 이동"""
-    if semitones == 0:
-        return audio_segment
-
-    factor = 2 ** (semitones / 12)
-    pitched = audio_segment._spawn(
-        audio_segment.raw_data,
-        overrides={"frame_rate": int(audio_segment.frame_rate * factor)}
-    )
-    return pitched.set_frame_rate(frame_rate)
-
-
 
+def detect_scene_changes(video_clip, threshold=30.0, min_scene_duration=1.0, analysis=None,
+                         time_offset=0.0, speed=1.0):
+    """
+    프레임 간 차이를 기반으로 씬 전환 시점을 감지.
 
-def detect_scene_changes(video_clip, threshold=30.0, min_scene_duration=1.0):
-    """프레임 간 차이를 기반으로 씬 전환 시점을 감지."""
+    analysis(MediaAnalysis)가 있으면 저해상도 분석 기록에서 바로 계산하고
+    (time_offset: 앞부분을 잘라낸 초, speed: 재생 속도 배율), 없으면 클립을 직접 디코딩.
+    """
     if threshold <= 0:
         return []
 
+    if analysis is not None:
+        return analysis.scene_changes(threshold, min_scene_duration, time_offset, speed)
+
     fps = getattr(video_clip, "fps", None) or 24
     sample_fps = max(2, min(15, int(fps / 2) or 6))
 
@@ -1292,48 +1294,6 @@ def detect_scene_changes(video_clip, threshold=30.0, min_scene_duration=1.0):
     return change_times
 
 
-def remove_chromakey(frame, color='green', threshold=100, blend=1):
-    """
-    Remove a chroma key background from an RGB frame.
-
-    Args:
-        frame: numpy array (H, W, 3) in RGB order.
-        color: 'green' or 'blue' indicating the key color.
-        threshold: Euclidean color distance treated as keyed (0-255).
-        blend: Optional Gaussian blur strength for soft edges.
-
-    Returns:
-        Tuple[np.ndarray, np.ndarray]: (cleaned RGB frame, alpha mask 0.0-1.0).
-    """
-    threshold = float(np.clip(threshold, 0, 255))
-
-    if color.lower() == 'green':
-        key_color = np.array([0, 255, 0], dtype=np.float32)
-    else:
-        key_color = np.array([0, 0, 255], dtype=np.float32)
-
-    frame_float = frame.astype(np.float32)
-    distance = np.linalg.norm(frame_float - key_color, axis=2)
-
-    alpha = np.ones(frame.shape[:2], dtype=np.float32)
-    keyed_region = distance <= threshold
-    alpha[keyed_region] = 0.0
-
-    if blend > 0 and alpha.size:
-        try:
-            from scipy.ndimage import gaussian_filter
-            alpha = gaussian_filter(alpha, sigma=blend)
-        except ImportError:
-            pass
-
-    alpha = np.clip(alpha, 0.0, 1.0)
-
-    cleaned_frame = frame.copy()
-    cleaned_frame[alpha <= 0.01] = 0
-
-    return cleaned_frame.astype(np.uint8), alpha.astype(np.float32)
-
-
 def create_chromakey_overlay(reaction_video_filename, main_video_duration, scale=0.2, position=('left', 'top')):
     """
     크로마키 비디오를 로드하고 처리하여 오버레이 클립 생성
@@ -1357,71 +1317,40 @@ def create_chromakey_overlay(reaction_video_filename, main_video_duration, scale
     print(f"\n[CHROMAKEY] Loading: {reaction_video_filename}")
 
     try:
-        # 비디오 로드
-        reaction_clip = VideoFileClip(video_path)
-
-        # 오디오 제거 (무음)
-        reaction_clip = reaction_clip.with_audio(None)
-
-        # 비디오 루프 (메인 비디오 길이만큼 반복)
-        if reaction_clip.duration < main_video_duration:
-            # 반복 횟수 계산
-            num_loops = int(np.ceil(main_video_duration / reaction_clip.duration))
-            # 루프 생성
-            clips_to_concat = [reaction_clip] * num_loops
-            reaction_clip = concatenate_videoclips(clips_to_concat, method="compose")
-
-        # 메인 비디오 길이에 맞춤
-        reaction_clip = reaction_clip.subclipped(0, main_video_duration)
-
-        # 크로마키 제거 적용
-        print(f"   Removing chromakey...")
-
-        key_threshold = 100
-        key_blend = 0  # Windows only uses blend=0
-        base_clip = reaction_clip
-        frame_cache = {}
-
-        def get_processed_frame(t):
-            cache_key = round(float(t), 4)
-            if cache_key not in frame_cache:
-                cleaned, alpha = remove_chromakey(
-                    base_clip.get_frame(t),
-                    color='green',
-                    threshold=key_threshold,
-                    blend=key_blend
-                )
-                frame_cache[cache_key] = (cleaned, alpha)
-            return frame_cache[cache_key]
-
-        processed_clip = VideoClip(
-            frame_function=lambda t: get_processed_frame(t)[0],
-            duration=base_clip.duration,
-            has_constant_size=True
-        )
-        mask_clip = VideoClip(
-            frame_function=lambda t: get_processed_frame(t)[1],
-            duration=base_clip.duration,
-            is_mask=True,
-            has_constant_size=True
-        )
-
-        if isinstance(base_clip.size, tuple):
-            processed_clip.size = base_clip.size
-            mask_clip.size = base_clip.size
+        chromakey_cfg = CONFIG.chromakey
+        max_cache_bytes = (chromakey_cfg.cache_mb or DEFAULT_CHROMAKEY_CACHE_MB) * 1024 * 1024
 
-        base_fps = getattr(base_clip, "fps", None)
-        if base_fps:
-            processed_clip = processed_clip.with_fps(base_fps)
-            mask_clip = mask_clip.with_fps(base_fps)
+        key_threshold = chromakey_cfg.threshold
+        key_blend = chromakey_cfg.blend  # Windows only uses blend=0
 
-        reaction_clip = processed_clip.with_mask(mask_clip)
-
-        # 크기 조정 (1/5)
-        new_width = int(reaction_clip.w * scale)
-        new_height = int(reaction_clip.h * scale)
-        reaction_clip = reaction_clip.resized((new_width, new_height))
+        # 사전 키잉 캐시 (파일 해시/키 설정/배율별 premultiplied RGBA 메모리 맵)에서 스트리밍
+        reaction = None
+        if chromakey_cfg.prekey:
+            prekey_dir = chromakey_cfg.prekey_dir or os.path.join(
+                CONFIG.paths.temp_dir, "chromakey_cache"
+            )
+            try:
+                reaction = load_prekeyed_reaction(
+                    video_path, prekey_dir, scale=scale, color='green',
+                    threshold=key_threshold, blend=key_blend,
+                )
+            except Exception as exc:
+                print(f"   [WARNING] 사전 키잉 캐시 사용 실패, 실시간 키잉으로 전환: {exc}")
+
+        if reaction is None:
+            # 오버레이 크기에서 키잉, 원본 길이 주기로 반복 (오디오는 로드하지 않음)
+            print(f"   Removing chromakey...")
+            reaction = ChromakeyEngine(
+                video_path,
+                scale=scale,
+                color='green',
+                threshold=key_threshold,
+                blend=key_blend,
+                max_cache_bytes=max_cache_bytes,
+            )
+        reaction_clip = reaction.make_clip(main_video_duration)
 
+        new_width, new_height = reaction.size
         print(f"   [SUCCESS] Chromakey processed (size: {new_width}x{new_height})")
 
         return reaction_clip
@@ -1433,8 +1362,11 @@ def create_chromakey_overlay(reaction_video_filename, main_video_duration, scale
         return None
 
 
+_RESOLVED_SYSTEM_FONTS = {}
+
+
 def get_windows_font():
-    """시스템 폰트 경로 반환 (Windows/Mac 지원, 한글 우선)"""
+    """시스템 폰트 경로 반환 (Windows/Mac 지원, 한글 우선) - 언어별로 한 번만 탐색"""
     import platform
     system = platform.system()
     preferred_language = str(get_config_value(["voice_settings", "language"], "en") or "").lower()
@@ -1442,89 +1374,51 @@ def get_windows_font():
         preferred_language.startswith(prefix)
         for prefix in ("ko", "ja", "zh")
     )
+    if prefer_cjk in _RESOLVED_SYSTEM_FONTS:
+        return _RESOLVED_SYSTEM_FONTS[prefer_cjk]
 
-    if system == "Windows":
-        # Windows 기본 폰트 우선순위 (썸네일용 굵은 폰트 우선)
-        font_paths = [
-            r"C:\Windows\Fonts\malgunbd.ttf",     # 맑은 고딕 Bold (굵은 고딕)
-            r"C:\Windows\Fonts\gulimb.ttc",       # 굴림 Bold
-            r"C:\Windows\Fonts\arialbd.ttf",      # Arial Bold
-            r"C:\Windows\Fonts\malgun.ttf",       # 맑은 고딕
-            r"C:\Windows\Fonts\malgunsl.ttf",     # 맑은 고딕 Semilight
-            r"C:\Windows\Fonts\batang.ttc",       # 바탕
-            r"C:\Windows\Fonts\gulim.ttc",        # 굴림
-            r"C:\Windows\Fonts\arial.ttf",
-        ]
-    elif system == "Darwin":  # macOS
-        # macOS 한글 자막 우선 (Impact 등은 한글 미지원)
-        cjk_priority = [
-            "/System/Library/Fonts/Supplemental/AppleSDGothicNeo.ttc",
-            "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-            "/Library/Fonts/AppleSDGothicNeo.ttc",
-            "/System/Library/Fonts/Supplemental/NotoSansKR-Regular.otf",
-            "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
-        ]
-        bold_priority = [
-            "/System/Library/Fonts/Supplemental/Impact.ttf",  # Impact (YouTube 자막 스탠다드)
-            "/System/Library/Fonts/Supplemental/Arial Black.ttf",  # Arial Black (굵고 강렬)
-            "/System/Library/Fonts/Supplemental/DIN Condensed Bold.ttf",
-            "/System/Library/Fonts/Supplemental/DIN Alternate Bold.ttf",
-            "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
-            "/System/Library/Fonts/HelveticaNeue.ttc",  # Helvetica Neue Bold (index 5)
-            "/System/Library/Fonts/SFNS.ttf",  # San Francisco
-            "/System/Library/Fonts/Avenir Next.ttc",  # Avenir Next Heavy (index 8)
-            "/System/Library/Fonts/Helvetica.ttc",  # Helvetica Bold
-            "/Library/Fonts/Arial.ttf",
-        ]
-        # 모든 언어에서 AppleSDGothicNeo ExtraBold (index 14) 우선 사용
-        font_paths = cjk_priority + bold_priority
-    else:  # Linux
-        cjk_fonts = [
-            "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-            "/usr/share/fonts/truetype/noto/NotoSansKR-Regular.otf",
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-        ]
-        latin_fonts = [
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-        ]
-        font_paths = cjk_fonts + latin_fonts if prefer_cjk else latin_fonts + cjk_fonts
-
-    for font_path in font_paths:
-        if font_path and os.path.exists(font_path):
-            normalized = os.path.normpath(font_path)
-            # TTC 파일에 대해 굵은 인덱스 및 TextClip용 이름을 등록
-            if normalized.lower().endswith(".ttc"):
-                if system == "Windows" and "gulim.ttc" in normalized.lower():
-                    register_font_override(normalized, index=0, textclip_name="GulimChe")
-                elif system == "Darwin":
-                    # macOS 폰트별 Bold 인덱스 설정
-                    if "helveticaneue" in normalized.lower():
-                        register_font_override(normalized, index=5, textclip_name="HelveticaNeue-Bold")  # HelveticaNeue Bold
-                    elif "avenir" in normalized.lower():
-                        register_font_override(normalized, index=8, textclip_name="Avenir-Heavy")  # Avenir Heavy
-                    elif "applesdgothicneo" in normalized.lower():
-                        register_font_override(normalized, index=14, textclip_name="AppleSDGothicNeo-ExtraBold")  # ExtraBold
-                    elif "helvetica.ttc" in normalized.lower():
-                        register_font_override(normalized, index=1, textclip_name="Helvetica-Bold")  # Helvetica Bold
-                    else:
-                        register_font_override(normalized, index=0)
-                else:
-                    register_font_override(normalized, index=0)
-            else:
-                if system == "Windows":
-                    if "malgunsl" in normalized.lower():
-                        register_font_override(normalized, index=0, textclip_name="Malgun Gothic Semilight")
-                    elif "malgunbd" in normalized.lower():
-                        register_font_override(normalized, index=0, textclip_name="Malgun Gothic Bold")
-                    elif "malgun" in normalized.lower():
-                        register_font_override(normalized, index=0, textclip_name="Malgun Gothic")
-                elif system == "Darwin" and "applegothic" in normalized.lower():
-                    register_font_override(normalized, index=0, textclip_name="AppleGothic")
-            return normalized
+    # 플랫폼별 우선순위는 font_registry.FALLBACK_CHAINS 참고 (존재하는 폰트만 반환됨)
+    font_paths = fallback_chain("hangul" if prefer_cjk else "latin")
+    _RESOLVED_SYSTEM_FONTS[prefer_cjk] = _register_system_font(system, font_paths[0] if font_paths else None)
+    return _RESOLVED_SYSTEM_FONTS[prefer_cjk]
+
+
+def _register_system_font(system, font_path):
+    """선택된 시스템 폰트의 TTC 인덱스/TextClip 이름 등록 후 정규화된 경로 반환."""
+    if not font_path:
+        # 폰트를 찾지 못한 경우 None 반환 (기본 폰트 사용)
+        return None
 
-    # 폰트를 찾지 못한 경우 None 반환 (기본 폰트 사용)
-    return None
+    normalized = os.path.normpath(font_path)
+    # TTC 파일에 대해 굵은 인덱스 및 TextClip용 이름을 등록
+    if normalized.lower().endswith(".ttc"):
+        if system == "Windows" and "gulim.ttc" in normalized.lower():
+            register_font_override(normalized, index=0, textclip_name="GulimChe")
+        elif system == "Darwin":
+            # macOS 폰트별 Bold 인덱스 설정
+            if "helveticaneue" in normalized.lower():
+                register_font_override(normalized, index=5, textclip_name="HelveticaNeue-Bold")  # HelveticaNeue Bold
+            elif "avenir" in normalized.lower():
+                register_font_override(normalized, index=8, textclip_name="Avenir-Heavy")  # Avenir Heavy
+            elif "applesdgothicneo" in normalized.lower():
+                register_font_override(normalized, index=14, textclip_name="AppleSDGothicNeo-ExtraBold")  # ExtraBold
+            elif "helvetica.ttc" in normalized.lower():
+                register_font_override(normalized, index=1, textclip_name="Helvetica-Bold")  # Helvetica Bold
+            else:
+                register_font_override(normalized, index=0)
+        else:
+            register_font_override(normalized, index=0)
+    else:
+        if system == "Windows":
+            if "malgunsl" in normalized.lower():
+                register_font_override(normalized, index=0, textclip_name="Malgun Gothic Semilight")
+            elif "malgunbd" in normalized.lower():
+                register_font_override(normalized, index=0, textclip_name="Malgun Gothic Bold")
+            elif "malgun" in normalized.lower():
+                register_font_override(normalized, index=0, textclip_name="Malgun Gothic")
+        elif system == "Darwin" and "applegothic" in normalized.lower():
+            register_font_override(normalized, index=0, textclip_name="AppleGothic")
+    return normalized
 
 
 def sanitize_filename(value, replacement="_"):
@@ -1561,7 +1455,7 @@ def sanitize_filename(value, replacement="_"):
 def generate_output_basename(base_name, output_dir, extension=".mp4"):
     """출력 파일 기본 이름 생성 (중복 방지, 설정 기반 타임스탬프)."""
     sanitized = sanitize_filename(base_name) or "video"
-    use_timestamp_prefix = bool(get_config_value(["paths", "use_timestamp_prefix"], False))
+    use_timestamp_prefix = bool(CONFIG.paths.use_timestamp_prefix)
 
     if use_timestamp_prefix:
         timestamp = time.strftime("%Y%m%d-%H%M%S")
@@ -1589,10 +1483,7 @@ def wrap_text_preserving_words(text, font_path, font_size, max_width, stroke_wid
     if max_width <= 0:
         return text
 
-    font = load_pil_font(font_path, font_size)
-
-    measuring_image = Image.new("RGB", (1, 1), (0, 0, 0))
-    draw_ctx = ImageDraw.Draw(measuring_image)
+    measurer = get_measurer(load_pil_font(font_path, font_size), stroke_width)
 
     wrapped_lines = []
     for paragraph in text.splitlines():
@@ -1601,19 +1492,8 @@ def wrap_text_preserving_words(text, font_path, font_size, max_width, stroke_wid
             wrapped_lines.append("")
             continue
 
-        current_line = words[0]
-        for word in words[1:]:
-            candidate = f"{current_line} {word}"
-            bbox = draw_ctx.textbbox((0, 0), candidate, font=font, stroke_width=stroke_width)
-            line_width = bbox[2] - bbox[0]
-
-            if line_width <= max_width:
-                current_line = candidate
-            else:
-                wrapped_lines.append(current_line)
-                current_line = word
-
-        wrapped_lines.append(current_line)
+        # 누적 글리프 폭으로 후보 줄을 증분 측정 (한도 근처에서만 textbbox 재측정)
+        wrapped_lines.extend(wrap_tokens(words, measurer, max_width))
 
     return "\n".join(wrapped_lines)
 
@@ -1652,18 +1532,8 @@ def parse_color(value, default=(0, 0, 0)):
 
 
 def _create_imageclip_with_mask(rgb_array, alpha_array):
-    """RGB + alpha 배열로 ImageClip을 생성 (버전 간 ismask/is_mask 호환)."""
-    base_clip = ImageClip(rgb_array)
-    alpha_norm = np.array(alpha_array, dtype="float32")
-    if alpha_norm.ndim == 3:
-        alpha_norm = alpha_norm[..., 0]
-    if alpha_norm.max() > 1.0:
-        alpha_norm = np.clip(alpha_norm / 255.0, 0.0, 1.0)
-    try:
-        mask_clip = ImageClip(alpha_norm, ismask=True)
-    except TypeError:
-        mask_clip = ImageClip(alpha_norm, is_mask=True)
-    return base_clip.with_mask(mask_clip)
+    """RGB + alpha 배열로 스프라이트 클립 생성 (내용 영역만 premultiplied RGBA로 보관)."""
+    return SpriteClip(Sprite.from_rgb_alpha(rgb_array, alpha_array))
 
 
 def convert_textclip_to_slanted_imageclip(text_clip, italic_shear=0.2):
@@ -1815,6 +1685,67 @@ def create_pil_subtitle_clip(
     return _create_imageclip_with_mask(rgb, alpha)
 
 
+def render_subtitle_sprite(
+    text,
+    font_path,
+    font_size,
+    text_color,
+    stroke_color,
+    stroke_width,
+    margin,
+    line_spacing,
+    max_width,
+    italic_shear=0.0,
+    use_textclip=False,
+    fallback=True
+):
+    """
+    자막 한 개를 줄바꿈부터 기울임까지 렌더링해 Sprite로 반환 (자막 스프라이트 캐시의 렌더러).
+
+    use_textclip=True 이면 TextClip을 먼저 시도하고, 실패하면 PIL 렌더러로 대체
+    (fallback=False면 대체하지 않고 예외 - 캐시 키가 렌더러를 구분할 때 사용).
+    """
+    wrapped_text = wrap_text_preserving_words(text, font_path, font_size, max_width, stroke_width)
+    margin = _ensure_margin_tuple(margin)
+
+    if use_textclip:
+        try:
+            text_clip = TextClip(
+                text=wrapped_text,
+                font=get_textclip_font_name(font_path),
+                font_size=font_size,
+                color=text_color,
+                stroke_color=stroke_color,
+                stroke_width=stroke_width,
+                margin=margin,
+                interline=line_spacing,
+                method="caption",  # 줄바꿈은 wrap_text_preserving_words 에서 제어
+                size=(max_width, None),  # margin을 제외한 텍스트 영역 너비
+                text_align="center"  # 중앙 정렬
+            )
+            sprite = getattr(convert_textclip_to_slanted_imageclip(text_clip, italic_shear), "sprite", None)
+            if sprite is not None:
+                return sprite
+            if not fallback:
+                raise ValueError("TextClip 자막을 스프라이트로 변환하지 못했습니다")
+        except Exception as exc:
+            if not fallback:
+                raise
+            print(f"   [FALLBACK] TextClip 자막 생성 실패, PIL 렌더링 사용 ({exc})")
+
+    return create_pil_subtitle_clip(
+        wrapped_text,
+        font_path,
+        font_size,
+        text_color,
+        stroke_color,
+        stroke_width,
+        margin,
+        line_spacing,
+        italic_shear
+    ).sprite
+
+
 def apply_cinematic_filter(frame):
     """
     시네마틱 필터 적용 함수
@@ -1824,23 +1755,10 @@ def apply_cinematic_filter(frame):
     """
     h, w = frame.shape[:2]
 
-    # 1. 강력한 비네트 효과 생성 (가장자리 많이 어둡게)
-    # 중앙에서 가장자리로 갈수록 어두워지는 마스크
-    Y, X = np.ogrid[:h, :w]
-    center_y, center_x = h / 2, w / 2
-
-    # 거리 계산 (정규화)
-    dist_from_center = np.sqrt((X - center_x)**2 + (Y - center_y)**2)
-    max_dist = np.sqrt(center_x**2 + center_y**2)
-    normalized_dist = dist_from_center / max_dist
-
-    # 비네트 강도 조정 (제곱으로 가장자리를 더 어둡게)
-    vignette = 1 - (normalized_dist ** 1.8) * 0.85  # 거리의 1.8제곱으로 더 급격하게 어둡게
-    vignette = np.clip(vignette, 0.15, 1.0)  # 최소 15% 밝기 (가장자리 매우 어두움)
-
-    # RGB 채널에 비네트 적용
-    vignette_3d = np.stack([vignette, vignette, vignette], axis=-1)
-    frame = (frame * vignette_3d).astype('uint8')
+    # 1. 강력한 비네트 효과 (가장자리 많이 어둡게)
+    # 거리의 1.8제곱 × 0.85, 최소 15% 밝기 - 해상도별로 한 번만 계산된 배율 맵 사용
+    vignette = get_vignette(h, w, 1.8, 0.85, 0.15)
+    frame = (frame * vignette).astype('uint8')
 
     # 2. 전체 밝기 살짝 감소 (시네마틱 느낌) - 비활성화됨
     # frame = (frame * 0.92).astype('uint8')  # 8% 어둡게
@@ -1921,28 +1839,29 @@ def apply_wave_effect(get_frame, t):
     frame = get_frame(t)
     h, w = frame.shape[:2]
 
-    # 웨이브 파라미터 (config에서 읽기)
-    amplitude_x = float(get_config_value(["video_settings", "wave_effect", "amplitude_x"], 3))
-    amplitude_y = float(get_config_value(["video_settings", "wave_effect", "amplitude_y"], 2))
-    frequency = float(get_config_value(["video_settings", "wave_effect", "frequency"], 2.0))
-    speed = float(get_config_value(["video_settings", "wave_effect", "speed"], 1.5))
+    # 웨이브 파라미터 (설정 스냅샷)
+    wave = CONFIG.video.wave
+    amplitude_x = wave.amplitude_x
+    amplitude_y = wave.amplitude_y
+    frequency = wave.frequency
+    speed = wave.speed
 
     # 좌우 흔들림 계산
     offset_x = int(amplitude_x * np.sin(2 * np.pi * frequency * t))
 
-    # 물결 왜곡 맵 생성
-    Y, X = np.meshgrid(np.arange(h), np.arange(w), indexing='ij')
-
-    # 상하 물결 효과 (미세한 sin 파동)
-    wave_offset_y = amplitude_y * np.sin(2 * np.pi * (X / w * 3 + t * speed))
+    # 해상도별 기본 좌표 그리드 (캐시)
+    base_x, base_y = get_remap_grid(h, w)
 
-    # 새로운 좌표 계산
-    map_x = (X + offset_x).astype(np.float32)
-    map_y = (Y + wave_offset_y).astype(np.float32)
+    # 상하 물결 효과 (미세한 sin 파동) - x에만 의존하므로 한 줄만 계산 후 브로드캐스트
+    wave_offset_y = (amplitude_y * np.sin(2 * np.pi * (base_x[0] / w * 3 + t * speed))).astype(np.float32)
 
-    # 범위 제한
-    map_x = np.clip(map_x, 0, w - 1)
-    map_y = np.clip(map_y, 0, h - 1)
+    # 새로운 좌표 계산 + 범위 제한 (재사용 버퍼)
+    map_x = get_scratch("wave_map_x", (h, w), np.float32)
+    map_y = get_scratch("wave_map_y", (h, w), np.float32)
+    np.add(base_x, offset_x, out=map_x)
+    np.add(base_y, wave_offset_y, out=map_y)
+    np.clip(map_x, 0, w - 1, out=map_x)
+    np.clip(map_y, 0, h - 1, out=map_y)
 
     # 리맵핑 적용 (OpenCV 사용)
     warped_frame = cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
@@ -2054,14 +1973,6 @@ def create_blur_background(text_clip, video_clip, blur_amount=15, opacity=0.7, p
     return make_blur_frame
 
 
-def _safe_float(value, default):
-    """Safely cast a config value to float with fallback."""
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return default
-
-
 def _resolve_clip_position(pos_value):
     """Helper that normalizes clip position definitions to a (x, y) tuple."""
     if callable(pos_value):
@@ -2175,7 +2086,7 @@ def sanitize_filename(value, replacement="_"):
 def generate_output_basename(base_name, output_dir, extension=".mp4"):
     """출력 파일 기본 이름 생성 (중복 방지, 설정 기반 타임스탬프)."""
     sanitized = sanitize_filename(base_name) or "video"
-    use_timestamp_prefix = bool(get_config_value(["paths", "use_timestamp_prefix"], False))
+    use_timestamp_prefix = bool(CONFIG.paths.use_timestamp_prefix)
 
     if use_timestamp_prefix:
         timestamp = time.strftime("%Y%m%d-%H%M%S")
@@ -2203,10 +2114,7 @@ def wrap_text_preserving_words(text, font_path, font_size, max_width, stroke_wid
     if max_width <= 0:
         return text
 
-    font = load_pil_font(font_path, font_size)
-
-    measuring_image = Image.new("RGB", (1, 1), (0, 0, 0))
-    draw_ctx = ImageDraw.Draw(measuring_image)
+    measurer = get_measurer(load_pil_font(font_path, font_size), stroke_width)
 
     wrapped_lines = []
     for paragraph in text.splitlines():
@@ -2215,19 +2123,8 @@ def wrap_text_preserving_words(text, font_path, font_size, max_width, stroke_wid
             wrapped_lines.append("")
             continue
 
-        current_line = words[0]
-        for word in words[1:]:
-            candidate = f"{current_line} {word}"
-            bbox = draw_ctx.textbbox((0, 0), candidate, font=font, stroke_width=stroke_width)
-            line_width = bbox[2] - bbox[0]
-
-            if line_width <= max_width:
-                current_line = candidate
-            else:
-                wrapped_lines.append(current_line)
-                current_line = word
-
-        wrapped_lines.append(current_line)
+        # 누적 글리프 폭으로 후보 줄을 증분 측정 (한도 근처에서만 textbbox 재측정)
+        wrapped_lines.extend(wrap_tokens(words, measurer, max_width))
 
     return "\n".join(wrapped_lines)
 def apply_cinematic_filter(frame):
@@ -2239,23 +2136,10 @@ def apply_cinematic_filter(frame):
     """
     h, w = frame.shape[:2]
 
-    # 1. 강력한 비네트 효과 생성 (가장자리 많이 어둡게)
-    # 중앙에서 가장자리로 갈수록 어두워지는 마스크
-    Y, X = np.ogrid[:h, :w]
-    center_y, center_x = h / 2, w / 2
-
-    # 거리 계산 (정규화)
-    dist_from_center = np.sqrt((X - center_x)**2 + (Y - center_y)**2)
-    max_dist = np.sqrt(center_x**2 + center_y**2)
-    normalized_dist = dist_from_center / max_dist
-
-    # 비네트 강도 조정 (제곱으로 가장자리를 더 어둡게)
-    vignette = 1 - (normalized_dist ** 1.8) * 0.85  # 거리의 1.8제곱으로 더 급격하게 어둡게
-    vignette = np.clip(vignette, 0.15, 1.0)  # 최소 15% 밝기 (가장자리 매우 어두움)
-
-    # RGB 채널에 비네트 적용
-    vignette_3d = np.stack([vignette, vignette, vignette], axis=-1)
-    frame = (frame * vignette_3d).astype('uint8')
+    # 1. 강력한 비네트 효과 (가장자리 많이 어둡게)
+    # 거리의 1.8제곱 × 0.85, 최소 15% 밝기 - 해상도별로 한 번만 계산된 배율 맵 사용
+    vignette = get_vignette(h, w, 1.8, 0.85, 0.15)
+    frame = (frame * vignette).astype('uint8')
 
     # 2. 전체 밝기 살짝 감소 (시네마틱 느낌) - 비활성화됨
     # frame = (frame * 0.92).astype('uint8')  # 8% 어둡게
@@ -2336,28 +2220,29 @@ def apply_wave_effect(get_frame, t):
     frame = get_frame(t)
     h, w = frame.shape[:2]
 
-    # 웨이브 파라미터 (config에서 읽기)
-    amplitude_x = float(get_config_value(["video_settings", "wave_effect", "amplitude_x"], 3))
-    amplitude_y = float(get_config_value(["video_settings", "wave_effect", "amplitude_y"], 2))
-    frequency = float(get_config_value(["video_settings", "wave_effect", "frequency"], 2.0))
-    speed = float(get_config_value(["video_settings", "wave_effect", "speed"], 1.5))
+    # 웨이브 파라미터 (설정 스냅샷)
+    wave = CONFIG.video.wave
+    amplitude_x = wave.amplitude_x
+    amplitude_y = wave.amplitude_y
+    frequency = wave.frequency
+    speed = wave.speed
 
     # 좌우 흔들림 계산
     offset_x = int(amplitude_x * np.sin(2 * np.pi * frequency * t))
 
-    # 물결 왜곡 맵 생성
-    Y, X = np.meshgrid(np.arange(h), np.arange(w), indexing='ij')
+    # 해상도별 기본 좌표 그리드 (캐시)
+    base_x, base_y = get_remap_grid(h, w)
 
-    # 상하 물결 효과 (미세한 sin 파동)
-    wave_offset_y = amplitude_y * np.sin(2 * np.pi * (X / w * 3 + t * speed))
+    # 상하 물결 효과 (미세한 sin 파동) - x에만 의존하므로 한 줄만 계산 후 브로드캐스트
+    wave_offset_y = (amplitude_y * np.sin(2 * np.pi * (base_x[0] / w * 3 + t * speed))).astype(np.float32)
 
-    # 새로운 좌표 계산
-    map_x = (X + offset_x).astype(np.float32)
-    map_y = (Y + wave_offset_y).astype(np.float32)
-
-    # 범위 제한
-    map_x = np.clip(map_x, 0, w - 1)
-    map_y = np.clip(map_y, 0, h - 1)
+    # 새로운 좌표 계산 + 범위 제한 (재사용 버퍼)
+    map_x = get_scratch("wave_map_x", (h, w), np.float32)
+    map_y = get_scratch("wave_map_y", (h, w), np.float32)
+    np.add(base_x, offset_x, out=map_x)
+    np.add(base_y, wave_offset_y, out=map_y)
+    np.clip(map_x, 0, w - 1, out=map_x)
+    np.clip(map_y, 0, h - 1, out=map_y)
 
     # 리맵핑 적용 (OpenCV 사용)
     warped_frame = cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
@@ -2534,23 +2419,15 @@ def build_keyword_highlight_clip(
     left_margin, top_margin, right_margin, bottom_margin = margins
     effective_stroke_width = stroke_width if stroke_color else 0
 
-    # 텍스트를 줄바꿈 (normalized 버전 사용)
-    draw_helper = ImageDraw.Draw(Image.new("RGB", (1, 1)))
-    wrapped_lines = []
-    current_line = ""
+    # 텍스트를 줄바꿈 (normalized 버전 사용, 줄 오른쪽 끝 기준)
     words = full_text_normalized.split()
-
-    for word in words:
-        test_line = f"{current_line} {word}".strip()
-        bbox = draw_helper.textbbox((0, 0), test_line, font=pil_font, stroke_width=effective_stroke_width)
-        if bbox[2] <= max_text_width:
-            current_line = test_line
-        else:
-            if current_line:
-                wrapped_lines.append(current_line)
-            current_line = word
-    if current_line:
-        wrapped_lines.append(current_line)
+    measurer = get_measurer(pil_font, effective_stroke_width)
+    wrapped_lines = wrap_tokens(
+        words,
+        measurer,
+        max_text_width,
+        edge="right"
+    )
 
     if not wrapped_lines:
         return None
@@ -2561,9 +2438,6 @@ def build_keyword_highlight_clip(
     if keyword_start == -1:
         return None
 
-    # 이미지 생성
-    highlight_image = Image.new("RGBA", (img_width, img_height), (0, 0, 0, 0))
-    highlight_draw = ImageDraw.Draw(highlight_image)
     # 키워드 하이라이트 색상 (파라미터로 전달됨)
     highlight_color = keyword_color
 
@@ -2583,10 +2457,11 @@ def build_keyword_highlight_clip(
     elif vertical_align == "bottom":
         y = img_height - bottom_margin - total_text_height
 
-    # 각 줄 그리기
+    # 각 줄의 그리기 명령 수집 (위치, 텍스트, 색상)
+    draw_ops = []
     char_position = 0
     for line_text in wrapped_lines:
-        line_bbox = draw_helper.textbbox((0, 0), line_text, font=pil_font, stroke_width=effective_stroke_width)
+        line_bbox = measurer.bbox(line_text)
         line_width = line_bbox[2]
 
         # X 위치
@@ -2615,69 +2490,58 @@ def build_keyword_highlight_clip(
 
             # 앞부분 (하얀색)
             if before:
-                highlight_draw.text(
-                    (current_x, y + ascent),
-                    before,
-                    font=pil_font,
-                    fill=text_color,
-                    stroke_width=effective_stroke_width,
-                    stroke_fill=stroke_color,
-                    anchor="ls"
-                )
-                before_bbox = draw_helper.textbbox((0, 0), before, font=pil_font, stroke_width=effective_stroke_width)
+                draw_ops.append(((current_x, y + ascent), before, text_color))
+                before_bbox = measurer.bbox(before)
                 current_x += before_bbox[2]
 
             # 키워드 (노란색)
             if keyword_part:
-                highlight_draw.text(
-                    (current_x, y + ascent),
-                    keyword_part,
-                    font=pil_font,
-                    fill=highlight_color,
-                    stroke_width=effective_stroke_width,
-                    stroke_fill=stroke_color,
-                    anchor="ls"
-                )
-                keyword_bbox = draw_helper.textbbox((0, 0), keyword_part, font=pil_font, stroke_width=effective_stroke_width)
+                draw_ops.append(((current_x, y + ascent), keyword_part, highlight_color))
+                keyword_bbox = measurer.bbox(keyword_part)
                 current_x += keyword_bbox[2]
 
             # 뒷부분 (하얀색)
             if after:
-                highlight_draw.text(
-                    (current_x, y + ascent),
-                    after,
-                    font=pil_font,
-                    fill=text_color,
-                    stroke_width=effective_stroke_width,
-                    stroke_fill=stroke_color,
-                    anchor="ls"
-                )
+                draw_ops.append(((current_x, y + ascent), after, text_color))
         else:
             # 키워드가 없는 줄 (전체 하얀색)
-            highlight_draw.text(
-                (x, y + ascent),
-                line_text,
-                font=pil_font,
-                fill=text_color,
-                stroke_width=effective_stroke_width,
-                stroke_fill=stroke_color,
-                anchor="ls"
-            )
+            draw_ops.append(((x, y + ascent), line_text, text_color))
 
         y += line_height
         char_position = line_end_in_combined + 1  # +1 for space
 
-    highlight_np = np.array(highlight_image)
-    if highlight_np.shape[2] < 4:
+    # 전체 캔버스 대신 글자가 그려지는 영역(캔버스 안쪽)만 할당
+    # (anchor="ls" 박스 = 원점 기준 박스를 (x, 기준선 - ascent)만큼 이동)
+    left, top, right, bottom = img_width, img_height, 0, 0
+    for (pos_x, pos_y), part, _ in draw_ops:
+        bbox = measurer.bbox(part)
+        left, top = min(left, pos_x + bbox[0]), min(top, pos_y - ascent + bbox[1])
+        right, bottom = max(right, pos_x + bbox[2]), max(bottom, pos_y - ascent + bbox[3])
+    left, top = max(0, int(math.floor(left))), max(0, int(math.floor(top)))
+    right, bottom = min(img_width, int(math.ceil(right))), min(img_height, int(math.ceil(bottom)))
+    if left >= right or top >= bottom:
         return None
 
-    alpha = highlight_np[:, :, 3].astype(np.float32) / 255.0
-    if not np.any(alpha > 0):
+    highlight_image = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    highlight_draw = ImageDraw.Draw(highlight_image)
+    for (pos_x, pos_y), part, fill in draw_ops:
+        highlight_draw.text(
+            (pos_x - left, pos_y - top),
+            part,
+            font=pil_font,
+            fill=fill,
+            stroke_width=effective_stroke_width,
+            stroke_fill=stroke_color,
+            anchor="ls"
+        )
+
+    sprite = Sprite.from_rgba(np.array(highlight_image))
+    if not sprite.pixels.size:
         return None
 
-    rgb = highlight_np[:, :, :3]
-    mask = ImageClip(alpha, is_mask=True).with_duration(txt_clip.duration)
-    return ImageClip(rgb).with_duration(txt_clip.duration).with_mask(mask)
+    # 원래 텍스트 클립 크기 기준 오프셋으로 보정
+    sprite = Sprite(sprite.pixels, (sprite.offset[0] + left, sprite.offset[1] + top), (img_width, img_height))
+    return SpriteClip(sprite, duration=txt_clip.duration)
 
 
 
@@ -2740,7 +2604,7 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
             print(f"[TRIM] 세그먼트 타임스탬프 조정 완료")
 
     # 속도 변경 적용 (저작권 회피용)
-    speed_factor = float(get_config_value(["video_settings", "speed_factor"], 1.0))
+    speed_factor = CONFIG.video.speed_factor
     if speed_factor != 1.0:
         print(f"\n[SPEED] 비디오 속도 변경: {speed_factor}x")
         from moviepy.video.fx import MultiplySpeed
@@ -2749,66 +2613,98 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
     # _no_filters 접미사 확인 및 필터 건너뛰기
     apply_filters = '_no_filters' not in os.path.basename(video_path)
 
-    if apply_filters:
-        # 시네마틱 필터 적용 (비네트 1.8제곱 × 0.85, 채도 15% 감소)
-        print(f"\n[FILTER] Cinematic 필터 적용 중 (비네트 1.8^2 × 0.85, 채도 -15%)...")
-        video = video.image_transform(apply_cinematic_filter)
+    # 효과음/배경음/시작 사운드 PCM 캐시 위치 (paths.temp_dir/asset_cache)
+    get_asset_library(os.path.join(CONFIG.paths.temp_dir, "asset_cache"))
 
-        # Sharpen Edges 필터 적용 (1차: 150% threshold=3, 2차: 290% threshold=2)
-        print(f"\n[SHARPEN] Sharpen 필터 적용 중 (1차: 150%/t3, 2차: 290%/t2)...")
-        video = video.image_transform(apply_sharpen_filter)
+    if CONFIG.video.effect_cache_mb is not None:
+        set_asset_cache_limit(CONFIG.video.effect_cache_mb)
 
-        # Chromatic Aberration 효과 적용 (Speed: 0.33Hz, Offset: ±0.75px 사인파)
-        print(f"\n[CHROMATIC] Chromatic Aberration 적용 중 (Speed: 0.33Hz, Offset: ±0.75px)...")
-        video = video.transform(apply_chromatic_aberration)
+    filter_chain = None
+    if apply_filters:
+        # 시네마틱 → 샤픈 → 색수차를 프레임당 1회 패스로 처리 (video_settings.filter_chain)
+        filter_chain = build_filter_chain(get_config_value(["video_settings", "filter_chain"], None))
+        if filter_chain:
+            print(f"\n[FILTER] 필터 체인 적용 중: {filter_chain.describe()}")
+            video = video.transform(filter_chain)
+        else:
+            print(f"\n[FILTER] 필터 체인이 비어 있어 필터를 적용하지 않습니다")
     else:
         print(f"\n[FILTER] 필터 비활성화 표시 감지: 시네마틱/샤픈/색수차 필터를 건너뜁니다")
+
+    # 렌더 백엔드 선택 (작업 metadata의 render_backend > video_settings.render_backend)
+    render_backend = resolve_render_backend(
+        get_config_value(["video_settings", "render_backend"], None),
+        metadata.get('render_backend')
+    )
+    render_job = None
+    if render_backend == "ffmpeg":
+        if speed_factor != 1.0:
+            print(f"\n[RENDER] speed_factor={speed_factor} 는 ffmpeg 백엔드에서 지원하지 않아 moviepy로 렌더링합니다")
+        else:
+            print(f"\n[RENDER] ffmpeg filter_complex 백엔드 사용")
+            render_job = FFmpegRenderJob(
+                video_path,
+                video.duration,
+                video.size,
+                trim_start=trim_start,
+                fps=30,
+                temp_dir=job_temp_dir(),
+            )
+            if filter_chain:
+                render_job.set_filter_steps(filter_chain.steps)
+
     original_audio = video.audio
     has_original_audio = original_audio is not None
     if not has_original_audio:
         print("\n[AUDIO] 원본 오디오가 없어 무음 상태로 진행합니다.")
 
-    flash_settings_cfg = get_config_value(["video_settings", "scene_change_effect"], {}) or {}
+    scene_change = CONFIG.video.scene_change
     flash_settings = {
-        "enabled": bool(flash_settings_cfg.get("enabled", False)),
-        "threshold": float(flash_settings_cfg.get("threshold", 30.0)),
-        "min_scene_duration": float(flash_settings_cfg.get("min_scene_duration", 1.0)),
-        "flash_duration": float(flash_settings_cfg.get("flash_duration", 0.15)),
-        "flash_intensity": float(flash_settings_cfg.get("flash_intensity", 1.5)),
+        "enabled": scene_change.enabled,
+        "threshold": scene_change.threshold,
+        "min_scene_duration": scene_change.min_scene_duration,
+        "flash_duration": scene_change.flash_duration,
+        "flash_intensity": scene_change.flash_intensity,
     }
     scene_change_times = []
     if flash_settings["enabled"]:
         print("\n[SCENE] 씬 전환 분석 중...")
+        analysis = None
+        try:
+            analysis = get_media_analysis(video_path)
+        except Exception as exc:
+            print(f"[SCENE] 저해상도 분석 실패, 클립을 직접 디코딩합니다: {exc}")
         scene_change_times = detect_scene_changes(
             video,
             threshold=flash_settings["threshold"],
-            min_scene_duration=flash_settings["min_scene_duration"]
+            min_scene_duration=flash_settings["min_scene_duration"],
+            analysis=analysis,
+            time_offset=trim_start,
+            speed=speed_factor,
         )
         if scene_change_times:
             print(f"[SCENE] 씬 전환 {len(scene_change_times)}회 감지")
         else:
             print("[SCENE] 씬 전환 감지되지 않음")
 
-    voice_clips = []
-    temp_voice_files = []
-    voice_volume = float(get_config_value(["audio_settings", "voice_volume"], 1.0))
-    sound_effect_volume = float(get_config_value(["audio_settings", "sound_effect_volume"], 1.0))
-    background_music_volume = float(get_config_value(["audio_settings", "background_music_volume"], 0.5))
+    voice_volume = CONFIG.audio.voice_volume
+    sound_effect_volume = CONFIG.audio.sound_effect_volume
+    background_music_volume = CONFIG.audio.background_music_volume
     if voice_volume != 1.0:
         print(f"\n[AUDIO] 보이스 볼륨 증폭: {voice_volume:.2f}x")
     if sound_effect_volume != 1.0:
         print(f"[AUDIO] 사운드 이펙트 볼륨 조정: {sound_effect_volume:.2f}x")
 
+    # 사운드트랙 전체를 비디오 길이의 float32 버퍼 하나에 미리 믹스 (비디오 인코딩 중에는 오디오 계산 없음)
+    soundtrack = AudioMix(video.duration, NARRATION_SAMPLE_RATE)
+
     # 시작 사운드 추가
     start_sound_path = get_start_sound()
     if start_sound_path:
         print(f"\n[START SOUND] 시작 사운드 로딩: {start_sound_path}")
         try:
-            start_sound_clip = AudioFileClip(start_sound_path).with_start(0)
-            if sound_effect_volume != 1.0:
-                start_sound_clip = start_sound_clip.with_effects([MultiplyVolume(sound_effect_volume)])
-            voice_clips.append(start_sound_clip)
-            print(f"[START SOUND] 시작 사운드 추가 완료 (길이: {start_sound_clip.duration:.2f}초)")
+            start_sound_duration = soundtrack.add_file(start_sound_path, 0, sound_effect_volume)
+            print(f"[START SOUND] 시작 사운드 추가 완료 (길이: {start_sound_duration:.2f}초)")
         except Exception as e:
             print(f"[WARNING] 시작 사운드 로드 실패: {e}")
 
@@ -2885,30 +2781,23 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
     # 각 세그먼트마다 음성 생성
     print(f"\n[MIC] AI 음성 생성 중... (총 {len(segments)}개 세그먼트)")
 
-    narration_clips = []  # 내레이션 보이스만 저장 (더킹용)
+    narration_intervals = []  # 내레이션 보이스 구간만 저장 (더킹용)
     last_voice_end = 0  # 이전 음성이 끝나는 시간 추적
     min_gap = 0.3  # 음성 간 최소 간격 (초)
 
+    _mark_job("tts")
+    # 모든 세그먼트를 동시에 합성한 뒤 타임라인 순서대로 배치 (voice_settings.tts_workers)
     for idx, segment in enumerate(segments):
-        print(f"\n[{idx+1}/{len(segments)}] {segment['start']}초 ~ {segment['end']}초")
-        print(f"텍스트: {segment['text']}")
-
-        # 임시 음성 파일 생성
-        temp_voice_file = f"temp_voice_{idx}.mp3"
-        generate_voice(segment['text'], temp_voice_file)
-
-        # 보이스 속도 1.2배로 조정 (pydub 사용)
-        if AudioSegment is not None and speedup is not None:
-            try:
-                audio_seg = AudioSegment.from_file(temp_voice_file)
-                audio_seg = speedup(audio_seg, playback_speed=1.2)
-                audio_seg.export(temp_voice_file, format="mp3")
-                print(f"[SPEED] 보이스 속도 1.2배로 조정 완료")
-            except Exception as e:
-                print(f"[WARNING] 보이스 속도 조정 실패: {e}")
+        print(f"[{idx+1}/{len(segments)}] {segment['start']}초 ~ {segment['end']}초 | 텍스트: {segment['text']}")
+    voices = synthesize_narration(
+        segments,
+        CONFIG.voice.tts_workers or DEFAULT_TTS_WORKERS,
+    )
 
-        # 오디오 클립 로드
-        voice_clip = AudioFileClip(temp_voice_file)
+    for idx, segment in enumerate(segments):
+        print(f"\n[{idx+1}/{len(segments)}] {segment['start']}초 ~ {segment['end']}초 배치")
+        voice_pcm = voices[idx]
+        voice_duration = len(voice_pcm) / NARRATION_SAMPLE_RATE
 
         # 시작 시간 조정: 이전 음성과 겹치지 않도록
         adjusted_start = segment['start']
@@ -2921,45 +2810,34 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
             print(f"[SKIP] 조정된 시작 시간({adjusted_start:.2f}초)이 비디오 끝({video.duration:.2f}초)을 초과하여 건너뜀")
             continue
 
-        voice_clip = voice_clip.with_start(adjusted_start)
-
-        # 보이스가 비디오 끝을 넘지 않도록 제한
-        voice_end = adjusted_start + voice_clip.duration
+        # 보이스가 비디오 끝을 넘지 않도록 제한 (PCM 배열을 바로 자름)
+        voice_end = adjusted_start + voice_duration
         if voice_end > video.duration:
             trim_duration = video.duration - adjusted_start
             if trim_duration > 0.5:  # 최소 0.5초는 남아야 의미 있음
-                voice_clip = voice_clip.subclipped(0, trim_duration)
+                voice_pcm = voice_pcm[:int(round(trim_duration * NARRATION_SAMPLE_RATE))]
                 voice_end = adjusted_start + trim_duration
                 print(f"[NOTE] 보이스가 비디오 길이를 초과하여 {trim_duration:.2f}초로 자름")
             else:
                 print(f"[SKIP] 남은 시간이 너무 짧아 건너뜀 (여유: {trim_duration:.2f}초)")
                 continue
 
-        if voice_volume != 1.0:
-            voice_clip = voice_clip.with_effects([MultiplyVolume(voice_volume)])
-
-        voice_clips.append(voice_clip)
-        narration_clips.append(voice_clip)  # 내레이션만 따로 저장
-        temp_voice_files.append(temp_voice_file)
+        soundtrack.add(voice_pcm, adjusted_start, voice_volume)
+        narration_intervals.append((adjusted_start, voice_end))  # 내레이션만 따로 저장
 
         # 다음 반복을 위해 현재 음성이 끝나는 시간 저장
         last_voice_end = voice_end
 
     # Key moment에 사운드 이펙트 추가
-    sound_effect_clip = None
     if metadata.get('key_moment') is not None:
         sound_effect_path = get_random_sound_effect()
         if sound_effect_path:
             print(f"\n[AUDIO] Key moment ({metadata['key_moment']}초)에 사운드 이펙트 추가: {os.path.basename(sound_effect_path)}")
-            sound_effect_clip = AudioFileClip(sound_effect_path).with_start(metadata['key_moment'])
-            if sound_effect_volume != 1.0:
-                sound_effect_clip = sound_effect_clip.with_effects([MultiplyVolume(sound_effect_volume)])
-            voice_clips.append(sound_effect_clip)
+            soundtrack.add_file(sound_effect_path, metadata['key_moment'], sound_effect_volume)
 
     # Background music: 메타데이터가 'no'일 때만 추가 (원본 비디오에 음악이 없는 경우)
-    background_music_clip = None
     bg_music_metadata = str(metadata.get('background_music', '')).lower() if metadata else ''
-    enable_background_music = get_config_value(["audio_settings", "enable_background_music"], True)
+    enable_background_music = CONFIG.audio.enable_background_music
 
     if not enable_background_music:
         print(f"\n[MUSIC] 백그라운드 음악 추가 기능이 비활성화되어 있습니다 (config: enable_background_music = false)")
@@ -2967,175 +2845,127 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
         music_path = get_random_background_music()
         if music_path:
             print(f"\n[MUSIC] 원본 비디오에 배경 음악 없음 → 배경 음악 추가: {os.path.basename(music_path)}")
-            background_music_clip = AudioFileClip(music_path)
-            if background_music_clip.duration < video.duration:
-                background_music_clip = background_music_clip.with_effects([AudioLoop(duration=video.duration)])
-            background_music_clip = background_music_clip.subclipped(0, video.duration).with_start(0)
             if background_music_volume != 1.0:
                 print(f"[AUDIO] 배경 음악 볼륨 조정: {background_music_volume:.2f}x")
-                background_music_clip = background_music_clip.with_effects([
-                    MultiplyVolume(background_music_volume)
-                ])
-            voice_clips.append(background_music_clip)
+            # 비디오보다 짧으면 루프, 길면 비디오 길이에서 잘림
+            soundtrack.add_file(music_path, 0, background_music_volume, loop=True)
         else:
             print(f"\n[WARNING] 배경 음악 파일을 찾을 수 없습니다 (background music 폴더 확인 필요)")
     else:
         print(f"\n[MUSIC] 원본 비디오에 배경 음악이 이미 있음 (Background Music: {metadata.get('background_music', 'N/A')}) → 추가하지 않음")
 
-    # 오디오 더킹: 보이스 구간에만 원본 오디오 볼륨 감소
-    ducking_volume = get_config_value(["audio_settings", "ducking_volume"], 0.3)
-    audio_clips = []
+    # 오디오 더킹: 보이스 구간에만 원본 오디오 볼륨 감소 (어택/릴리즈 램프가 있는 샘플별 게인 엔벨로프)
+    ducking_volume = CONFIG.audio.ducking_volume
+    ducking_attack_ms = CONFIG.audio.ducking_attack_ms
+    ducking_release_ms = CONFIG.audio.ducking_release_ms
     if has_original_audio:
-        print(f"\n[AUDIO] 오디오 더킹 적용 (보이스 구간 원본 오디오 {ducking_volume * 100:.0f}% 볼륨)")
-
-        # 내레이션 보이스 클립의 구간들만 수집 (배경음악/사운드이펙트 제외)
-        voice_segments = [(clip.start, clip.start + clip.duration)
-                          for clip in narration_clips]
-
-        # 원본 오디오를 구간별로 분할하여 더킹 적용
-        current_time = 0
+        print(
+            f"\n[AUDIO] 오디오 더킹 적용 (보이스 구간 원본 오디오 {ducking_volume * 100:.0f}% 볼륨, "
+            f"어택 {ducking_attack_ms:.0f}ms / 릴리즈 {ducking_release_ms:.0f}ms)"
+        )
         video_duration = video.duration
 
-        for start, end in voice_segments:
-            # 비디오 범위를 벗어나는 구간 스킵
-            if start >= video_duration:
-                continue
-
-            # 보이스 전 구간: 원본 볼륨
-            if current_time < start:
-                audio_clips.append(
-                    original_audio.subclipped(current_time, min(start, video_duration)).with_start(current_time)
-                )
-
-            # 보이스 구간: 더킹 적용
-            end_clamped = min(end, video_duration)
-            if start < end_clamped:
-                ducked_segment = original_audio.subclipped(start, end_clamped).with_effects(
-                    [MultiplyVolume(ducking_volume)]
-                ).with_start(start)
-                audio_clips.append(ducked_segment)
-
-            current_time = end
-
-        # 마지막 보이스 이후 구간: 원본 볼륨
-        if current_time < video_duration:
-            audio_clips.append(
-                original_audio.subclipped(current_time, video_duration).with_start(current_time)
-            )
+        # 내레이션 보이스 구간들만 수집 (배경음악/사운드이펙트 제외)
+        voice_segments = [(start, min(end, video_duration))
+                          for start, end in narration_intervals if start < video_duration]
+
+        # 원본 오디오를 비디오 길이만큼 한 번 PCM으로 읽고 엔벨로프를 한 번에 곱함
+        source_len = int(round(video_duration * NARRATION_SAMPLE_RATE))
+        source_pcm = np.asarray(original_audio.to_soundarray(fps=NARRATION_SAMPLE_RATE), dtype=np.float32)
+        source_pcm = apply_ducking(
+            source_pcm[:source_len],
+            NARRATION_SAMPLE_RATE,
+            voice_segments,
+            ducking_volume,
+            ducking_attack_ms,
+            ducking_release_ms,
+        )
+        soundtrack.add(source_pcm)
     else:
         print("\n[AUDIO] 원본 오디오가 없어 더킹 없이 진행합니다.")
 
-    # 모든 오디오 합성
-    print("[MUSIC] 오디오 합성 중...")
-    final_audio = CompositeAudioClip(audio_clips + voice_clips)
+    # 모든 오디오 믹스다운 (소프트 리미터로 0dBFS 초과분만 부드럽게 누름)
+    limiter_threshold_db = CONFIG.audio.limiter_threshold_db
+    print(f"[MUSIC] 오디오 믹스다운 중... (트랙 {soundtrack.tracks}개, 리미터 {limiter_threshold_db} dBFS)")
+    mixed_audio = soundtrack.render(limiter_threshold_db) if soundtrack.tracks else None
 
-    # 비디오에 새 오디오 설정
-    final_video = video.with_audio(final_audio)
+    # 모든 지오메트리를 출력 좌표로 미리 계산해서 평면 레이어 목록으로 합성 (프레임당 1회 그리기)
+    final_video = LayerCompositor(video)
+    layer_timeline = final_video.layers
 
     # 메인 비디오 위치/스케일 조정 (캔버스 내에서 여백 확보용)
     # 중복 블록 - 이미 위에서 스케일/오프셋을 적용했으므로 여기서는 무시
     main_scale = 1.0
     main_offset_y = 0
     print(f"[VIDEO] 메인 영상 오프셋/스케일 적용: offset_y={main_offset_y}, scale={main_scale}")
-    base_clip = final_video
-    if main_scale != 1.0:
-        base_clip = base_clip.resized(main_scale)
     video_w, video_h = final_video.size
-    base_w, base_h = base_clip.size
+    base_w, base_h = scaled_size(final_video.size, main_scale)
     center_y = (video_h - base_h) / 2.0
     pos_y = center_y + main_offset_y
-    background = ColorClip(size=(video_w, video_h), color=(0, 0, 0)).with_duration(final_video.duration)
-    positioned = base_clip.with_position(("center", pos_y))
-    final_video = CompositeVideoClip([background, positioned])
+    final_video.add_canvas_stage((video_w, video_h), (base_w, base_h), ("center", pos_y))
+    if render_job:
+        render_job.add_canvas_stage((video_w, video_h), (base_w, base_h), ("center", pos_y))
 
-    # 9:16 레터박스 적용 (메인 영상 중앙 정렬)
+    # 9:16 비율 유지 맞춤 (중복 Letterbox 블록은 비활성화 상태)
     TARGET_WIDTH = 1080
     TARGET_HEIGHT = 1920
-    fit_mode = str(get_config_value(["video_settings", "fit_mode"], "letterbox")).lower()
-    top_padding = max(0, int(get_config_value(["video_settings", "top_padding"], 0)))
-    bottom_padding = max(0, int(get_config_value(["video_settings", "bottom_padding"], 0)))
     current_w, current_h = final_video.size
-    if False:  # 중복 Letterbox 블록 비활성화
-        # 먼저 너비를 꽉 채우도록 스케일
-        scale_factor = TARGET_WIDTH / max(1, current_w)
-        print(f"[FIT] Letterbox 모드 적용 (scale={scale_factor:.3f})")
-        resized_clip = final_video.resized(scale_factor)
-
-        # 상하단 패딩 적용 (필요하면 비율이 9:16을 약간 벗어나도 일부 영역이 잘릴 수 있음)
-        available_height = max(1, TARGET_HEIGHT - top_padding - bottom_padding)
-        offset_pixels = float(main_offset_y) * scale_factor
-        print(f"[FIT] Letterbox 가용높이={available_height:.1f}, clip_h={resized_clip.h:.1f}, scale_offset={offset_pixels:.1f}")
-
-        letterbox_color = parse_color(get_config_value(["video_settings", "letterbox_color"], "#000000"))
-        background = ColorClip(size=(TARGET_WIDTH, TARGET_HEIGHT), color=letterbox_color).with_duration(resized_clip.duration)
-        pos_x = (TARGET_WIDTH - resized_clip.w) / 2
-        base_pos_y = top_padding + (available_height - resized_clip.h) / 2
-        min_pos_y = top_padding + min(0, available_height - resized_clip.h)
-        max_pos_y = top_padding + max(0, available_height - resized_clip.h)
-        pos_y = base_pos_y + offset_pixels
-        pos_y = max(min_pos_y, min(max_pos_y, pos_y))
-        print(f"[FIT] Letterbox 위치: pos_x={pos_x:.1f}, pos_y={pos_y:.1f} (범위 {min_pos_y:.1f} ~ {max_pos_y:.1f})")
-        final_video = CompositeVideoClip([background, resized_clip.with_position((pos_x, pos_y))])
-    else:
-        # fit_mode가 letterbox가 아니더라도 비율 유지 (사용자 요청)
-        # 원본 비율을 유지하면서 1080x1920 안에 맞춤
-        if current_w != TARGET_WIDTH or current_h != TARGET_HEIGHT:
-            scale_w = TARGET_WIDTH / max(1, current_w)
-            scale_h = TARGET_HEIGHT / max(1, current_h)
-            scale_factor = min(scale_w, scale_h)  # 작은 쪽 기준으로 스케일 (비율 유지)
-            print(f"[RESIZE] 비율 유지 모드 적용 (scale={scale_factor:.3f})")
-            resized_clip = final_video.resized(scale_factor)
-
-            letterbox_color = parse_color(get_config_value(["video_settings", "letterbox_color"], "#000000"))
-            background = ColorClip(size=(TARGET_WIDTH, TARGET_HEIGHT), color=letterbox_color).with_duration(resized_clip.duration)
-            pos_x = (TARGET_WIDTH - resized_clip.w) / 2
-            pos_y = (TARGET_HEIGHT - resized_clip.h) / 2
-            print(f"[RESIZE] 비디오 크기: {resized_clip.w:.1f}x{resized_clip.h:.1f}, 위치: ({pos_x:.1f}, {pos_y:.1f})")
-            final_video = CompositeVideoClip([background, resized_clip.with_position((pos_x, pos_y))])
+    # fit_mode가 letterbox가 아니더라도 비율 유지 (사용자 요청)
+    # 원본 비율을 유지하면서 1080x1920 안에 맞춤
+    if current_w != TARGET_WIDTH or current_h != TARGET_HEIGHT:
+        scale_w = TARGET_WIDTH / max(1, current_w)
+        scale_h = TARGET_HEIGHT / max(1, current_h)
+        scale_factor = min(scale_w, scale_h)  # 작은 쪽 기준으로 스케일 (비율 유지)
+        print(f"[RESIZE] 비율 유지 모드 적용 (scale={scale_factor:.3f})")
+        resized_w, resized_h = scaled_size(final_video.size, scale_factor)
+
+        letterbox_color = parse_color(CONFIG.video.letterbox_color)
+        pos_x = (TARGET_WIDTH - resized_w) / 2
+        pos_y = (TARGET_HEIGHT - resized_h) / 2
+        print(f"[RESIZE] 비디오 크기: {resized_w:.1f}x{resized_h:.1f}, 위치: ({pos_x:.1f}, {pos_y:.1f})")
+        final_video.add_canvas_stage((TARGET_WIDTH, TARGET_HEIGHT), (resized_w, resized_h), (pos_x, pos_y), letterbox_color)
+        if render_job:
+            render_job.add_canvas_stage((TARGET_WIDTH, TARGET_HEIGHT), (resized_w, resized_h), (pos_x, pos_y), letterbox_color)
 
     # 메인 비디오 위치/스케일 조정 (캔버스 내에서 여백 확보용)
-    main_scale = float(get_layout_value("video", "scale", ["video_settings", "main_video_scale"], 1.0))
-    main_offset_y = int(get_layout_value("video", "offset_y", ["video_settings", "main_video_offset_y"], 40))
+    main_scale = CONFIG.layout.video_scale
+    main_offset_y = CONFIG.layout.video_offset_y
     print(f"[VIDEO] 메인 영상 오프셋/스케일 적용: offset_y={main_offset_y}, scale={main_scale}")
-    base_clip = final_video
-    if main_scale != 1.0:
-        base_clip = base_clip.resized(main_scale)
     video_w, video_h = final_video.size
-    base_w, base_h = base_clip.size
+    base_w, base_h = scaled_size(final_video.size, main_scale)
     center_y = (video_h - base_h) / 2.0
     pos_y = center_y + main_offset_y
-    background = ColorClip(size=(video_w, video_h), color=(0, 0, 0)).with_duration(final_video.duration)
-    positioned = base_clip.with_position(("center", pos_y))
-    final_video = CompositeVideoClip([background, positioned])
+    final_video.add_canvas_stage((video_w, video_h), (base_w, base_h), ("center", pos_y))
+    if render_job:
+        render_job.add_canvas_stage((video_w, video_h), (base_w, base_h), ("center", pos_y))
 
     # 9:16 레터박스 적용 (메인 영상 중앙 정렬)
-    TARGET_WIDTH = 1080
-    TARGET_HEIGHT = 1920
-    fit_mode = str(get_config_value(["video_settings", "fit_mode"], "letterbox")).lower()
-    top_padding = max(0, int(get_config_value(["video_settings", "top_padding"], 0)))
-    bottom_padding = max(0, int(get_config_value(["video_settings", "bottom_padding"], 0)))
+    fit_mode = CONFIG.video.fit_mode
+    top_padding = CONFIG.video.top_padding
+    bottom_padding = CONFIG.video.bottom_padding
     current_w, current_h = final_video.size
     if fit_mode == "letterbox":
         # 먼저 너비를 꽉 채우도록 스케일
         scale_factor = TARGET_WIDTH / max(1, current_w)
         print(f"[FIT] Letterbox 모드 적용 (scale={scale_factor:.3f})")
-        resized_clip = final_video.resized(scale_factor)
+        resized_w, resized_h = scaled_size(final_video.size, scale_factor)
 
         # 상하단 패딩 적용 (필요하면 비율이 9:16을 약간 벗어나도 일부 영역이 잘릴 수 있음)
         available_height = max(1, TARGET_HEIGHT - top_padding - bottom_padding)
         offset_pixels = float(main_offset_y) * scale_factor
-        print(f"[FIT] Letterbox 가용높이={available_height:.1f}, clip_h={resized_clip.h:.1f}, scale_offset={offset_pixels:.1f}")
-
-        letterbox_color = parse_color(get_config_value(["video_settings", "letterbox_color"], "#000000"))
-        background = ColorClip(size=(TARGET_WIDTH, TARGET_HEIGHT), color=letterbox_color).with_duration(resized_clip.duration)
-        pos_x = (TARGET_WIDTH - resized_clip.w) / 2
-        base_pos_y = top_padding + (available_height - resized_clip.h) / 2
-        min_pos_y = top_padding + min(0, available_height - resized_clip.h)
-        max_pos_y = top_padding + max(0, available_height - resized_clip.h)
+        print(f"[FIT] Letterbox 가용높이={available_height:.1f}, clip_h={resized_h:.1f}, scale_offset={offset_pixels:.1f}")
+
+        letterbox_color = parse_color(CONFIG.video.letterbox_color)
+        pos_x = (TARGET_WIDTH - resized_w) / 2
+        base_pos_y = top_padding + (available_height - resized_h) / 2
+        min_pos_y = top_padding + min(0, available_height - resized_h)
+        max_pos_y = top_padding + max(0, available_height - resized_h)
         pos_y = base_pos_y + offset_pixels
         pos_y = max(min_pos_y, min(max_pos_y, pos_y))
         print(f"[FIT] Letterbox 위치: pos_x={pos_x:.1f}, pos_y={pos_y:.1f} (범위 {min_pos_y:.1f} ~ {max_pos_y:.1f})")
-        final_video = CompositeVideoClip([background, resized_clip.with_position((pos_x, pos_y))])
+        final_video.add_canvas_stage((TARGET_WIDTH, TARGET_HEIGHT), (resized_w, resized_h), (pos_x, pos_y), letterbox_color)
+        if render_job:
+            render_job.add_canvas_stage((TARGET_WIDTH, TARGET_HEIGHT), (resized_w, resized_h), (pos_x, pos_y), letterbox_color)
     else:
         # fit_mode가 letterbox가 아니더라도 비율 유지 (사용자 요청)
         # 원본 비율을 유지하면서 1080x1920 안에 맞춤
@@ -3144,36 +2974,34 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
             scale_h = TARGET_HEIGHT / max(1, current_h)
             scale_factor = min(scale_w, scale_h)  # 작은 쪽 기준으로 스케일 (비율 유지)
             print(f"[RESIZE] 비율 유지 모드 적용 (scale={scale_factor:.3f})")
-            resized_clip = final_video.resized(scale_factor)
+            resized_w, resized_h = scaled_size(final_video.size, scale_factor)
 
-            letterbox_color = parse_color(get_config_value(["video_settings", "letterbox_color"], "#000000"))
-            background = ColorClip(size=(TARGET_WIDTH, TARGET_HEIGHT), color=letterbox_color).with_duration(resized_clip.duration)
-            pos_x = (TARGET_WIDTH - resized_clip.w) / 2
-            pos_y = (TARGET_HEIGHT - resized_clip.h) / 2
-            print(f"[RESIZE] 비디오 크기: {resized_clip.w:.1f}x{resized_clip.h:.1f}, 위치: ({pos_x:.1f}, {pos_y:.1f})")
-            final_video = CompositeVideoClip([background, resized_clip.with_position((pos_x, pos_y))])
+            letterbox_color = parse_color(CONFIG.video.letterbox_color)
+            pos_x = (TARGET_WIDTH - resized_w) / 2
+            pos_y = (TARGET_HEIGHT - resized_h) / 2
+            print(f"[RESIZE] 비디오 크기: {resized_w:.1f}x{resized_h:.1f}, 위치: ({pos_x:.1f}, {pos_y:.1f})")
+            final_video.add_canvas_stage((TARGET_WIDTH, TARGET_HEIGHT), (resized_w, resized_h), (pos_x, pos_y), letterbox_color)
+            if render_job:
+                render_job.add_canvas_stage((TARGET_WIDTH, TARGET_HEIGHT), (resized_w, resized_h), (pos_x, pos_y), letterbox_color)
 
     if flash_settings["enabled"] and scene_change_times:
         print(f"\n[FLASH] 씬 전환 플래시 적용 ({len(scene_change_times)}회)")
         flash_opacity = max(0.05, min(1.0, flash_settings["flash_intensity"] / 2.0))
-        flash_clips = []
+        flash_intervals = []
         for change_time in scene_change_times:
             start_time = max(0.0, change_time - flash_settings["flash_duration"] / 2)
             if start_time >= video.duration:
                 continue
-            flash_clip = ColorClip(size=video.size, color=(255, 255, 255))
-            flash_clip = flash_clip.with_duration(flash_settings["flash_duration"]).with_start(start_time)
-            flash_clip = flash_clip.with_opacity(flash_opacity)
-            flash_clips.append(flash_clip)
-        if flash_clips:
-            final_video = CompositeVideoClip([final_video, *flash_clips])
+            flash_intervals.append((start_time, start_time + flash_settings["flash_duration"]))
+        if flash_intervals:
+            final_video.add_flash_layer(video.size, flash_intervals, flash_opacity)
+            if render_job:
+                render_job.add_flash_layer(video.size, flash_intervals, flash_opacity)
 
     # 선택적 리액션 비디오 추가
-    reaction_cfg = get_config_value(["reaction_video"], {}) or {}
-    if reaction_cfg.get("enabled"):
+    if CONFIG.overlay.reaction_enabled:
         reaction_video_dir = "reaction video"
-        height_ratio = float(reaction_cfg.get("height_ratio", 0.2))
-        height_ratio = max(0.05, min(0.5, height_ratio))
+        height_ratio = CONFIG.overlay.reaction_height_ratio
         if os.path.exists(reaction_video_dir):
             reaction_files = [
                 f for f in os.listdir(reaction_video_dir)
@@ -3190,6 +3018,7 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
                     video_height = final_video.h
 
                     reaction_clip = reaction_clip.resized(width=video_width)
+                    reaction_scaled_size = reaction_clip.size
                     target_height = int(video_height * height_ratio)
 
                     if reaction_clip.duration < final_video.duration:
@@ -3203,7 +3032,14 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
                     pos_y = video_height - target_height
 
                     reaction_clip = reaction_clip.with_position((pos_x, pos_y))
-                    final_video = CompositeVideoClip([final_video, reaction_clip])
+                    final_video.add_clip_layer(reaction_clip)
+                    if render_job:
+                        render_job.add_video_layer(
+                            reaction_path,
+                            reaction_scaled_size,
+                            (video_width, target_height),
+                            (pos_x, pos_y)
+                        )
 
                     print(f"   [SUCCESS] 리액션 비디오 추가 완료 (너비: {video_width}px, 표시 높이: {target_height}px, 위치: 하단)")
                 except Exception as e:
@@ -3222,6 +3058,7 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
     # AI 대사 자막은 맨 마지막에 추가 (리액션 비디오 뒤)
     # 자막 클립을 먼저 생성만 함
     subtitle_clips = []
+    subtitle_exit_durations = []
     if add_subtitles and segments:
         print(f"\n[NOTE] AI 대사 자막 추가 중... (총 {len(segments)}개)")
 
@@ -3237,35 +3074,34 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
         STANDARD_HEIGHT = 1920
 
         # 자막 폰트 크기: 1080x1920 기준 35px
-        subtitle_font_size = int(get_layout_value("subtitle", "font_size", ["subtitle_settings", "text_size"], 35))
+        subtitle_font_size = CONFIG.layout.subtitle_font_size
 
         # 자막 색상: 파라미터로 전달된 색상 우선, 없으면 config 사용
         if subtitle_color is None:
             subtitle_color = get_config_value(["subtitle_settings", "text_color"], "pink")
-        subtitle_stroke_width = int(get_config_value(["subtitle_settings", "stroke_width"], 5))
-        subtitle_stroke_color = get_config_value(["subtitle_settings", "stroke_color"], "black")
-        subtitle_style = str(get_config_value(["subtitle_settings", "style"], "capcut") or "capcut").lower()
-        subtitle_line_spacing = int(get_config_value(
-            ["subtitle_settings", "line_spacing"],
-            max(6, subtitle_font_size // 6)
-        ))
-        italic_shear = float(get_config_value(["subtitle_settings", "italic_shear"], 0.22))
+        subtitle_stroke_width = CONFIG.subtitle.stroke_width
+        subtitle_stroke_color = CONFIG.subtitle.stroke_color
+        subtitle_style = CONFIG.subtitle.style
+        subtitle_line_spacing = CONFIG.subtitle.line_spacing
+        if subtitle_line_spacing is None:
+            subtitle_line_spacing = max(6, subtitle_font_size // 6)
+        italic_shear = CONFIG.subtitle.italic_shear
         use_slanted_style = subtitle_style in {"sports_slant", "k-wave", "hangul_slant", "kwave", "bold_slant"}
         language_code = str(get_config_value(["voice_settings", "language"], "en") or "").lower()
         prefer_cjk_language = any(language_code.startswith(prefix) for prefix in ("ko", "ja", "zh"))
-        force_pil_renderer = prefer_cjk_language or bool(get_config_value(["subtitle_settings", "force_pil_renderer"], False))
+        force_pil_renderer = prefer_cjk_language or CONFIG.subtitle.force_pil_renderer
 
         # 랜덤 색상 설정
-        random_colors_enabled = get_config_value(["subtitle_settings", "random_colors", "enabled"], False)
+        random_colors_enabled = CONFIG.subtitle.random_colors_enabled
         random_colors_list = get_config_value(["subtitle_settings", "random_colors", "colors"], ["pink"])
         current_color_index = 0
 
         # 하단 여백: 1920 기준 600px - 더 위쪽에 표시
-        subtitle_bottom_margin = int(get_layout_value("subtitle", "bottom_margin", ["subtitle_settings", "bottom_margin"], 600))
+        subtitle_bottom_margin = CONFIG.layout.subtitle_bottom_margin
 
         # 자막 최대 너비: 현재 비디오 너비의 85%로 설정 (화면 밖으로 나가지 않도록)
         video_width = final_video.w
-        side_margin = int(get_layout_value("subtitle", "side_margin", ["subtitle_settings", "side_margin"], 90))
+        side_margin = CONFIG.layout.subtitle_side_margin
         video_height = final_video.h
         TARGET_WIDTH = 1080
         TARGET_HEIGHT = 1920
@@ -3282,23 +3118,118 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
         subtitle_max_width = max(200, video_width - (2 * side_margin))
         print(f"[SUBTITLE] 자막 설정: 폰트={subtitle_font_size}px, 최대너비={subtitle_max_width}px (비디오: {video_width}px)")
 
-        subtitle_exit_cfg = get_config_value(["subtitle_settings", "exit_animation"], {}) or {}
-        subtitle_exit_vertical_offset = _safe_float(subtitle_exit_cfg.get("vertical_offset"), 60)
-        subtitle_exit_scale_reduction = _safe_float(subtitle_exit_cfg.get("scale_reduction"), 0.08)
+        subtitle_exit_vertical_offset = CONFIG.subtitle.exit_vertical_offset
+        subtitle_exit_scale_reduction = CONFIG.subtitle.exit_scale_reduction
         subtitle_clips = []
         last_subtitle_end = 0  # 이전 자막이 끝나는 시간 추적
         min_subtitle_gap = 0.2  # 자막 간 최소 간격 (초)
 
+        # 자막 스프라이트 캐시 (텍스트/폰트/스타일 키, 메모리 LRU + 디스크)
+        sprite_cache = None
+        if CONFIG.subtitle.sprite_cache_enabled:
+            sprite_cache = get_subtitle_sprite_cache(
+                CONFIG.subtitle.sprite_cache_dir or os.path.join(CONFIG.paths.temp_dir, "subtitle_cache"),
+                CONFIG.subtitle.sprite_cache_memory_mb,
+                CONFIG.subtitle.sprite_cache_disk_mb,
+            )
+        sprite_workers = CONFIG.subtitle.sprite_workers
+        subtitle_font_id = font_identity(subtitle_font_path, FONT_INDEX_OVERRIDES.get(subtitle_font_path, 0))
+        subtitle_shear = italic_shear if use_slanted_style else 0.0
+        if force_pil_renderer:
+            print("   [FALLBACK] 한국어/일본어/중국어 모드 → PIL 자막 렌더러 사용")
+
+        # 1단계: 색상 결정 + 렌더링 작업 목록 작성 (타이밍은 렌더링 결과를 본 뒤 3단계에서)
+        subtitle_entries = []
         for idx, segment in enumerate(segments):
             text = segment['text'].strip()
             start_time = float(segment['start'])
             end_time = float(segment['end'])
 
+            # 시작이 비디오 끝 이후면 겹침 조정과 무관하게 제외
+            if start_time >= video.duration:
+                print(f"   [SKIP] 자막 {idx+1} 제외: 시작({start_time:.2f}초)이 비디오 끝({video.duration:.2f}초)을 초과")
+                continue
+
+            # 랜덤 색상 선택 (활성화된 경우)
+            if random_colors_enabled and random_colors_list:
+                current_subtitle_color = random_colors_list[current_color_index % len(random_colors_list)]
+                current_color_index += 1
+            else:
+                current_subtitle_color = subtitle_color
+
+            effective_width = max(50, subtitle_max_width - subtitle_margin * 2)  # 좌우 margin 고려
+            render_args = (
+                text,
+                subtitle_font_path,
+                subtitle_font_size,
+                current_subtitle_color,
+                subtitle_stroke_color,
+                subtitle_stroke_width,
+                (subtitle_margin, subtitle_margin, subtitle_margin, subtitle_margin),
+                subtitle_line_spacing,
+                effective_width,
+                subtitle_shear,
+            )
+            key_fields = dict(
+                text=text,
+                font=subtitle_font_id,
+                font_size=subtitle_font_size,
+                color=parse_color(current_subtitle_color, (255, 255, 255)),
+                stroke_color=parse_color(subtitle_stroke_color, (0, 0, 0)),
+                stroke_width=subtitle_stroke_width,
+                margin=subtitle_margin,
+                line_spacing=subtitle_line_spacing,
+                max_width=effective_width,
+                shear=round(subtitle_shear, 4),
+            )
+            # 캐시 키는 실제로 사용한 렌더러 기준 (TextClip 실패 시 PIL 결과는 "pil" 키에 저장)
+            pil_key = sprite_cache_key(renderer="pil", **key_fields)
+            cache_key = pil_key if force_pil_renderer else sprite_cache_key(renderer="textclip", **key_fields)
+            subtitle_entries.append((idx, text, start_time, end_time, cache_key, pil_key, render_args))
+
+        # 2단계: 캐시에 없는 자막만 스레드 풀에서 미리 렌더링
+        def render_sprites(jobs):
+            if sprite_cache is not None:
+                return sprite_cache.prerender(jobs, max_workers=sprite_workers)
+            rendered = {}
+            for cache_key, renderer in jobs:
+                if cache_key in rendered:
+                    continue
+                try:
+                    rendered[cache_key] = renderer()
+                except Exception as e:
+                    print(f"   [WARNING] 자막 스프라이트 렌더링 실패: {e}")
+            return rendered
+
+        subtitle_sprites = render_sprites([
+            (cache_key, lambda args=render_args, textclip=cache_key != pil_key: render_subtitle_sprite(
+                *args, use_textclip=textclip, fallback=False
+            ))
+            for _, _, _, _, cache_key, pil_key, render_args in subtitle_entries
+        ])
+        fallback_jobs = [
+            (pil_key, lambda args=render_args: render_subtitle_sprite(*args))
+            for _, _, _, _, cache_key, pil_key, render_args in subtitle_entries
+            if cache_key not in subtitle_sprites and cache_key != pil_key
+        ]
+        if fallback_jobs:
+            print(f"   [FALLBACK] TextClip 자막 {len(fallback_jobs)}개 생성 실패, PIL 렌더링 사용")
+            subtitle_sprites.update(render_sprites(fallback_jobs))
+        if sprite_cache is not None:
+            sprite_cache.report("   [CACHE]")
+
+        # 3단계: 겹침 방지 타이밍 + 위치 지정 (렌더링에 실패한 자막은 간격 계산에서 제외)
+        for idx, text, start_time, end_time, cache_key, pil_key, _ in subtitle_entries:
+            sprite = subtitle_sprites.get(cache_key)
+            if sprite is None:
+                sprite = subtitle_sprites.get(pil_key)
+            if sprite is None:
+                print(f"   [WARNING] 자막 생성 실패 [{idx+1}]")
+                continue
+
             # 자막 지속 시간 계산
             duration = end_time - start_time
-            min_duration = float(get_config_value(["subtitle_settings", "min_duration"], 1.2))
-            extra_hold = float(get_config_value(["subtitle_settings", "extra_hold"], 0.6))
-            duration = max(duration + extra_hold, min_duration)
+            duration = max(duration + CONFIG.subtitle.extra_hold, CONFIG.subtitle.min_duration)
 
             # 자막 겹침 방지: 이전 자막과 겹치면 시작 시간 조정
             adjusted_start = start_time
@@ -3323,94 +3254,33 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
 
             start_time = adjusted_start
 
-            try:
-                # 자막 클립 생성 (method="caption"으로 자동 줄바꿈)
-                effective_width = max(50, subtitle_max_width - subtitle_margin * 2)  # 좌우 margin 고려
-                wrapped_text = wrap_text_preserving_words(
-                    text,
-                    subtitle_font_path,
-                    subtitle_font_size,
-                    effective_width,
-                    subtitle_stroke_width
-                )
-
-                # 랜덤 색상 선택 (활성화된 경우)
-                if random_colors_enabled and random_colors_list:
-                    current_subtitle_color = random_colors_list[current_color_index % len(random_colors_list)]
-                    current_color_index += 1
-                else:
-                    current_subtitle_color = subtitle_color
+            # 다음 자막을 위해 현재 자막의 끝나는 시간 저장
+            last_subtitle_end = start_time + duration
 
-                subtitle_clip = None
-                textclip_error = None
+            subtitle_clip = SpriteClip(sprite)
 
-                if not force_pil_renderer:
-                    try:
-                        subtitle_clip = TextClip(
-                            text=wrapped_text,
-                            font=get_textclip_font_name(subtitle_font_path),
-                            font_size=subtitle_font_size,
-                            color=current_subtitle_color,
-                            stroke_color=subtitle_stroke_color,
-                            stroke_width=subtitle_stroke_width,
-                            margin=(subtitle_margin, subtitle_margin, subtitle_margin, subtitle_margin),
-                            interline=subtitle_line_spacing,
-                            method="caption",  # 줄바꿈은 wrap_text_preserving_words 에서 제어
-                            size=(effective_width, None),  # margin을 제외한 텍스트 영역 너비 (3270번 줄에서 계산됨)
-                            text_align="center"  # 중앙 정렬
-                        )
-                    except Exception as exc:
-                        textclip_error = exc
-
-                if subtitle_clip is None:
-                    if textclip_error:
-                        print(f"   [FALLBACK] TextClip 자막 생성 실패, PIL 렌더링 사용 ({textclip_error})")
-                    elif force_pil_renderer:
-                        print("   [FALLBACK] 한국어/일본어/중국어 모드 → PIL 자막 렌더러 사용")
-
-                    subtitle_clip = create_pil_subtitle_clip(
-                        wrapped_text,
-                        subtitle_font_path,
-                        subtitle_font_size,
-                        current_subtitle_color,
-                        subtitle_stroke_color,
-                        subtitle_stroke_width,
-                        (subtitle_margin, subtitle_margin, subtitle_margin, subtitle_margin),
-                        subtitle_line_spacing,
-                        italic_shear if use_slanted_style else 0.0
-                    )
-                elif use_slanted_style:
-                    subtitle_clip = convert_textclip_to_slanted_imageclip(subtitle_clip, italic_shear)
-
-                # 화면 하단에 위치 (1920 기준 400px 위)
-                # 현재 비디오 높이에 맞춰 비율 조정
-                y_position = video_height - subtitle_bottom_margin
-
-                # 자막이 화면 밖으로 나가지 않도록 조정
-                if y_position < 0:
-                    y_position = video_height // 2  # 너무 작으면 중앙에 표시
-                elif y_position + subtitle_clip.h > video_height:
-                    y_position = video_height - subtitle_clip.h - 50  # 최소 50px 여백
-
-                subtitle_clip = (
-                    subtitle_clip.with_start(start_time)
-                               .with_duration(duration)
-                               .with_position(('center', y_position))
-                )
+            # 화면 하단에 위치 (1920 기준 400px 위)
+            # 현재 비디오 높이에 맞춰 비율 조정
+            y_position = video_height - subtitle_bottom_margin
 
-                # 자막이 사라질 때 opacity만 낮춰지면서 빠르게 페이드아웃
-                subtitle_exit_duration = min(0.25, max(0.15, duration * 0.2))
-                subtitle_clip = subtitle_clip.with_effects([FadeOut(subtitle_exit_duration)])
+            # 자막이 화면 밖으로 나가지 않도록 조정
+            if y_position < 0:
+                y_position = video_height // 2  # 너무 작으면 중앙에 표시
+            elif y_position + subtitle_clip.h > video_height:
+                y_position = video_height - subtitle_clip.h - 50  # 최소 50px 여백
 
-                subtitle_clips.append(subtitle_clip)
-                print(f"   [OK] [{idx+1}/{len(segments)}] {start_time:.1f}초 (y={y_position}): {text[:40]}...")
+            subtitle_clip = (
+                subtitle_clip.with_start(start_time)
+                           .with_duration(duration)
+                           .with_position(('center', y_position))
+            )
 
-                # 다음 자막을 위해 현재 자막의 끝나는 시간 저장
-                last_subtitle_end = start_time + duration
+            # 자막이 사라질 때 빠르게 페이드아웃 (합성 단계에서 FadeOut과 같은 방식으로 처리)
+            subtitle_exit_duration = min(0.25, max(0.15, duration * 0.2))
 
-            except Exception as e:
-                print(f"   [WARNING] 자막 생성 실패 [{idx+1}]: {e}")
-                continue
+            subtitle_clips.append(subtitle_clip)
+            subtitle_exit_durations.append(subtitle_exit_duration)
+            print(f"   [OK] [{idx+1}/{len(segments)}] {start_time:.1f}초 (y={y_position}): {text[:40]}...")
 
         if subtitle_clips:
             print(f"[OK] {len(subtitle_clips)}개 자막 클립 생성 완료 (하단에서 {subtitle_bottom_margin}px 위)")
@@ -3612,7 +3482,7 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
                 cropped_text = rotated_image.crop(text_rotated_bbox)
                 text_np = np.array(cropped_text)
                 if text_np.size:
-                    text_clip = ImageClip(text_np).with_duration(video.duration)
+                    text_clip = SpriteClip(Sprite.from_rgba(text_np), duration=video.duration)
                     if text_position_override is not None:
                         text_position = text_position_override
                     else:
@@ -3626,7 +3496,7 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
                 cropped_icon = rotated_image.crop(icon_bbox)
                 icon_np = np.array(cropped_icon)
                 if icon_np.size:
-                    icon_clip = ImageClip(icon_np).with_duration(video.duration)
+                    icon_clip = SpriteClip(Sprite.from_rgba(icon_np), duration=video.duration)
                     if icon_position_override is not None:
                         icon_position = icon_position_override
                     else:
@@ -3637,14 +3507,17 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
                     overlays.append(icon_clip.with_position(icon_position))
 
             if overlays:
-                final_video = CompositeVideoClip([final_video, *overlays])
+                for overlay_clip in overlays:
+                    final_video.add_clip_layer(overlay_clip)
+                    if render_job:
+                        render_job.add_clip_layer(overlay_clip)
             else:
                 print("[WARNING] 폴더 오버레이를 생성하지 못했습니다.")
 
     # 프레임 오버레이 추가
-    frame_overlay_cfg = get_config_value(["frame_overlay"], {}) or {}
-    if frame_overlay_cfg.get("enabled", False):
-        image_path = frame_overlay_cfg.get("image_path")
+    frame_overlay_cfg = CONFIG.overlay
+    if frame_overlay_cfg.frame_enabled:
+        image_path = frame_overlay_cfg.frame_image_path
         resolved_path = image_path
         if resolved_path and not os.path.isabs(resolved_path):
             resolved_path = os.path.join(os.getcwd(), resolved_path)
@@ -3653,24 +3526,26 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
                 frame_clip = ImageClip(resolved_path).with_duration(final_video.duration)
 
                 video_w, video_h = final_video.size
-                scale = float(frame_overlay_cfg.get("scale", 1.0))
+                scale = frame_overlay_cfg.frame_scale
                 target_w = max(1, int(video_w * scale))
                 target_h = max(1, int(video_h * scale))
                 frame_clip = frame_clip.resized((target_w, target_h))
                 print(f"[FRAME] 오버레이 크기 조정: {target_w}x{target_h} (scale={scale})")
 
-                opacity = float(frame_overlay_cfg.get("opacity", 1.0))
+                opacity = frame_overlay_cfg.frame_opacity
                 if 0.0 <= opacity < 1.0:
                     frame_clip = frame_clip.with_opacity(opacity)
 
-                position_cfg = frame_overlay_cfg.get("position", "center") or "center"
+                position_cfg = frame_overlay_cfg.frame_position or "center"
                 if isinstance(position_cfg, str) and position_cfg == "center":
                     position = ("center", "center")
                 else:
                     position = position_cfg
                 frame_clip = frame_clip.with_position(position)
 
-                final_video = CompositeVideoClip([final_video, frame_clip])
+                final_video.add_clip_layer(frame_clip)
+                if render_job:
+                    render_job.add_clip_layer(frame_clip)
                 print(f"\n[FRAME] 프레임 오버레이 적용: {image_path}")
             except Exception as e:
                 print(f"\n[FRAME] 프레임 오버레이 적용 실패: {e}")
@@ -3680,7 +3555,10 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
     # 자막을 맨 마지막에 추가 (최상단 레이어)
     if subtitle_clips:
         print(f"\n[SUBTITLE] 자막을 최상단 레이어로 추가 중... ({len(subtitle_clips)}개)")
-        final_video = CompositeVideoClip([final_video] + subtitle_clips)
+        for subtitle_clip, exit_duration in zip(subtitle_clips, subtitle_exit_durations):
+            final_video.add_clip_layer(subtitle_clip, fade_out=exit_duration)
+            if render_job:
+                render_job.add_clip_layer(subtitle_clip, fade_out=exit_duration)
         print(f"[OK] 자막이 최상단에 추가되었습니다")
 
     # 최종 크기 확인 및 9:16 강제
@@ -3697,18 +3575,24 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
         print(f"[OK] 이미 올바른 크기 (9:16): {TARGET_WIDTH}x{TARGET_HEIGHT}")
 
     print("[VIDEO] 최종 비디오 생성 중...")
+    _mark_job("rendering")
 
     # 비디오 저장 (H.264 코덱, AAC 오디오)
-    # 동시 인코딩을 위한 인스턴스별 temp 파일명
-    temp_dir = get_config_value(["paths", "temp_dir"], "Temp")
+    # 동시 인코딩을 위한 인스턴스별 temp 파일명 (배치 워커는 작업 폴더 안)
+    temp_dir = job_temp_dir()
     temp_audio_file = os.path.join(temp_dir, f"temp-audio-{os.getpid()}.m4a")
 
+    # 믹스다운한 사운드트랙을 AAC 스트림 하나로 인코딩해 두고 두 백엔드 모두 스트림 복사로 mux
+    audio_codec = CONFIG.audio.audio_codec
+    soundtrack_file = None
+    if mixed_audio is not None:
+        soundtrack_file = encode_audio(mixed_audio, temp_audio_file, NARRATION_SAMPLE_RATE, audio_codec)
+
     video_write_kwargs = {
-        "codec": get_config_value(["audio_settings", "codec"], "libx264"),
-        "audio_codec": get_config_value(["audio_settings", "audio_codec"], "aac"),
-        "temp_audiofile": temp_audio_file,
-        "remove_temp": True,
-        "threads": 2,  # FFmpeg 스레드 수 제한 (동시 인코딩 대응)
+        "codec": CONFIG.audio.codec,
+        "audio": soundtrack_file or False,
+        "audio_codec": "copy",
+        "threads": render_threads(),  # FFmpeg 스레드 수 제한 (배치 워커는 코어를 나눠 씀)
         "fps": 30,
     }
 
@@ -3724,27 +3608,47 @@ def overlay_voice_on_video(video_path, segments, output_path, metadata=None, fol
     if ffmpeg_params:
         video_write_kwargs["ffmpeg_params"] = ffmpeg_params
 
-    final_video.write_videofile(
-        output_path,
-        **video_write_kwargs,
-    )
+    rendered = False
+    if render_job:
+        if soundtrack_file:
+            render_job.set_audio_file(soundtrack_file)
+        try:
+            render_job.render(
+                output_path,
+                codec=video_write_kwargs["codec"],
+                bitrate=configured_bitrate,
+                preset=configured_preset,
+                ffmpeg_params=ffmpeg_params,
+                threads=video_write_kwargs["threads"],
+            )
+            rendered = True
+        except Exception as e:
+            print(f"[WARNING] ffmpeg 백엔드 렌더링 실패, moviepy로 다시 렌더링합니다: {e}")
+
+    try:
+        if not rendered:
+            final_video.write_videofile(
+                output_path,
+                **video_write_kwargs,
+            )
+    finally:
+        if soundtrack_file and os.path.exists(soundtrack_file):
+            os.remove(soundtrack_file)
+
+    if filter_chain:
+        filter_chain.report()
+    layer_timeline.report()
 
     # 리소스 정리
     video.close()
     final_video.close()
-    for clip in voice_clips:
-        clip.close()
-
-    for temp_file in temp_voice_files:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
 
     print(f"\n[OK] 음성 오버레이 및 자막 완료: {output_path}")
     return output_path
 
 
 def auto_upload_processed_video(video_path=None, metadata=None):
-    """처리된 비디오를 자동으로 업로드 (환경 설정에 따라 멀티 계정 지원)."""
+    """처리된 비디오를 자동으로 업로드 (환경 설정에 따라 멀티 계정 지원). 업로드한 비디오 id 반환."""
     if not get_config_value(["youtube_settings", "auto_upload"], False):
         return
 
@@ -3753,7 +3657,7 @@ def auto_upload_processed_video(video_path=None, metadata=None):
         return
 
     if video_path is None:
-        output_dir = get_config_value(["paths", "output_dir"], "Output")
+        output_dir = CONFIG.paths.output_dir
         candidate_path = os.path.join(output_dir, "final_video.mp4")
         if not os.path.exists(candidate_path):
             print("[WARNING] 자동 업로드를 건너뜁니다. 출력 비디오를 찾을 수 없습니다.")
@@ -3795,31 +3699,41 @@ def auto_upload_processed_video(video_path=None, metadata=None):
         video_id = uploader(video_path=video_path, metadata=metadata)
         if video_id:
             print(f"[UPLOAD] 자동 업로드 완료: {video_id}")
+        return video_id
     except Exception as exc:
         print(f"[ERROR] 자동 업로드 실패: {exc}")
 
 
-def main():
-    """메인 실행 함수"""
+def main(job=None):
+    """
+    메인 실행 함수 (비디오 하나 처리 후 출력 경로 반환, 건너뛰거나 실패하면 None).
+
+    job: (입력 비디오, 원본 경로, 폴더 이름), 생략하면 작업 저장소에서 다음 대기 작업을 잡아 처리
+    """
+    if job is None:
+        store = _job_store()
+        _discover_inputs(store, CONFIG.paths.input_dir)
+        stored = store.next_job(stale_minutes=CONFIG.batch.claim_ttl_minutes)
+        if stored is None:
+            print(f"[ERROR] '{CONFIG.paths.input_dir}'와 하위 폴더에 처리할 비디오가 없습니다.")
+            return None
+        return _run_stored_job(stored)
 
     # MoviePy 임시 디렉토리를 인스턴스별로 분리 (동시 인코딩 대응)
-    temp_dir = get_config_value(["paths", "temp_dir"], "Temp")
+    temp_dir = job_temp_dir()
     moviepy_temp_dir = os.path.join(temp_dir, f"moviepy_{os.getpid()}")
     os.makedirs(moviepy_temp_dir, exist_ok=True)
     os.environ["MOVIEPY_TEMP_DIR"] = moviepy_temp_dir
     print(f"[INIT] MoviePy temp 디렉토리: {moviepy_temp_dir}")
 
     # 입력/출력 경로 설정
-    input_dir = get_config_value(["paths", "input_dir"], "Input")
-    try:
-        input_video, original_source, folder_name = find_first_video_file(input_dir)
-    except FileNotFoundError as exc:
-        print(f"[ERROR] {exc}")
-        return
+    input_dir = CONFIG.paths.input_dir
+    input_video, original_source, folder_name = job
     print(f"\n[VIDEO] 분석 대상 비디오: {input_video}")
     if folder_name:
         print(f"[FOLDER] 폴더 이름: {folder_name}")
 
+    _mark_job("scripting")
     try:
         script = generate_script_with_gemini(input_video)
     except Exception as exc:
@@ -3839,8 +3753,10 @@ def main():
             if cleaned:
                 print(f"[DELETE] 추출된 임시 비디오 삭제: {input_video}")
 
-            # 원본 파일을 Used/Blocked 폴더로 이동
-            if original_source:
+            _mark_job("failed", error="PROHIBITED_CONTENT")
+
+            # 원본 파일을 Used/Blocked 폴더로 이동 (ZIP에 남은 작업이 있으면 마지막 작업이 옮김)
+            if original_source and not _origin_still_needed(original_source):
                 used_root = os.path.join(input_dir, "Used", "Blocked")
                 os.makedirs(used_root, exist_ok=True)
                 dest_path = os.path.join(used_root, os.path.basename(original_source))
@@ -3867,6 +3783,7 @@ def main():
                 script = script_file.read()
         else:
             print(f"\n[ERROR] 대체 스크립트도 없습니다. 처리를 중단합니다.")
+            _mark_job("failed", error=f"스크립트 생성 실패: {exc}")
 
             # 에러 발생 시에도 파일 정리
             cleaned = cleanup_extracted_video(input_video)
@@ -3898,7 +3815,7 @@ def main():
     # if metadata.get('thumbnail_title'):  # 비활성화됨
     #     print(f"[NOTE] Thumbnail title: {metadata['thumbnail_title']}")
 
-    output_dir = get_config_value(["paths", "output_dir"], "Output")
+    output_dir = CONFIG.paths.output_dir
     os.makedirs(output_dir, exist_ok=True)
 
     base_name = (
@@ -3980,7 +3897,8 @@ def main():
     print(f"\n[OK] 최종 출력 파일: {final_output_path}")
 
     # 자동 업로드 (필요 시)
-    auto_upload_processed_video(final_output_path, metadata)
+    video_id = auto_upload_processed_video(final_output_path, metadata)
+    _mark_job("uploaded" if video_id else "rendered", output_path=os.path.abspath(final_output_path))
 
     # 처리 완료 후 입력 파일 이동/정리
     cleaned = cleanup_extracted_video(input_video)
@@ -3988,7 +3906,7 @@ def main():
         print(f"\n[DELETE]  추출된 임시 비디오 삭제: {input_video}")
 
     moved_paths = set()
-    if original_source:
+    if original_source and not _origin_still_needed(original_source):
         if move_input_file_to_used(original_source):
             moved_paths.add(os.path.abspath(original_source))
 
@@ -3996,51 +3914,94 @@ def main():
     if input_abs not in moved_paths and not cleaned:
         move_input_file_to_used(input_video)
 
+    return final_output_path
+
+
+def process_video_job(job, workdir, threads=None):
+    """배치 워커(자식 프로세스)에서 선점된 작업 하나 처리 → {"output": 출력 경로, "duration": 출력 길이(초)}."""
+    global _JOB_TEMP_DIR, _RENDER_THREADS
+    _JOB_TEMP_DIR = workdir
+    _RENDER_THREADS = threads
+
+    output = _run_stored_job(job)
+    duration = None
+    if output and os.path.exists(output):
+        try:
+            duration = probe_media(output).duration
+        except Exception as exc:
+            print(f"[WARNING] 출력 길이 확인 실패: {exc}")
+    return {"output": output, "duration": duration}
+
+
+def process_all_videos_parallel(workers):
+    """
+    Input 폴더의 비디오를 워커 프로세스 workers개로 나눠 동시에 처리.
+
+    - 입력 색인/중복 체크는 부모에서 작업 저장소로 한 번만
+    - 작업 저장소에서 queued → scripting 으로 바꿔 선점하므로 같은 비디오를 두 워커(또는 다른 배치)가 잡지 않음
+    - 워커마다 Temp/workers/ 아래 작업 폴더 (MoviePy temp, 임시 오디오, ffmpeg 작업 파일)
+    - 워커가 죽어도 작업만 failed로 남기고 나머지를 계속 진행, 마지막에 처리량을 출력
+    """
+    input_dir = CONFIG.paths.input_dir
+    store = _job_store()
+
+    print(f"[VIDEO] 비디오 배치 처리 시작 (워커 {workers}개)...")
+    print("=" * 60)
+
+    _discover_inputs(store, input_dir)
+    jobs = store.claimable_jobs(CONFIG.batch.claim_ttl_minutes)
+    if not jobs:
+        print(f"[OK] 처리할 비디오가 없습니다: {input_dir}")
+        return None
+
+    threads = default_ffmpeg_threads(workers, CONFIG.batch.ffmpeg_threads)
+    print(f"[BATCH] 워커당 ffmpeg 스레드: {threads}")
+    summary = run_batch(
+        jobs,
+        process_video_job,
+        workers,
+        os.path.join(CONFIG.paths.temp_dir, "workers"),
+        store.claims(CONFIG.batch.claim_ttl_minutes),
+        job_key=lambda job: job.id,
+        job_label=lambda job: job.name,
+        target_kwargs={"threads": threads},
+    )
+
+    print(f"\n{'=' * 60}")
+    print(f"[OK] 모든 비디오 처리 완료!")
+    print(f"   총 {summary['done']}개의 비디오 처리됨 (실패 {summary['failed']}개)")
+    print(f"{'=' * 60}")
+    return summary
+
 
 def process_all_videos():
-    """Input 폴더의 모든 비디오를 순차적으로 처리"""
-    import hashlib
+    """Input 폴더의 모든 비디오를 처리 (batch_settings.workers > 1이면 멀티 프로세스 배치)"""
+    workers = CONFIG.batch.workers
+    if workers > 1:
+        return process_all_videos_parallel(workers)
 
-    input_dir = get_config_value(["paths", "input_dir"], "Input")
+    input_dir = CONFIG.paths.input_dir
+    store = _job_store()
     processed_count = 0
-    processed_hashes = set()  # 처리된 비디오 해시 저장
 
     print("[VIDEO] 비디오 자동 처리 시작...")
     print("=" * 60)
 
     while True:
-        try:
-            # 비디오 파일 찾기
-            next_video, next_video_origin, _ = find_first_video_file(input_dir)
-        except FileNotFoundError:
+        # 새로 들어온/바뀐 입력만 색인한 뒤 다음 대기 작업 선점 (중복은 저장소가 걸러 냄)
+        _discover_inputs(store, input_dir)
+        job = store.next_job(stale_minutes=CONFIG.batch.claim_ttl_minutes)
+        if job is None:
             # 더 이상 비디오가 없으면 종료
             break
 
-        # 비디오 파일 해시 계산 (중복 체크)
-        try:
-            with open(next_video, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
-
-            if file_hash in processed_hashes:
-                print(f"\n[SKIP] 이미 처리된 비디오입니다 (중복): {os.path.basename(next_video)}")
-                # 중복 파일 삭제
-                cleanup_extracted_video(next_video)
-                # 원본 ZIP 파일도 이동
-                if next_video_origin:
-                    move_input_file_to_used(next_video_origin)
-                continue
-
-            processed_hashes.add(file_hash)
-        except Exception as e:
-            print(f"\n[WARNING] 해시 계산 실패: {e}")
-
         processed_count += 1
         print(f"\n{'=' * 60}")
         print(f"[VIDEO] 처리 중: {processed_count}번째 비디오")
         print(f"{'=' * 60}")
 
         # 메인 처리 함수 호출
-        main()
+        _run_stored_job(job)
 
         # 3개마다 자동 병합 (비활성화 - run_mac.sh에서 일괄 병합)
         # if processed_count % 3 == 0:
@@ -6,6 +6,11 @@
 
 from PIL import Image, ImageDraw, ImageFont
 import os
+import sys
+
+# 외곽선 렌더러는 ranking-videos/scripts 와 공유
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ranking-videos', 'scripts'))
+from text_outline import draw_outlined_text
 
 def create_banner(
     text="🚀 무료 팔로워 100명: 인스트라이크.COM",
@@ -13,7 +18,9 @@ def create_banner(
     height=120,
     bg_color="#2B4D8C",  # 진한 파란색
     text_color="#FFFFFF",  # 흰색
-    output_path=None
+    output_path=None,
+    stroke_color=None,
+    stroke_width=0
 ):
     """
     광고 배너 이미지 생성
@@ -25,6 +32,8 @@ def create_banner(
         bg_color: 배경색 (hex 코드)
         text_color: 텍스트 색상 (hex 코드)
         output_path: 저장 경로
+        stroke_color: 텍스트 외곽선 색상 (None이면 외곽선 없음)
+        stroke_width: 외곽선 두께 (px)
     """
     # 이미지 생성
     img = Image.new('RGB', (width, height), bg_color)
@@ -50,8 +59,8 @@ def create_banner(
     x = (width - text_width) // 2
     y = (height - text_height) // 2
 
-    # 텍스트 그리기
-    draw.text((x, y), text, font=font, fill=text_color)
+    # 텍스트 그리기 (외곽선은 지정된 경우에만)
+    draw_outlined_text(img, (x, y), text, font, text_color, stroke_color, stroke_width)
 
     # 저장
     if output_path is None:
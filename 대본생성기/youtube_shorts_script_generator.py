@@ -30,6 +30,21 @@ import logging
 # byteplussdkarkruntime removed due to installation issues on Python 3.13
 Ark = None # Placeholder to minimize diff noise, though we won't use it
 
+# Shared media probe cache (ranking-videos/scripts/media_probe.py); ffprobe is used when unavailable
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ranking-videos" / "scripts"))
+try:
+    from media_probe import probe_media
+except ImportError:
+    probe_media = None
+
+# Shared TTS result cache (ranking-videos/scripts/tts_cache.py); TTS is always called when unavailable
+try:
+    from tts_cache import get_tts_cache, tts_cache_key
+except ImportError:
+    get_tts_cache = None
+    tts_cache_key = None
+
 # Configure logging
 logging.basicConfig(
     filename='server_debug.log',
@@ -281,7 +296,28 @@ def load_last_output() -> Dict:
         return default_values
 
 
-def text_to_speech(text: str, language: str = "Korean", restaurant_name: str = "") -> str:
+def _tts_cache():
+    """Shared TTS result cache, or None when tts_cache.py is unavailable."""
+    if get_tts_cache is None:
+        return None
+    try:
+        return get_tts_cache()
+    except OSError as e:
+        print(f"TTS cache unavailable: {e}")
+        return None
+
+
+def _tts_output_path(restaurant_name: str, suffix: str = "") -> Path:
+    """Timestamped audio file path for a restaurant under TTS_AUDIO_DIR."""
+    TTS_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    safe_restaurant = restaurant_name.strip().replace("/", "_").replace("\\", "_")
+    if not safe_restaurant:
+        safe_restaurant = "restaurant"
+    return TTS_AUDIO_DIR / f"{safe_restaurant}_{timestamp}{suffix}.mp3"
+
+
+def text_to_speech_google(text: str, language: str = "Korean", restaurant_name: str = "") -> str:
     """
     Convert text to speech using Google Cloud TTS.
 
@@ -293,6 +329,27 @@ def text_to_speech(text: str, language: str = "Korean", restaurant_name: str = "
     Returns:
         Path to generated audio file
     """
+    # Set language and voice
+    if language == "Korean":
+        language_code = "ko-KR"
+        voice_name = "ko-KR-Chirp3-HD-Algenib"  # Algenib (Male) voice
+    else:
+        language_code = "en-US"
+        voice_name = "en-US-Neural2-F"  # Female voice
+    speaking_rate = 1.2  # 1.2x speed as per user request
+
+    output_path = _tts_output_path(restaurant_name)
+    cache = _tts_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = tts_cache_key(
+            text, provider="google-cloud-tts", model=None, voice=voice_name,
+            speed=speaking_rate, profile={"pitch": 0.0}, language_code=language_code,
+        )
+        if cache.fetch(cache_key, str(output_path)):
+            print(f"TTS cache hit: {output_path}")
+            return str(output_path)
+
     # Fail fast if credentials are missing to avoid long hangs
     credentials_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
     if credentials_path and not Path(credentials_path).exists():
@@ -303,14 +360,6 @@ def text_to_speech(text: str, language: str = "Korean", restaurant_name: str = "
         # Initialize TTS client
         client = texttospeech.TextToSpeechClient()
 
-        # Set language and voice
-        if language == "Korean":
-            language_code = "ko-KR"
-            voice_name = "ko-KR-Chirp3-HD-Algenib"  # Algenib (Male) voice
-        else:
-            language_code = "en-US"
-            voice_name = "en-US-Neural2-F"  # Female voice
-
         # Configure synthesis input
         synthesis_input = texttospeech.SynthesisInput(text=text)
 
@@ -323,7 +372,7 @@ def text_to_speech(text: str, language: str = "Korean", restaurant_name: str = "
         # Configure audio
         audio_config = texttospeech.AudioConfig(
             audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=1.2,  # 1.2x speed as per user request
+            speaking_rate=speaking_rate,
             pitch=0.0
         )
 
@@ -336,16 +385,11 @@ def text_to_speech(text: str, language: str = "Korean", restaurant_name: str = "
         )
 
         # Save to temporary file
-        TTS_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        safe_restaurant = restaurant_name.strip().replace("/", "_").replace("\\", "_")
-        if not safe_restaurant:
-            safe_restaurant = "restaurant"
-        safe_name = f"{safe_restaurant}_{timestamp}.mp3"
-        output_path = TTS_AUDIO_DIR / safe_name
         with open(output_path, "wb") as f:
             f.write(response.audio_content)
 
+        if cache is not None:
+            cache.store(cache_key, str(output_path))
         return str(output_path)
     except Exception as e:
         print(f"TTS error: {e}")
@@ -371,28 +415,33 @@ def text_to_speech_azure(text: str, language: str = "Korean", restaurant_name: s
         print("Azure TTS skipped: SPEECH_KEY or SPEECH_REGION not set")
         return None
         
+    # Set voice based on language
+    if language == "Korean":
+        # Hyunsu (Male) - requested by user
+        voice_name = "ko-KR-HyunsuNeural"
+    else:
+        # Andrew (Male) - to match male persona
+        voice_name = "en-US-AndrewNeural"
+    prosody_rate = "+50.00%"
+
+    # Add provider suffix to distinguish files
+    output_path = _tts_output_path(restaurant_name, "_azure")
+    cache = _tts_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = tts_cache_key(
+            text, provider="azure-speech", model=None, voice=voice_name,
+            speed=1.5, profile={"prosody_rate": prosody_rate}, language=language.lower(),
+        )
+        if cache.fetch(cache_key, str(output_path)):
+            print(f"Azure TTS cache hit: {output_path}")
+            return str(output_path)
+
     try:
         speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=service_region)
-        
-        # Set voice based on language
-        if language == "Korean":
-            # Hyunsu (Male) - requested by user
-            speech_config.speech_synthesis_voice_name = "ko-KR-HyunsuNeural"
-        else:
-            # Andrew (Male) - to match male persona
-            speech_config.speech_synthesis_voice_name = "en-US-AndrewNeural"
-            
+        speech_config.speech_synthesis_voice_name = voice_name
+
         # Create audio config
-        TTS_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        safe_restaurant = restaurant_name.strip().replace("/", "_").replace("\\", "_")
-        if not safe_restaurant:
-            safe_restaurant = "restaurant"
-        
-        # Add provider suffix to distinguish files
-        safe_name = f"{safe_restaurant}_{timestamp}_azure.mp3"
-        output_path = TTS_AUDIO_DIR / safe_name
-        
         audio_config = speechsdk.audio.AudioOutputConfig(filename=str(output_path))
         
         # Create synthesizer
@@ -404,7 +453,7 @@ def text_to_speech_azure(text: str, language: str = "Korean", restaurant_name: s
         ssml = f"""
         <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{language.lower()}">
             <voice name="{speech_config.speech_synthesis_voice_name}">
-                <prosody rate="+50.00%">
+                <prosody rate="{prosody_rate}">
                     {text}
                 </prosody>
             </voice>
@@ -414,6 +463,8 @@ def text_to_speech_azure(text: str, language: str = "Korean", restaurant_name: s
         result = synthesizer.speak_ssml_async(ssml).get()
         
         if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            if cache is not None:
+                cache.store(cache_key, str(output_path))
             return str(output_path)
         elif result.reason == speechsdk.ResultReason.Canceled:
             cancellation_details = result.cancellation_details
@@ -442,10 +493,9 @@ def text_to_speech(text: str, language: str = "Korean", restaurant_name: str = "
     """
     if provider == "Azure":
         return text_to_speech_azure(text, language, restaurant_name)
-    
-    # Default to Google (existing logic)
-    # Fail fast if credentials are missing via env var check logic (kept from original)
-    credentials_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+
+    # Default to Google
+    return text_to_speech_google(text, language, restaurant_name)
 
 
 # ============================================================================
@@ -591,7 +641,13 @@ def concat_videos(video_paths: List[str], output_path: str, clip_duration: int =
 
 
 def get_audio_duration(audio_path: str) -> float:
-    """Get audio duration in seconds using ffprobe."""
+    """Get audio duration in seconds (shared media probe cache, falling back to ffprobe)."""
+    if probe_media is not None:
+        try:
+            return probe_media(audio_path).duration
+        except Exception as e:
+            print(f"Media probe cache failed, falling back to ffprobe: {e}")
+
     try:
         cmd = [
             'ffprobe',